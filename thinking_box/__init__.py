@@ -1,7 +1,19 @@
 """
 Thinking Box package entrypoint.
+
+ThinkingBox / WhisperSTT는 처음 접근할 때 불러옵니다 (PEP 562).
+패키지 import만으로 dotenv 탐색, anthropic, torch/whisper 로딩이 일어나지 않습니다.
 """
-from .main import ThinkingBox
-from .stt import WhisperSTT
 
 __all__ = ["ThinkingBox", "WhisperSTT"]
+
+
+def __getattr__(name):
+    if name == "ThinkingBox":
+        # main.py는 thinking_box/ 기준 절대 import(core., agents.)를 사용
+        from .main import ThinkingBox
+        return ThinkingBox
+    if name == "WhisperSTT":
+        from .stt.whisper_stt import WhisperSTT
+        return WhisperSTT
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,31 @@
 """
-Core module - LLM Client (Claude API)
+Core module - LLM Client (Claude API), background jobs, result cache, warm-up, history
+
+공개 API는 처음 접근할 때 불러옵니다 (PEP 562).
 """
-from .llm_client import LLMClient, create_client
+import importlib
+
+_LAZY_EXPORTS = {
+    "LLMClient": "llm_client",
+    "create_client": "llm_client",
+    "Job": "jobs",
+    "JobRunner": "jobs",
+    "ResultCache": "result_cache",
+    "Warmup": "warmup",
+    "HistoryStore": "history",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["LLMClient", "create_client"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
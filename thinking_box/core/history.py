@@ -0,0 +1,301 @@
+"""
+Analysis history store (SQLite + FTS5)
+
+모든 분석 실행의 입력 해시, 전사문, 3단계 출력, 단계별 소요 시간, Notion 페이지 ID를
+로컬 SQLite에 기록하고 FTS5 인덱스로 전문 검색합니다.
+
+사용법:
+    python main.py history                 # 최근 기록
+    python main.py history "출시 일정"      # 검색
+    python main.py history --show 12       # 기록 1개 전체 보기
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+import os
+import sqlite3
+import threading
+
+from .sqlite_util import ClosingConnection, connect
+
+
+DEFAULT_DB_PATH = os.getenv(
+    "THINKING_BOX_HISTORY_DB",
+    str(Path.home() / ".thinking_box" / "history.db")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    source TEXT,
+    model TEXT,
+    transcript TEXT NOT NULL,
+    cleaned TEXT,
+    ideas TEXT,
+    plan TEXT,
+    timings TEXT,
+    notion_page_id TEXT,
+    notion_page_url TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_input_hash ON runs(input_hash);
+CREATE INDEX IF NOT EXISTS runs_created_at ON runs(created_at);
+"""
+
+# external content FTS5 테이블 + 동기화 트리거
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5(
+    transcript, cleaned, ideas, plan,
+    content='runs', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS runs_ai AFTER INSERT ON runs BEGIN
+    INSERT INTO runs_fts(rowid, transcript, cleaned, ideas, plan)
+    VALUES (new.id, new.transcript, new.cleaned, new.ideas, new.plan);
+END;
+CREATE TRIGGER IF NOT EXISTS runs_ad AFTER DELETE ON runs BEGIN
+    INSERT INTO runs_fts(runs_fts, rowid, transcript, cleaned, ideas, plan)
+    VALUES ('delete', old.id, old.transcript, old.cleaned, old.ideas, old.plan);
+END;
+CREATE TRIGGER IF NOT EXISTS runs_au AFTER UPDATE OF transcript, cleaned, ideas, plan ON runs BEGIN
+    INSERT INTO runs_fts(runs_fts, rowid, transcript, cleaned, ideas, plan)
+    VALUES ('delete', old.id, old.transcript, old.cleaned, old.ideas, old.plan);
+    INSERT INTO runs_fts(rowid, transcript, cleaned, ideas, plan)
+    VALUES (new.id, new.transcript, new.cleaned, new.ideas, new.plan);
+END;
+"""
+
+# 목록/검색 결과에 포함할 컬럼 (본문 제외)
+SUMMARY_COLUMNS = "id, created_at, input_hash, source, model, notion_page_id, notion_page_url"
+
+
+def fts_query(text: str) -> str:
+    """
+    사용자 검색어 → FTS5 쿼리
+
+    각 단어를 따옴표로 감싸 특수문자 문법 오류를 막고, 접두어 검색(*)으로
+    '회의'가 '회의에서'처럼 조사가 붙은 한국어 단어도 찾도록 함
+    """
+    terms = [term.replace('"', '""') for term in text.split()]
+    return " ".join(f'"{term}"*' for term in terms if term)
+
+
+def plan_title(plan: Optional[str], limit: int = 60) -> str:
+    """계획 문서에서 목록 표시용 제목 추출 (첫 본문 줄)"""
+    for line in (plan or "").splitlines():
+        line = line.strip().lstrip("#").strip()
+        if line and not line.startswith("---"):
+            return line[:limit]
+    return "(제목 없음)"
+
+
+class HistoryStore:
+    """
+    분석 기록 저장소
+
+    연결은 호출마다 열고 닫으므로 여러 스레드(Streamlit 세션, 백그라운드 작업)에서
+    같은 인스턴스를 공유해도 됩니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        """
+        Args:
+            path: SQLite 파일 경로 (':memory:'는 지원하지 않음 - 호출마다 새 연결)
+        """
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self.fts_enabled = True
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            try:
+                conn.executescript(FTS_SCHEMA)
+            except sqlite3.OperationalError:
+                # FTS5 없이 빌드된 SQLite - LIKE 검색으로 대체
+                self.fts_enabled = False
+
+    def record(
+        self,
+        transcript: str,
+        results: Dict[str, str],
+        input_hash: str,
+        timings: Optional[Dict[str, float]] = None,
+        model: Optional[str] = None,
+        source: Optional[str] = None
+    ) -> int:
+        """
+        분석 실행 1건 기록
+
+        Args:
+            transcript: 원본 입력 (전사문/회의록)
+            results: cleaned/ideas/plan (또는 ThinkingBox.run() 키 이름)
+            input_hash: 정규화된 입력 해시 (core.result_cache.input_hash)
+            timings: 단계별 소요 시간 (초)
+            model: LLM 모델 이름
+            source: 실행 경로 (cli / streamlit / integrated 등)
+
+        Returns:
+            기록 ID
+        """
+        with self._write_lock, self._connect() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO runs (created_at, input_hash, source, model, transcript,
+                                  cleaned, ideas, plan, timings)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    datetime.now().isoformat(timespec="seconds"),
+                    input_hash,
+                    source,
+                    model,
+                    transcript,
+                    results.get("cleaned", results.get("cleaned_conversation")),
+                    results.get("ideas", results.get("ranked_ideas")),
+                    results.get("plan", results.get("planning_document")),
+                    json.dumps(timings) if timings else None,
+                )
+            )
+            return cursor.lastrowid
+
+    def set_notion_page(self, run_id: int, page_id: str, page_url: Optional[str] = None):
+        """Notion 저장 후 페이지 ID 연결"""
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE runs SET notion_page_id = ?, notion_page_url = ? WHERE id = ?",
+                (page_id, page_url, run_id)
+            )
+
+    def get(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """기록 1건 전체 (본문 포함)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def find_by_hash(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        """같은 입력의 가장 최근 기록"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM runs WHERE input_hash = ? ORDER BY id DESC LIMIT 1",
+                (input_hash,)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """최근 기록 목록 (본문 제외, 제목 포함)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {SUMMARY_COLUMNS}, plan FROM runs ORDER BY id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [self._summary(row) for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        전문 검색 (관련도순, 일치 부분 snippet 포함)
+
+        Args:
+            query: 검색어 (공백으로 구분된 단어 모두 포함, 접두어 일치)
+            limit: 최대 결과 수
+        """
+        if not query.strip():
+            return self.recent(limit)
+
+        with self._connect() as conn:
+            if self.fts_enabled:
+                rows = conn.execute(
+                    f"""
+                    SELECT {', '.join('runs.' + c.strip() for c in SUMMARY_COLUMNS.split(','))},
+                           runs.plan,
+                           snippet(runs_fts, -1, '[', ']', '…', 12) AS snippet
+                    FROM runs_fts JOIN runs ON runs.id = runs_fts.rowid
+                    WHERE runs_fts MATCH ?
+                    ORDER BY bm25(runs_fts)
+                    LIMIT ?
+                    """,
+                    (fts_query(query), limit)
+                ).fetchall()
+            else:
+                terms = query.split()
+                where = " AND ".join(
+                    "(transcript || ' ' || IFNULL(plan, '')) LIKE ?" for _ in terms
+                )
+                rows = conn.execute(
+                    f"SELECT {SUMMARY_COLUMNS}, plan FROM runs WHERE {where} "
+                    f"ORDER BY id DESC LIMIT ?",
+                    [f"%{term}%" for term in terms] + [limit]
+                ).fetchall()
+        return [self._summary(row) for row in rows]
+
+    def delete(self, run_id: int) -> bool:
+        with self._write_lock, self._connect() as conn:
+            return conn.execute("DELETE FROM runs WHERE id = ?", (run_id,)).rowcount > 0
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def _connect(self) -> ClosingConnection:
+        return connect(self.path)
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        if data.get("timings"):
+            data["timings"] = json.loads(data["timings"])
+        return data
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        data["title"] = plan_title(data.pop("plan", None))
+        return data
+
+
+def main(argv: Optional[List[str]] = None):
+    """`python main.py history` 서브커맨드"""
+    parser = argparse.ArgumentParser(
+        prog="python main.py history",
+        description="Thinking Box 분석 기록 조회/검색"
+    )
+    parser.add_argument("query", nargs="*", help="검색어 (없으면 최근 기록)")
+    parser.add_argument("--limit", "-n", type=int, default=20, help="최대 결과 수")
+    parser.add_argument("--show", type=int, metavar="ID", help="기록 1개 전체 출력")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite 파일 경로")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.db)
+
+    if args.show is not None:
+        run = store.get(args.show)
+        if run is None:
+            raise SystemExit(f"기록을 찾을 수 없습니다: {args.show}")
+        if args.json:
+            print(json.dumps(run, ensure_ascii=False, indent=2))
+            return
+        print(f"# 기록 {run['id']} ({run['created_at']}, {run['source'] or '-'})")
+        if run["notion_page_url"]:
+            print(f"Notion: {run['notion_page_url']}")
+        if run["timings"]:
+            print("소요 시간: " + ", ".join(f"{k} {v:.1f}s" for k, v in run["timings"].items()))
+        print("\n## 구조화된 계획\n")
+        print(run["plan"])
+        return
+
+    query = " ".join(args.query)
+    runs = store.search(query, args.limit) if query else store.recent(args.limit)
+    if args.json:
+        print(json.dumps(runs, ensure_ascii=False, indent=2))
+        return
+
+    print(f"📚 {'검색: ' + query if query else '최근 기록'} ({len(runs)}건 / 전체 {store.count()}건)\n")
+    for run in runs:
+        notion = " 📝" if run["notion_page_id"] else ""
+        print(f"[{run['id']:>4}] {run['created_at']}  {run['title']}{notion}")
+        if run.get("snippet"):
+            print(f"       {run['snippet']}")
@@ -0,0 +1,174 @@
+"""
+Background job runner
+
+오래 걸리는 작업(전사, 3단계 분석)을 요청 스레드 밖에서 실행하고
+job ID로 진행 상태와 결과를 조회합니다.
+Streamlit 스크립트 스레드나 HTTP 요청 핸들러가 작업 내내 묶여 있지 않도록 하기 위함.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import threading
+import time
+import uuid
+
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """
+    작업 1개의 상태
+
+    작업 함수는 첫 번째 인자로 Job을 받아 update()로 진행률을 보고하고,
+    stage()로 단계별 소요 시간을 기록합니다.
+    """
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = PENDING
+        self.progress = 0.0
+        self.message = ""
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def update(self, progress: Optional[float] = None, message: Optional[str] = None):
+        """진행률(0~1)과 상태 메시지 갱신"""
+        if progress is not None:
+            self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    @contextmanager
+    def stage(self, name: str, progress: Optional[float] = None, message: Optional[str] = None):
+        """
+        단계 1개 실행 구간 - 시작 시 진행률/메시지 갱신, 끝나면 소요 시간(초)을 timings[name]에 기록
+
+        사용법:
+            with job.stage("ideas", 0.4, "아이디어 추출 중..."):
+                ideas = agent.process(cleaned)
+        """
+        self.update(progress, message)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(time.perf_counter() - start, 2)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """완료(성공/실패)까지 대기, timeout 내에 끝났으면 True"""
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """상태 조회용 (result 제외)"""
+        def iso(ts: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+        return {
+            "job_id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+            "timings": dict(self.timings),
+            "created_at": iso(self.created_at),
+            "started_at": iso(self.started_at),
+            "finished_at": iso(self.finished_at),
+        }
+
+
+class JobRunner:
+    """
+    스레드 풀 기반 작업 실행기
+
+    - 동시 실행 수는 max_workers로 제한 (나머지는 pending으로 대기)
+    - 끝난 작업은 retention초 동안 조회 가능, 이후 정리
+    """
+
+    def __init__(self, max_workers: int = 4, retention: float = 3600.0):
+        """
+        Args:
+            max_workers: 동시에 실행할 작업 수
+            retention: 끝난 작업 결과를 보관할 시간 (초)
+        """
+        self.max_workers = max_workers
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="thinking-box-job"
+        )
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args, name: Optional[str] = None, **kwargs) -> Job:
+        """
+        작업 제출
+
+        Args:
+            fn: fn(job, *args, **kwargs) 형태의 작업 함수 (반환값이 job.result)
+            name: 표시용 작업 이름 (기본: 함수 이름)
+
+        Returns:
+            Job (즉시 반환, job.id로 조회)
+        """
+        job = Job(name or getattr(fn, "__name__", "job"))
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in self.jobs():
+            counts[job.status] += 1
+        return counts
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: dict):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.progress = 1.0
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            job._done.set()
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -6,9 +6,27 @@ Streamlit Cloud 배포용 - 원본 그대로 유지
 """
 import os
 from typing import List, Dict, Optional
-from dotenv import load_dotenv
 
-load_dotenv()
+
+_dotenv_loaded = False
+
+
+def _load_dotenv_once():
+    """
+    .env 로드 (첫 LLMClient 생성 시 1회)
+
+    import 시점에 디렉토리 트리를 탐색하지 않도록 생성자에서 호출
+    """
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        # python-dotenv 없이도 실제 환경 변수로 동작
+        return
+    load_dotenv()
 
 
 class LLMClient:
@@ -28,6 +46,8 @@ class LLMClient:
                 - claude-sonnet-3-5-20241022: Previous Sonnet
                 - claude-opus-4-20250514: Most capable
         """
+        _load_dotenv_once()
+        
         try:
             from anthropic import Anthropic
         except ImportError:
@@ -0,0 +1,115 @@
+"""
+Analysis result memoization
+
+같은 회의록을 다시 분석하면 3번의 Claude 호출을 반복하지 않고 저장된 결과를 반환합니다.
+키 = 정규화한 입력 텍스트 해시 + 파이프라인 버전(프롬프트 템플릿 + 모델),
+프롬프트나 모델이 바뀌면 자동으로 새 키가 되어 이전 결과를 쓰지 않습니다.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import hashlib
+import re
+import threading
+import time
+
+
+def normalize_input(text: str) -> str:
+    """
+    의미 없는 차이(줄바꿈 종류, 줄 끝 공백, 연속 공백/빈 줄)를 제거
+
+    붙여넣기 방식이나 에디터에 따라 달라지는 공백 때문에 캐시를 놓치지 않도록 함
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in text.split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def input_hash(text: str) -> str:
+    """정규화된 입력의 SHA-256"""
+    return hashlib.sha256(normalize_input(text).encode("utf-8")).hexdigest()
+
+
+def pipeline_version(model: str) -> str:
+    """프롬프트 템플릿 전체 + 모델 이름으로 만든 버전 문자열"""
+    from prompts import templates
+
+    digest = hashlib.sha256(model.encode("utf-8"))
+    for name in sorted(vars(templates)):
+        value = getattr(templates, name)
+        if name.isupper() and isinstance(value, str):
+            digest.update(name.encode("utf-8"))
+            digest.update(value.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    크기 제한 LRU 결과 저장소 (스레드 안전, 프로세스 내 모든 세션 공유)
+
+    진행 중인 분석도 키별로 기록해 두어, 같은 입력이 동시에 들어오면
+    새 작업을 만들지 않고 기존 작업 결과를 기다리게 합니다.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        """
+        Args:
+            max_entries: 보관할 최대 결과 수 (초과 시 가장 오래 안 쓴 결과부터 제거)
+            ttl: 결과 유효 시간 (초, None이면 만료 없음)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, version: str) -> str:
+        return f"{version}:{input_hash(text)}"
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, result: Any):
+        with self._lock:
+            self._entries[key] = (time.time(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pending_job(self, key: str) -> Optional[str]:
+        """같은 키로 진행 중인 작업 ID"""
+        with self._lock:
+            return self._pending.get(key)
+
+    def set_pending(self, key: str, job_id: str):
+        with self._lock:
+            self._pending[key] = job_id
+
+    def clear_pending(self, key: str):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "pending": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
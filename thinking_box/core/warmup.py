@@ -0,0 +1,124 @@
+"""
+Background warm-up
+
+앱 시작 직후 백그라운드 스레드에서 STT 모델 로딩, Claude/Notion 연결(TLS handshake),
+선택적으로 짧은 priming 요청까지 미리 해두어 첫 사용자가 콜드 스타트 비용을 내지 않게 합니다.
+각 단계는 독립적으로 병렬 실행되고, 준비 상태는 UI와 /health에서 조회합니다.
+
+THINKING_BOX_WARMUP=1 일 때만 켜집니다 (opt-in).
+"""
+from typing import Any, Callable, Dict, Optional
+import os
+import threading
+import time
+
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("THINKING_BOX_WARMUP") == "1"
+
+
+def priming_enabled() -> bool:
+    """priming 요청은 API 비용이 들므로 별도 opt-in"""
+    return os.getenv("THINKING_BOX_WARMUP_PRIME") == "1"
+
+
+class Warmup:
+    """
+    이름 붙은 warm-up 단계 모음
+
+    사용 예:
+        warmup = Warmup()
+        warmup.add("stt", lambda: pool.preload("base"))
+        warmup.add("claude", lambda: warm_llm(box.llm))
+        warmup.start()
+        warmup.status()  # {'ready': False, 'steps': {...}}
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, Callable[[], Any]] = {}
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._threads = []
+        self._lock = threading.Lock()
+        self.started = False
+
+    def add(self, name: str, fn: Callable[[], Any]) -> "Warmup":
+        self._steps[name] = fn
+        self._state[name] = {"status": PENDING, "seconds": None, "error": None}
+        return self
+
+    def start(self) -> "Warmup":
+        """모든 단계를 각자 데몬 스레드에서 시작 (즉시 반환)"""
+        if self.started:
+            return self
+        self.started = True
+        for name, fn in self._steps.items():
+            thread = threading.Thread(
+                target=self._run, args=(name, fn), name=f"warmup-{name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    @property
+    def ready(self) -> bool:
+        """모든 단계가 끝났는지 (실패한 단계도 끝난 것으로 봄 - 첫 요청에서 다시 시도됨)"""
+        with self._lock:
+            return all(s["status"] in (READY, FAILED) for s in self._state.values())
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        return self.ready
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.started,
+                "ready": all(s["status"] in (READY, FAILED) for s in self._state.values()),
+                "steps": {name: dict(state) for name, state in self._state.items()},
+            }
+
+    def _run(self, name: str, fn: Callable[[], Any]):
+        with self._lock:
+            self._state[name]["status"] = RUNNING
+        start = time.perf_counter()
+        try:
+            fn()
+            status, error = READY, None
+        except Exception as e:
+            status, error = FAILED, str(e)
+        with self._lock:
+            self._state[name].update(
+                status=status,
+                seconds=round(time.perf_counter() - start, 2),
+                error=error
+            )
+
+
+def warm_llm(llm, prime: Optional[bool] = None):
+    """
+    Claude 연결 미리 열기
+
+    models 목록 조회로 커넥션 풀에 TLS 연결을 만들어 두고,
+    prime이면 max_tokens=1 요청으로 첫 메시지 요청 경로까지 예열
+    """
+    if prime is None:
+        prime = priming_enabled()
+
+    if prime:
+        llm.generate(system_prompt="Reply with OK.", user_prompt="ping", max_tokens=1)
+    else:
+        llm.client.models.list(limit=1)
+
+
+def warm_notion(storage):
+    """Notion 연결 미리 열기 (DB 조회 = TLS handshake + 인증 확인)"""
+    if not storage.test_connection():
+        raise RuntimeError("Notion 연결 실패")
@@ -0,0 +1,172 @@
+"""
+Import-time budget check (`python -X importtime`)
+
+CLI / HTTP / Streamlit 진입점이 import 단계에서 무거운 의존성
+(torch, whisper, numpy, anthropic, dotenv 등)을 끌어오지 않는지,
+import 시간이 예산 안에 있는지 확인합니다.
+서버/UI 진입점은 프레임워크(fastapi, streamlit 등)를 대상별 허용 목록으로 둡니다.
+
+사용법 (저장소 루트에서):
+    python -m thinking_box.import_budget
+    python -m thinking_box.import_budget --scale 2   # 느린 CI 머신
+    python -m thinking_box.import_budget --json
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = Path(__file__).resolve().parent
+MCP_DIR = REPO_ROOT / "thinking_box_mcp"
+
+# import 시점에 불러오면 안 되는 모듈 (첫 사용 시 로딩)
+HEAVY_MODULES = (
+    "torch", "whisper", "numpy", "anthropic", "dotenv",
+    "streamlit", "notion_client", "fastapi",
+)
+
+# (이름, 실행 디렉토리, import 대상, 예산(ms), 허용하는 무거운 모듈)
+TARGETS = (
+    ("package", REPO_ROOT, "thinking_box", 30, ()),
+    ("stt API", REPO_ROOT, "thinking_box.stt", 30, ()),
+    ("core API", REPO_ROOT, "thinking_box.core", 30, ()),
+    ("STT client (service)", REPO_ROOT, "thinking_box.stt.service", 60, ()),
+    ("CLI (main.py)", PACKAGE_DIR, "main", 60, ()),
+    # FastAPI 앱 + 모듈 수준 Notion 클라이언트 (모델/LLM SDK는 요청 시 로딩)
+    ("HTTP (http_server.py)", MCP_DIR, "http_server", 1000,
+     ("fastapi", "notion_client", "dotenv")),
+    # import = 첫 화면 스크립트 실행 (streamlit 자체가 numpy를 불러옴, 모델은 버튼 클릭 시 로딩)
+    ("Streamlit (ui/streamlit_app)", REPO_ROOT, "thinking_box.ui.streamlit_app", 2500,
+     ("streamlit", "numpy", "notion_client", "dotenv")),
+)
+
+# 진입점이 import 시 여는 SQLite 파일/Notion 클라이언트용 환경 (예열은 끔)
+BUDGET_ENV = {
+    "THINKING_BOX_WARMUP": "0",
+    "NOTION_TOKEN": "import-budget",
+    "NOTION_DATABASE_ID": "import-budget",
+}
+DB_ENV_VARS = (
+    "THINKING_BOX_HISTORY_DB", "NOTION_OUTBOX_DB", "NOTION_MIRROR_DB", "NOTION_SESSION_INDEX_DB",
+)
+
+
+def _import_times(module: str, cwd: Path, env: Optional[Dict[str, str]] = None) -> Dict[str, Tuple[int, int]]:
+    """-X importtime 출력 → {모듈: (self us, cumulative us)}"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(cwd),
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip()[-2000:]}")
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure(
+    label: str,
+    cwd: Path,
+    module: str,
+    budget_ms: float,
+    baseline: Dict,
+    allowed: Tuple[str, ...] = (),
+    env: Optional[Dict[str, str]] = None
+) -> Dict:
+    """
+    대상 모듈 import에 추가로 든 시간과 불러온 무거운 모듈
+
+    인터프리터 시작 시 이미 불러오는 모듈(site 등)은 baseline으로 제외,
+    allowed에 있는 무거운 모듈은 실패로 치지 않음
+    """
+    times = _import_times(module, cwd, env)
+    added = {name: t for name, t in times.items() if name not in baseline}
+    total_ms = sum(self_us for self_us, _ in added.values()) / 1000
+    heavy = sorted(
+        name for name in added
+        if name.split(".")[0] in HEAVY_MODULES and name.split(".")[0] not in allowed
+    )
+    slowest = sorted(added.items(), key=lambda item: item[1][0], reverse=True)[:5]
+
+    return {
+        "label": label,
+        "module": module,
+        "import_ms": round(total_ms, 1),
+        "budget_ms": budget_ms,
+        "modules": len(added),
+        "heavy": sorted({name.split(".")[0] for name in heavy}),
+        "slowest": [(name, round(self_us / 1000, 1)) for name, (self_us, _) in slowest],
+        "ok": total_ms <= budget_ms and not heavy,
+    }
+
+
+def run_budget(scale: float = 1.0) -> List[Dict]:
+    baseline = _import_times("sys", REPO_ROOT)
+    with tempfile.TemporaryDirectory() as tmp:
+        # 측정 중 생기는 SQLite 파일이 실제 기록(~/.thinking_box)을 건드리지 않도록
+        env = {**os.environ, **BUDGET_ENV}
+        env.update({name: str(Path(tmp) / f"{name.lower()}.db") for name in DB_ENV_VARS})
+        results = []
+        for label, cwd, module, budget_ms, allowed in TARGETS:
+            # 허용 목록의 프레임워크가 설치되지 않은 환경에서는 측정 생략
+            missing = [name for name in allowed if importlib.util.find_spec(name) is None]
+            if missing:
+                results.append({"label": label, "module": module, "skipped": missing, "ok": True})
+                continue
+            results.append(measure(label, cwd, module, budget_ms * scale, baseline, allowed, env))
+        return results
+
+
+def print_report(results: List[Dict]):
+    print("=" * 70)
+    print("⏱️  Import-time budget")
+    print("=" * 70)
+    for r in results:
+        if r.get("skipped"):
+            print(f"⏭️  {r['label']:<30} skipped (not installed: {', '.join(r['skipped'])})")
+            continue
+        mark = "✅" if r["ok"] else "❌"
+        print(
+            f"{mark} {r['label']:<30} {r['import_ms']:>7.1f} ms / {r['budget_ms']:.0f} ms "
+            f"({r['modules']} modules)"
+        )
+        if r["heavy"]:
+            print(f"   ⚠️ heavy imports: {', '.join(r['heavy'])}")
+        if not r["ok"]:
+            for name, ms in r["slowest"]:
+                print(f"   {ms:>7.1f} ms  {name}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Thinking Box import-time budget")
+    parser.add_argument("--scale", type=float, default=1.0, help="예산 배율 (느린 머신용)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    results = run_budget(args.scale)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_report(results)
+
+    if not all(r["ok"] for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
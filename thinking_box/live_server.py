@@ -0,0 +1,278 @@
+"""
+Thinking Box 실시간 모드 (WebSocket)
+
+브라우저 마이크나 미팅 봇이 오디오 프레임을 WebSocket으로 보내면
+rolling window로 전사하여 몇 초 안에 화면에 띄우고,
+늘어나는 전사문을 주기적으로 3단계 파이프라인에 넣어 계획 문서를 갱신합니다.
+
+사용법:
+    cd thinking_box && python live_server.py
+    브라우저: http://localhost:8001 (마이크 권한 허용)
+
+프로토콜 (ws://localhost:8001/ws/live):
+    client → server
+        binary: 16 kHz mono s16le PCM
+        text:   {"type": "config", "language": "ko"}  (선택, 첫 메시지)
+                {"type": "stop"}  (남은 오디오 확정 + 최종 분석 후 종료)
+    server → client
+        {"type": "transcript", "committed": [...], "partial": str, "transcript": str}
+        {"type": "analysis", "cleaned_conversation": str, "ranked_ideas": str,
+         "planning_document": str, "transcript_chars": int, "final": bool}
+        {"type": "error", "error": str}
+"""
+from functools import lru_cache
+import asyncio
+import json
+import os
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse
+
+from main import ThinkingBox
+from stt import WhisperSTT
+from stt.streaming import StreamingTranscriber
+
+
+# 설정 (환경 변수)
+LIVE_STT_MODEL = os.getenv("THINKING_BOX_LIVE_STT_MODEL", "base")
+ANALYSIS_INTERVAL = float(os.getenv("THINKING_BOX_LIVE_ANALYSIS_INTERVAL", "60"))
+ANALYSIS_MIN_NEW_CHARS = int(os.getenv("THINKING_BOX_LIVE_ANALYSIS_MIN_CHARS", "200"))
+
+app = FastAPI(
+    title="Thinking Box Live",
+    description="WebSocket 오디오 → 실시간 전사 → 주기적 분석",
+    version="1.0.0"
+)
+
+
+@lru_cache(maxsize=1)
+def get_stt() -> WhisperSTT:
+    """모든 세션이 공유하는 STT 모델 (모델 lock으로 디코딩 직렬화)"""
+    return WhisperSTT(
+        model_name=LIVE_STT_MODEL,
+        quantize=os.getenv("THINKING_BOX_STT_QUANTIZE") == "1",
+        intra_op_threads=int(os.getenv("THINKING_BOX_STT_THREADS", "0")) or None
+    )
+
+
+@lru_cache(maxsize=1)
+def get_thinking_box() -> ThinkingBox:
+    return ThinkingBox()
+
+
+class LiveSession:
+    """
+    WebSocket 연결 1개 = 세션 1개
+
+    - stt_loop: 새 오디오가 step만큼 쌓이면 워커 스레드에서 전사 후 전송
+    - analysis_loop: ANALYSIS_INTERVAL마다 전사문이 충분히 늘었으면 파이프라인 실행
+      (루프 하나에서 순차 실행하므로 세션당 분석은 항상 1개만 진행)
+    """
+
+    def __init__(self, websocket: WebSocket, transcriber: StreamingTranscriber):
+        self.websocket = websocket
+        self.transcriber = transcriber
+        self.analyzed_chars = 0
+        self._send_lock = asyncio.Lock()
+        self._analysis_lock = asyncio.Lock()
+
+    async def send(self, message: dict):
+        async with self._send_lock:
+            await self.websocket.send_text(json.dumps(message, ensure_ascii=False))
+
+    async def send_update(self, update: dict):
+        await self.send({
+            "type": "transcript",
+            "committed": update["committed"],
+            "partial": update["partial"],
+            "transcript": self.transcriber.transcript
+        })
+
+    async def stt_loop(self):
+        while True:
+            await asyncio.sleep(0.25)
+            if not self.transcriber.ready:
+                continue
+            try:
+                update = await asyncio.to_thread(self.transcriber.step)
+            except Exception as e:
+                await self.send({"type": "error", "error": str(e)})
+                continue
+            if update is not None:
+                await self.send_update(update)
+
+    async def analysis_loop(self):
+        while True:
+            await asyncio.sleep(ANALYSIS_INTERVAL)
+            await self.analyze()
+
+    async def analyze(self, final: bool = False):
+        async with self._analysis_lock:
+            transcript = self.transcriber.transcript
+            if not transcript:
+                return
+            if not final and len(transcript) - self.analyzed_chars < ANALYSIS_MIN_NEW_CHARS:
+                return
+            if final and len(transcript) == self.analyzed_chars:
+                return
+
+            try:
+                results = await asyncio.to_thread(get_thinking_box().run, transcript)
+            except Exception as e:
+                await self.send({"type": "error", "error": f"분석 실패: {e}"})
+                return
+
+            self.analyzed_chars = len(transcript)
+            await self.send({
+                "type": "analysis",
+                **results,
+                "transcript_chars": len(transcript),
+                "final": final
+            })
+
+    async def finish(self):
+        """남은 버퍼 확정 + 최종 분석"""
+        update = await asyncio.to_thread(self.transcriber.flush)
+        await self.send_update(update)
+        await self.analyze(final=True)
+
+
+@app.websocket("/ws/live")
+async def live(websocket: WebSocket):
+    await websocket.accept()
+
+    # 첫 연결 시 모델 로딩이 이벤트 루프를 막지 않도록 스레드에서 로딩
+    stt = await asyncio.to_thread(get_stt)
+    transcriber = StreamingTranscriber(stt)
+    session = LiveSession(websocket, transcriber)
+    tasks = [
+        asyncio.create_task(session.stt_loop()),
+        asyncio.create_task(session.analysis_loop()),
+    ]
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                transcriber.feed(message["bytes"])
+                continue
+
+            try:
+                control = json.loads(message.get("text") or "{}")
+            except json.JSONDecodeError as e:
+                # 잘못된 제어 메시지 하나로 세션(전사/분석)이 끊기지 않도록 알리고 계속 수신
+                await session.send({"type": "error", "error": f"잘못된 제어 메시지: {e}"})
+                continue
+            if not isinstance(control, dict):
+                await session.send({"type": "error", "error": "제어 메시지는 JSON 객체여야 합니다"})
+                continue
+            if control.get("type") == "config" and control.get("language"):
+                transcriber.language = (
+                    None if control["language"] == "auto" else control["language"]
+                )
+            elif control.get("type") == "stop":
+                for task in tasks:
+                    task.cancel()
+                await session.finish()
+                await websocket.close()
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy", "stt_model": LIVE_STT_MODEL}
+
+
+@app.get("/", response_class=HTMLResponse)
+async def index():
+    return INDEX_HTML
+
+
+# 최소 브라우저 클라이언트: 마이크 → 16 kHz Int16 PCM → WebSocket
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>Thinking Box Live</title>
+<style>
+  body { font-family: sans-serif; max-width: 960px; margin: 2rem auto; }
+  #partial { color: #888; }
+  pre { white-space: pre-wrap; background: #f6f6f6; padding: 1rem; }
+</style>
+</head>
+<body>
+<h1>🧠 Thinking Box Live</h1>
+<button id="start">🎙️ 시작</button>
+<button id="stop" disabled>⏹️ 종료</button>
+<h2>전사</h2>
+<p><span id="transcript"></span> <span id="partial"></span></p>
+<h2>계획 문서</h2>
+<pre id="plan">전사문이 쌓이면 주기적으로 갱신됩니다.</pre>
+<script>
+let ws, ctx, stream, processor;
+
+document.getElementById("start").onclick = async () => {
+  ws = new WebSocket(`ws://${location.host}/ws/live`);
+  ws.binaryType = "arraybuffer";
+  ws.onmessage = (event) => {
+    const msg = JSON.parse(event.data);
+    if (msg.type === "transcript") {
+      document.getElementById("transcript").textContent = msg.transcript;
+      document.getElementById("partial").textContent = msg.partial;
+    } else if (msg.type === "analysis") {
+      document.getElementById("plan").textContent = msg.planning_document;
+    } else if (msg.type === "error") {
+      console.error(msg.error);
+    }
+  };
+
+  stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+  ctx = new AudioContext({ sampleRate: 16000 });
+  const source = ctx.createMediaStreamSource(stream);
+  processor = ctx.createScriptProcessor(4096, 1, 1);
+  processor.onaudioprocess = (event) => {
+    if (ws.readyState !== WebSocket.OPEN) return;
+    const input = event.inputBuffer.getChannelData(0);
+    const pcm = new Int16Array(input.length);
+    for (let i = 0; i < input.length; i++) {
+      pcm[i] = Math.max(-1, Math.min(1, input[i])) * 0x7fff;
+    }
+    ws.send(pcm.buffer);
+  };
+  source.connect(processor);
+  processor.connect(ctx.destination);
+
+  document.getElementById("start").disabled = true;
+  document.getElementById("stop").disabled = false;
+};
+
+document.getElementById("stop").onclick = () => {
+  processor.disconnect();
+  stream.getTracks().forEach((track) => track.stop());
+  ctx.close();
+  ws.send(JSON.stringify({ type: "stop" }));
+  document.getElementById("stop").disabled = true;
+  document.getElementById("start").disabled = false;
+};
+</script>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "live_server:app",
+        host="0.0.0.0",
+        port=int(os.getenv("THINKING_BOX_LIVE_PORT", "8001")),
+        log_level="info"
+    )
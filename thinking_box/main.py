@@ -5,23 +5,36 @@ Thinking Box - 메인 파이프라인
     python main.py --input example_input.txt --output result.md
     또는
     python main.py  (대화형 모드)
+    python main.py history [검색어]  (분석 기록 조회/검색)
 """
 import argparse
+import sys
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
+from core.jobs import Job
 from core.llm_client import LLMClient
 from agents.input_agent import InputAgent
 from agents.idea_agent import IdeaAgent
 from agents.planning_agent import PlanningAgent
 
+if TYPE_CHECKING:
+    from core.history import HistoryStore
+
 
 class ThinkingBox:
     """
     3단계 에이전트 파이프라인
     """
     
-    def __init__(self):
+    def __init__(self, history: Optional["HistoryStore"] = None):
+        """
+        Args:
+            history: 지정하면 run()마다 분석 기록 저장 (core.history.HistoryStore)
+        """
+        self.history = history
+        
         # 공통 LLM 클라이언트
         self.llm = LLMClient()
         
@@ -30,38 +43,64 @@ class ThinkingBox:
         self.idea_agent = IdeaAgent(self.llm)
         self.planning_agent = PlanningAgent(self.llm)
     
-    def run(self, raw_input: str) -> dict:
+    def run(self, raw_input: str, job: Optional[Job] = None, source: str = "cli") -> dict:
         """
         전체 파이프라인 실행
         
         Args:
             raw_input: 원본 대화/회의 텍스트
+            job: 진행률/단계별 소요 시간을 보고할 Job (Streamlit 백그라운드 분석 등)
+            source: 분석 기록의 출처 표시
             
         Returns:
             각 단계의 출력을 담은 딕셔너리
+            (timings: 단계별 소요 시간, history_id: 기록 ID - history 사용 시)
         """
         print("=" * 60)
         print("🧠 Thinking Box 파이프라인 시작")
         print("=" * 60 + "\n")
         
+        # 단독 실행 시에도 단계별 소요 시간 기록용으로 사용
+        job = job or Job("run")
+        
         # Stage 1: 입력 정제
-        cleaned = self.input_agent.process(raw_input)
+        with job.stage("input", 0.1, "🔍 1/3: 입력 정제 중..."):
+            cleaned = self.input_agent.process(raw_input)
         
         # Stage 2: 아이디어 추출
-        ideas = self.idea_agent.process(cleaned)
+        with job.stage("ideas", 0.4, "💡 2/3: 아이디어 추출 중..."):
+            ideas = self.idea_agent.process(cleaned)
         
         # Stage 3: 계획 구조화
-        plan = self.planning_agent.process(ideas)
+        with job.stage("planning", 0.75, "📋 3/3: 계획 구조화 중..."):
+            plan = self.planning_agent.process(ideas)
+        
+        timings = {name: job.timings[name] for name in ("input", "ideas", "planning")}
         
         print("=" * 60)
         print("✅ 파이프라인 완료!")
         print("=" * 60 + "\n")
         
-        return {
+        results = {
             "cleaned_conversation": cleaned,
             "ranked_ideas": ideas,
-            "planning_document": plan
+            "planning_document": plan,
+            "timings": timings
         }
+        
+        if self.history is not None:
+            from core.result_cache import input_hash
+            
+            results["history_id"] = self.history.record(
+                raw_input,
+                results,
+                input_hash=input_hash(raw_input),
+                timings=timings,
+                model=self.llm.model,
+                source=source
+            )
+        
+        return results
     
     def save_output(self, results: dict, output_path: str):
         """
@@ -96,9 +135,16 @@ class ThinkingBox:
 
 
 def main():
+    # 서브커맨드: python main.py history [...]
+    if len(sys.argv) > 1 and sys.argv[1] == "history":
+        from core.history import main as history_main
+        history_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(description="Thinking Box - 사고 지원 시스템")
     parser.add_argument("--input", "-i", help="입력 파일 경로")
     parser.add_argument("--output", "-o", default="output.md", help="출력 파일 경로")
+    parser.add_argument("--no-history", action="store_true", help="분석 기록 저장 안 함")
     args = parser.parse_args()
     
     # 입력 읽기
@@ -120,7 +166,12 @@ def main():
         raw_input = "\n".join(lines)
     
     # 파이프라인 실행
-    box = ThinkingBox()
+    history = None
+    if not args.no_history:
+        from core.history import HistoryStore
+        history = HistoryStore()
+    
+    box = ThinkingBox(history=history)
     results = box.run(raw_input)
     
     # 결과 저장
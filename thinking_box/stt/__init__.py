@@ -1,7 +1,40 @@
 """
 Speech-to-Text Module
 Whisper base model (Korean optimized)
+
+공개 API는 처음 접근할 때 해당 서브모듈을 불러옵니다 (PEP 562).
+`from thinking_box.stt import STTClient`처럼 가벼운 클래스만 쓰는 경우
+numpy/torch/whisper를 불러오지 않습니다.
 """
-from .whisper_stt import WhisperSTT
+import importlib
+
+# 공개 이름 → 정의된 서브모듈
+_LAZY_EXPORTS = {
+    "WhisperSTT": "whisper_stt",
+    "AudioPreprocessor": "preprocess",
+    "OffsetMap": "preprocess",
+    "STTClient": "service",
+    "STTService": "service",
+    "STTModelPool": "pool",
+    "CascadeResult": "cascade",
+    "StreamingTranscriber": "streaming",
+    "DECODE_PROFILES": "profiles",
+    "select_profile": "profiles",
+    "AUTO_LANGUAGE": "language",
+    "language_cache": "language",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # 다음 접근부터는 일반 속성 조회
+    return value
+
 
-__all__ = ["WhisperSTT"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
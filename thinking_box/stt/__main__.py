@@ -0,0 +1,10 @@
+"""
+STT command line entrypoint
+
+    python -m thinking_box.stt batch <directory> [--workers N]
+"""
+from .batch import main
+
+
+if __name__ == "__main__":
+    main()
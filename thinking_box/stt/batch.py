@@ -0,0 +1,257 @@
+"""
+Directory batch transcription
+
+녹음 아카이브 폴더를 통째로 전사합니다.
+각 파일 옆에 <파일명>.txt (전사 텍스트)와 <파일명>.segments.json (세그먼트)을 쓰고,
+(확장자까지 포함한 파일명을 쓰므로 x.m4a와 x.wav가 같은 출력을 덮어쓰지 않음)
+이미 처리된 파일은 건너뛰므로 중간에 끊겨도 다시 실행하면 이어서 진행합니다.
+
+사용법:
+    python -m thinking_box.stt batch recordings/ --workers 4 --model base
+    python -m thinking_box.stt batch recordings/ --socket /tmp/thinking_box_stt.sock
+"""
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import time
+
+from .language import AUTO_LANGUAGE
+from .preprocess import probe_duration
+
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".ogg", ".flac", ".webm", ".mp4", ".aac"}
+
+# 워커 프로세스마다 하나씩 로딩되는 STT 인스턴스
+_worker_stt = None
+
+
+def find_recordings(directory: str, recursive: bool = True) -> List[Path]:
+    """디렉토리에서 오디오 파일 목록 (이름순)"""
+    root = Path(directory)
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        path for path in root.glob(pattern)
+        if path.is_file() and path.suffix.lower() in AUDIO_EXTENSIONS
+    )
+
+
+def output_paths(audio_path: Path) -> tuple:
+    """meeting.m4a → (meeting.m4a.txt, meeting.m4a.segments.json)"""
+    return (
+        audio_path.with_name(audio_path.name + ".txt"),
+        audio_path.with_name(audio_path.name + ".segments.json"),
+    )
+
+
+def is_done(audio_path: Path) -> bool:
+    """두 출력 파일이 모두 있고 원본보다 새로우면 처리 완료"""
+    mtime = audio_path.stat().st_mtime
+    return all(
+        path.exists() and path.stat().st_mtime >= mtime
+        for path in output_paths(audio_path)
+    )
+
+
+def _write_atomic(path: Path, content: str):
+    """중간에 죽어도 반쯤 쓴 파일이 '완료'로 보이지 않도록 임시 파일 후 rename"""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def transcribe_file(
+    stt,
+    audio_path: Path,
+    language: Optional[str],
+    profile: Optional[str]
+) -> dict:
+    """파일 1개 전사 + 결과 저장, 처리 통계 반환"""
+    start = time.perf_counter()
+    info = stt.transcribe_with_info(str(audio_path), language=language, profile=profile)
+    elapsed = time.perf_counter() - start
+
+    segments = info.get("segments", [])
+    try:
+        duration = probe_duration(str(audio_path))
+    except RuntimeError:
+        duration = segments[-1]["end"] if segments else 0.0
+
+    text_path, segments_path = output_paths(audio_path)
+    _write_atomic(segments_path, json.dumps({
+        "audio": audio_path.name,
+        "model": stt.model_name,
+        "language": info.get("language"),
+        "profile": info.get("profile"),
+        "duration": duration,
+        "segments": [
+            {
+                "id": segment.get("id", i),
+                "start": segment["start"],
+                "end": segment["end"],
+                "text": segment["text"].strip()
+            }
+            for i, segment in enumerate(segments)
+        ]
+    }, ensure_ascii=False, indent=2))
+    # 텍스트를 마지막에 써서 두 파일이 모두 있을 때만 완료로 간주되게 함
+    _write_atomic(text_path, info["text"] + "\n")
+
+    return {"audio": str(audio_path), "duration": duration, "seconds": elapsed}
+
+
+def _init_worker(model_name: str, stt_options: dict):
+    global _worker_stt
+    from .whisper_stt import WhisperSTT
+
+    _worker_stt = WhisperSTT(model_name=model_name, **stt_options)
+
+
+def _run_in_worker(audio_path: str, language: Optional[str], profile: Optional[str]) -> dict:
+    return transcribe_file(_worker_stt, Path(audio_path), language, profile)
+
+
+def run_batch(
+    directory: str,
+    workers: int = 2,
+    model_name: str = "base",
+    language: Optional[str] = AUTO_LANGUAGE,
+    profile: Optional[str] = None,
+    preprocess: bool = True,
+    quantize: bool = False,
+    socket_path: Optional[str] = None,
+    recursive: bool = True,
+    force: bool = False
+) -> dict:
+    """
+    디렉토리 일괄 전사
+
+    Args:
+        directory: 녹음 폴더
+        workers: 동시 처리 수 (로컬 모델이면 프로세스마다 모델 1개씩 로딩)
+        model_name: Whisper 모델 크기
+        language: 언어 코드 (기본 auto: 파일별 1회 감지)
+        profile: 디코딩 프로필 (fast/balanced/accurate/auto)
+        preprocess: 무음 제거 전처리 사용 여부
+        quantize: int8 quantization 사용 여부
+        socket_path: 지정하면 로컬 모델 대신 공유 STT 서비스 사용
+        recursive: 하위 폴더 포함 여부
+        force: 이미 처리된 파일도 다시 전사
+
+    Returns:
+        처리 요약 (파일 수, 오디오 시간, 처리 시간, 처리량, 실패 목록)
+    """
+    recordings = find_recordings(directory, recursive=recursive)
+    pending = [path for path in recordings if force or not is_done(path)]
+    skipped = len(recordings) - len(pending)
+
+    print(f"📂 {directory}: {len(recordings)}개 파일, {skipped}개 완료됨, {len(pending)}개 처리 예정")
+
+    completed: List[dict] = []
+    failed: Dict[str, str] = {}
+    wall_start = time.perf_counter()
+
+    if pending:
+        if socket_path:
+            from .service import STTClient
+
+            # 모델은 서비스에만 있으므로 스레드로 요청만 병렬화
+            client = STTClient(socket_path)
+            executor = ThreadPoolExecutor(max_workers=workers)
+            submit = lambda path: executor.submit(
+                transcribe_file, client, path, language, profile
+            )
+        else:
+            # 워커끼리 코어를 나눠 쓰도록 PyTorch 스레드 수 제한
+            threads = max((os.cpu_count() or 1) // workers, 1)
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(model_name, {
+                    "preprocess": preprocess,
+                    "quantize": quantize,
+                    "intra_op_threads": threads,
+                })
+            )
+            submit = lambda path: executor.submit(_run_in_worker, str(path), language, profile)
+
+        with executor:
+            futures: Dict[Future, Path] = {submit(path): path for path in pending}
+            for i, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                try:
+                    stats = future.result()
+                    completed.append(stats)
+                    rtf = stats["seconds"] / stats["duration"] if stats["duration"] else 0
+                    print(
+                        f"[{i}/{len(pending)}] ✅ {path.name} "
+                        f"({stats['duration'] / 60:.1f}분 → {stats['seconds']:.0f}초, RTF {rtf:.2f})"
+                    )
+                except Exception as e:
+                    failed[str(path)] = str(e)
+                    print(f"[{i}/{len(pending)}] ❌ {path.name}: {e}")
+
+    wall_seconds = time.perf_counter() - wall_start
+    audio_seconds = sum(stats["duration"] for stats in completed)
+
+    return {
+        "files": len(recordings),
+        "skipped": skipped,
+        "completed": len(completed),
+        "failed": failed,
+        "audio_hours": audio_seconds / 3600,
+        "wall_hours": wall_seconds / 3600,
+        # 벽시계 1시간당 처리한 오디오 시간
+        "throughput": audio_seconds / wall_seconds if wall_seconds else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m thinking_box.stt",
+        description="Thinking Box STT 명령줄 도구"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="디렉토리 일괄 전사")
+    batch.add_argument("directory", help="녹음 파일 폴더")
+    batch.add_argument("--workers", "-w", type=int, default=2, help="동시 처리 수")
+    batch.add_argument("--model", default="base", help="Whisper 모델 (tiny/base/small)")
+    batch.add_argument(
+        "--language", default=AUTO_LANGUAGE,
+        help="언어 코드 (기본 auto: 파일별 1회 감지 후 캐시)"
+    )
+    batch.add_argument("--profile", help="디코딩 프로필 (fast/balanced/accurate/auto)")
+    batch.add_argument("--no-preprocess", action="store_true", help="무음 제거 전처리 끄기")
+    batch.add_argument("--quantize", action="store_true", help="int8 quantization (CPU)")
+    batch.add_argument("--socket", help="공유 STT 서비스 소켓 (지정 시 로컬 모델 로딩 안 함)")
+    batch.add_argument("--no-recursive", action="store_true", help="하위 폴더 제외")
+    batch.add_argument("--force", action="store_true", help="완료된 파일도 다시 전사")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "batch":
+        summary = run_batch(
+            args.directory,
+            workers=args.workers,
+            model_name=args.model,
+            language=args.language,
+            profile=args.profile,
+            preprocess=not args.no_preprocess,
+            quantize=args.quantize,
+            socket_path=args.socket,
+            recursive=not args.no_recursive,
+            force=args.force
+        )
+
+        print("\n" + "=" * 60)
+        print("📊 일괄 전사 결과")
+        print("=" * 60)
+        print(f"완료: {summary['completed']}개 / 건너뜀: {summary['skipped']}개 / 실패: {len(summary['failed'])}개")
+        print(f"오디오: {summary['audio_hours']:.2f}시간 / 소요: {summary['wall_hours']:.2f}시간")
+        print(f"처리량: {summary['throughput']:.1f} 오디오 시간 / 벽시계 시간")
+
+        if summary["failed"]:
+            raise SystemExit(1)
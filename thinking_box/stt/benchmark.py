@@ -0,0 +1,448 @@
+"""
+STT benchmarks
+
+1) suite: 30초 / 5분 / 60분 기준 클립으로 모델 크기 × 디코딩 옵션별
+   로딩 시간, real-time factor(RTF), peak RSS, 윈도우별 디코딩 지연을 측정
+2) quantization: 같은 클립을 fp32 / int8 모델로 전사하여
+   RTF와 word error rate 차이를 측정
+
+사용법:
+    cd thinking_box
+    python -m stt.benchmark suite --models tiny base small --json stt_bench.json
+    python -m stt.benchmark suite --sample samples/meeting_ko.wav --durations 30 300
+    python -m stt.benchmark quantization clips/*.wav --model base --threads 4
+
+    # clips/meeting.wav 옆에 clips/meeting.txt (정답 전사)가 있으면 정답 대비 WER,
+    # 없으면 fp32 결과를 기준으로 int8 결과의 WER을 계산합니다.
+
+suite 클립은 --sample 오디오를 반복 이어 붙여 만들고, 없으면 ffmpeg로
+음성 비슷한 합성 신호(발화/휴지 반복)를 생성합니다. 합성 클립은 속도 측정용이며
+정확도 비교에는 실제 녹음 샘플을 사용하세요.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import subprocess
+import sys
+import time
+
+from .preprocess import probe_duration
+from .whisper_stt import WhisperSTT
+
+
+def edit_distance(reference: Sequence, hypothesis: Sequence) -> int:
+    """Levenshtein distance (치환/삽입/삭제 비용 1)"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_item in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_item in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_item != hyp_item)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """공백 기준 단어 오류율"""
+    ref_words = reference.split()
+    if not ref_words:
+        return 0.0 if not hypothesis.split() else 1.0
+    return edit_distance(ref_words, hypothesis.split()) / len(ref_words)
+
+
+def char_error_rate(reference: str, hypothesis: str) -> float:
+    """공백 제외 문자 오류율 (한국어는 어절 단위 WER보다 안정적)"""
+    ref_chars = "".join(reference.split())
+    if not ref_chars:
+        return 0.0 if not "".join(hypothesis.split()) else 1.0
+    return edit_distance(ref_chars, "".join(hypothesis.split())) / len(ref_chars)
+
+
+def _load_reference(clip: Path) -> Optional[str]:
+    reference = clip.with_suffix(".txt")
+    if reference.exists():
+        return reference.read_text(encoding="utf-8")
+    return None
+
+
+def _run_variant(
+    clips: List[Path],
+    model_name: str,
+    language: Optional[str],
+    **stt_options
+) -> dict:
+    start = time.perf_counter()
+    stt = WhisperSTT(model_name=model_name, **stt_options)
+    load_seconds = time.perf_counter() - start
+
+    results = {}
+    for clip in clips:
+        start = time.perf_counter()
+        text = stt.transcribe(str(clip), language=language)
+        results[str(clip)] = {
+            "text": text,
+            "seconds": time.perf_counter() - start
+        }
+
+    return {"load_seconds": load_seconds, "clips": results}
+
+
+def benchmark_quantization(
+    clips: List[str],
+    model_name: str = "base",
+    language: Optional[str] = None,
+    intra_op_threads: Optional[int] = None,
+    inter_op_threads: Optional[int] = None
+) -> dict:
+    """
+    fp32 vs int8 비교
+
+    Returns:
+        {
+            'model': str,
+            'fp32_load_seconds': float,
+            'int8_load_seconds': float,
+            'clips': [{clip, duration, rtf_fp32, rtf_int8, wer_fp32, wer_int8, wer_delta, ...}]
+        }
+    """
+    clip_paths = [Path(c) for c in clips]
+    thread_options = {
+        "intra_op_threads": intra_op_threads,
+        "inter_op_threads": inter_op_threads
+    }
+
+    fp32 = _run_variant(clip_paths, model_name, language, quantize=False, **thread_options)
+    int8 = _run_variant(clip_paths, model_name, language, quantize=True, **thread_options)
+
+    rows = []
+    for clip in clip_paths:
+        duration = probe_duration(str(clip))
+        fp32_clip = fp32["clips"][str(clip)]
+        int8_clip = int8["clips"][str(clip)]
+        reference = _load_reference(clip)
+
+        row = {
+            "clip": str(clip),
+            "duration": duration,
+            "rtf_fp32": fp32_clip["seconds"] / duration,
+            "rtf_int8": int8_clip["seconds"] / duration,
+            "reference": "transcript" if reference is not None else "fp32",
+        }
+        if reference is not None:
+            row["wer_fp32"] = word_error_rate(reference, fp32_clip["text"])
+            row["wer_int8"] = word_error_rate(reference, int8_clip["text"])
+            row["cer_fp32"] = char_error_rate(reference, fp32_clip["text"])
+            row["cer_int8"] = char_error_rate(reference, int8_clip["text"])
+        else:
+            # 정답이 없으면 fp32 결과를 기준으로 int8이 얼마나 달라졌는지 측정
+            row["wer_fp32"] = 0.0
+            row["wer_int8"] = word_error_rate(fp32_clip["text"], int8_clip["text"])
+            row["cer_fp32"] = 0.0
+            row["cer_int8"] = char_error_rate(fp32_clip["text"], int8_clip["text"])
+        row["wer_delta"] = row["wer_int8"] - row["wer_fp32"]
+        row["cer_delta"] = row["cer_int8"] - row["cer_fp32"]
+        rows.append(row)
+
+    return {
+        "model": model_name,
+        "intra_op_threads": intra_op_threads,
+        "inter_op_threads": inter_op_threads,
+        "fp32_load_seconds": fp32["load_seconds"],
+        "int8_load_seconds": int8["load_seconds"],
+        "clips": rows
+    }
+
+
+DEFAULT_DURATIONS = (30, 300, 3600)
+
+# 디코딩 옵션 조합 (WhisperSTT 생성 인자)
+VARIANTS: Dict[str, dict] = {
+    "default": {},
+    "preprocess": {"preprocess": True},
+    "int8": {"quantize": True},
+    "int8+preprocess": {"quantize": True, "preprocess": True},
+    "fast": {"profile": "fast"},
+    "balanced": {"profile": "balanced"},
+    "accurate": {"profile": "accurate"},
+}
+
+# 발화(약 4.5초) / 휴지(1.5초)가 반복되는 음성 비슷한 합성 신호
+_SYNTHETIC_EXPR = (
+    "0.4*sin(2*PI*(140+40*sin(2*PI*0.7*t))*t)"
+    "*(0.6+0.4*sin(2*PI*4*t))"
+    "*gt(mod(t\\,6)\\,1.5)"  # lavfi에서 쉼표는 필터 구분자이므로 escape
+)
+
+
+def prepare_clips(
+    out_dir: str,
+    durations: Sequence[int] = DEFAULT_DURATIONS,
+    sample: Optional[str] = None
+) -> List[Path]:
+    """
+    기준 클립 생성 (이미 있으면 재사용)
+
+    Args:
+        out_dir: 클립 저장 디렉토리
+        durations: 클립 길이 목록 (초)
+        sample: 반복해서 이어 붙일 실제 녹음 파일 (없으면 합성 신호)
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    source = Path(sample).stem if sample else "synthetic"
+    clips = []
+    for duration in durations:
+        clip = out / f"{source}_{duration}s.wav"
+        if not clip.exists():
+            if sample:
+                cmd = ["-stream_loop", "-1", "-i", str(sample)]
+            else:
+                cmd = ["-f", "lavfi", "-i", f"aevalsrc={_SYNTHETIC_EXPR}:s=16000"]
+            subprocess.run(
+                ["ffmpeg", "-nostdin", "-loglevel", "error", "-y", *cmd,
+                 "-t", str(duration), "-ac", "1", "-ar", "16000", str(clip)],
+                check=True
+            )
+        clips.append(clip)
+    return clips
+
+
+def _peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 bytes 단위
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _measure_run(
+    model_name: str,
+    options: dict,
+    clips: List[str],
+    language: Optional[str],
+    results
+):
+    """별도 프로세스에서 실행 (peak RSS를 설정별로 분리하기 위해)"""
+    try:
+        start = time.perf_counter()
+        stt = WhisperSTT(model_name=model_name, **options)
+        load_seconds = time.perf_counter() - start
+
+        # transcribe 내부의 30초 윈도우별 decode 호출 시간 기록
+        window_seconds: List[float] = []
+        original_decode = stt.model.decode
+
+        def timed_decode(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return original_decode(*args, **kwargs)
+            finally:
+                window_seconds.append(time.perf_counter() - t)
+
+        stt.model.decode = timed_decode
+
+        clip_rows = []
+        for clip in clips:
+            window_seconds.clear()
+            duration = probe_duration(clip)
+            start = time.perf_counter()
+            info = stt.transcribe_with_info(clip, language=language)
+            elapsed = time.perf_counter() - start
+            segments = info["segments"]
+            clip_rows.append({
+                "clip": clip,
+                "duration": duration,
+                "seconds": elapsed,
+                "rtf": elapsed / duration if duration else None,
+                "segments": len(segments),
+                "seconds_per_segment": elapsed / len(segments) if segments else None,
+                "windows": len(window_seconds),
+                "window_latency_p50": _percentile(window_seconds, 0.5),
+                "window_latency_p95": _percentile(window_seconds, 0.95),
+                "window_latency_max": max(window_seconds) if window_seconds else None,
+            })
+
+        results.put({
+            "load_seconds": load_seconds,
+            "peak_rss_mb": _peak_rss_mb(),
+            "clips": clip_rows
+        })
+    except Exception as e:
+        results.put({"error": str(e)})
+
+
+def run_suite(
+    clips: List[Path],
+    models: Sequence[str] = ("tiny", "base", "small"),
+    variants: Sequence[str] = ("default", "preprocess", "int8"),
+    language: Optional[str] = None,
+    intra_op_threads: Optional[int] = None
+) -> dict:
+    """
+    모델 × 옵션 조합마다 새 프로세스에서 측정
+
+    Returns:
+        JSON 직렬화 가능한 리포트 (host 정보 + run별 결과)
+    """
+    ctx = multiprocessing.get_context("spawn")
+    runs = []
+
+    for model_name in models:
+        for variant in variants:
+            options = dict(VARIANTS[variant])
+            if intra_op_threads:
+                options["intra_op_threads"] = intra_op_threads
+
+            print(f"▶ {model_name} / {variant} ...", flush=True)
+            results = ctx.Queue()
+            proc = ctx.Process(
+                target=_measure_run,
+                args=(model_name, options, [str(c) for c in clips], language, results)
+            )
+            proc.start()
+            while True:
+                try:
+                    measured = results.get(timeout=5)
+                    break
+                except queue.Empty:
+                    if not proc.is_alive():
+                        # OOM kill 등으로 결과 없이 종료된 경우
+                        measured = {"error": f"benchmark process exited with code {proc.exitcode}"}
+                        break
+            proc.join()
+
+            runs.append({"model": model_name, "variant": variant, "options": options, **measured})
+
+    return {
+        "host": {
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": runs
+    }
+
+
+def print_suite_report(report: dict):
+    print("=" * 86)
+    print(f"🎤 STT benchmark ({report['host']['machine']}, {report['host']['cpu_count']} CPUs)")
+    print("=" * 86)
+    print(
+        f"{'model':6s} {'variant':16s} {'clip':>7s} {'load':>6s} {'RTF':>7s} "
+        f"{'p50 win':>8s} {'p95 win':>8s} {'RSS MB':>8s}"
+    )
+    for run in report["runs"]:
+        if "error" in run:
+            print(f"{run['model']:6s} {run['variant']:16s} ❌ {run['error']}")
+            continue
+        for clip in run["clips"]:
+            print(
+                f"{run['model']:6s} {run['variant']:16s} "
+                f"{clip['duration']:6.0f}s "
+                f"{run['load_seconds']:5.1f}s "
+                f"{clip['rtf']:7.3f} "
+                f"{(clip['window_latency_p50'] or 0):7.2f}s "
+                f"{(clip['window_latency_p95'] or 0):7.2f}s "
+                f"{run['peak_rss_mb']:8.0f}"
+            )
+
+
+def print_quantization_report(report: dict):
+    print("=" * 78)
+    print(f"🎤 int8 quantization benchmark (model: {report['model']})")
+    print("=" * 78)
+    print(f"load: fp32 {report['fp32_load_seconds']:.1f}s / int8 {report['int8_load_seconds']:.1f}s")
+    print()
+    print(f"{'clip':30s} {'dur':>7s} {'RTF fp32':>9s} {'RTF int8':>9s} {'WER Δ':>7s} {'CER Δ':>7s}")
+    for row in report["clips"]:
+        print(
+            f"{Path(row['clip']).name[:30]:30s} "
+            f"{row['duration']:6.1f}s "
+            f"{row['rtf_fp32']:9.3f} "
+            f"{row['rtf_int8']:9.3f} "
+            f"{row['wer_delta']:+7.3f} "
+            f"{row['cer_delta']:+7.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Thinking Box STT 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    suite = subparsers.add_parser("suite", help="모델 × 옵션별 RTF / 메모리 / 지연 측정")
+    suite.add_argument("--models", nargs="+", default=["tiny", "base", "small"])
+    suite.add_argument(
+        "--variants", nargs="+", default=["default", "preprocess", "int8"],
+        choices=sorted(VARIANTS)
+    )
+    suite.add_argument(
+        "--durations", nargs="+", type=int, default=list(DEFAULT_DURATIONS),
+        help="클립 길이 (초)"
+    )
+    suite.add_argument("--sample", help="반복해서 사용할 실제 녹음 (없으면 합성 신호)")
+    suite.add_argument("--clips-dir", default="stt_bench_clips", help="클립 저장 위치")
+    suite.add_argument("--language", help="언어 코드 (예: ko)")
+    suite.add_argument("--threads", type=int, help="PyTorch intra-op 스레드 수")
+    suite.add_argument("--json", default="stt_benchmark.json", help="결과 JSON 저장 경로")
+
+    quant = subparsers.add_parser("quantization", help="fp32 vs int8 RTF / WER 비교")
+    quant.add_argument("clips", nargs="+", help="테스트 오디오 클립")
+    quant.add_argument("--model", default="base", help="Whisper 모델 (tiny/base/small)")
+    quant.add_argument("--language", help="언어 코드 (예: ko)")
+    quant.add_argument("--threads", type=int, help="PyTorch intra-op 스레드 수")
+    quant.add_argument("--interop-threads", type=int, help="PyTorch inter-op 스레드 수")
+    quant.add_argument("--json", help="결과 JSON 저장 경로")
+
+    args = parser.parse_args()
+
+    if args.command == "suite":
+        clips = prepare_clips(args.clips_dir, args.durations, sample=args.sample)
+        report = run_suite(
+            clips,
+            models=args.models,
+            variants=args.variants,
+            language=args.language,
+            intra_op_threads=args.threads
+        )
+        print_suite_report(report)
+
+    elif args.command == "quantization":
+        report = benchmark_quantization(
+            args.clips,
+            model_name=args.model,
+            language=args.language,
+            intra_op_threads=args.threads,
+            inter_op_threads=args.interop_threads
+        )
+        print_quantization_report(report)
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+        print(f"\n📄 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
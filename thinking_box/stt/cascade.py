@@ -0,0 +1,98 @@
+"""
+Two-pass draft → refine STT cascade
+
+tiny 모델로 빠르게 초안을 만들어 바로 보여주고 InputAgent에 넘긴 뒤,
+base/small 모델로 백그라운드에서 다시 전사하여 준비되면 교체합니다.
+대기 시간은 tiny 수준, 최종 정확도는 base/small 수준.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .language import AUTO_LANGUAGE
+
+
+# 정밀 전사용 공유 실행기 (모델별 직렬화는 각 STT 객체가 담당)
+_refine_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stt-refine")
+
+
+class CascadeResult:
+    """
+    초안 전사 + 백그라운드 정밀 전사 핸들
+    """
+
+    def __init__(self, draft_info: dict, draft_model: str, refine_model: str, future: Future):
+        self.draft = draft_info["text"]
+        self.draft_info = draft_info
+        self.draft_model = draft_model
+        self.refine_model = refine_model
+        self.future = future
+
+    @property
+    def refined_ready(self) -> bool:
+        return self.future.done()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        if not self.future.done():
+            return None
+        return self.future.exception()
+
+    @property
+    def text(self) -> str:
+        """정밀 전사가 끝났으면 정밀 결과, 아니면 초안"""
+        if self.future.done() and self.future.exception() is None:
+            return self.future.result()["text"]
+        return self.draft
+
+    def wait(self, timeout: Optional[float] = None) -> dict:
+        """정밀 전사 결과(transcribe_with_info 형식)를 기다려 반환"""
+        return self.future.result(timeout=timeout)
+
+
+def run_cascade(
+    draft_stt,
+    refine_stt,
+    audio_path: str,
+    language: Optional[str] = None,
+    on_refined: Optional[Callable[[dict], None]] = None,
+    executor: Optional[ThreadPoolExecutor] = None,
+    profile: Optional[str] = None
+) -> CascadeResult:
+    """
+    draft_stt로 즉시 전사하고 refine_stt 전사는 백그라운드로 제출
+
+    Args:
+        draft_stt: 초안용 STT (transcribe_with_info 지원)
+        refine_stt: 정밀 전사용 STT
+        audio_path: 오디오 파일 경로
+        language: 언어 코드. None/'auto'면 초안 모델로 한 번만 감지(파일 해시 캐시)하여
+            초안과 정밀 전사 모두에 사용
+        on_refined: 정밀 전사 완료 시 호출할 콜백 (백그라운드 스레드에서 실행)
+        executor: 정밀 전사 실행기 (기본: 모듈 공유 실행기)
+        profile: 정밀 전사 디코딩 프로필 (초안은 항상 fast)
+    """
+    if language in (None, AUTO_LANGUAGE) and hasattr(draft_stt, "detect_language"):
+        language = draft_stt.detect_language(audio_path)
+
+    draft_info = draft_stt.transcribe_with_info(audio_path, language=language, profile="fast")
+
+    # 언어 감지를 두 번 하지 않도록 초안 결과를 재사용
+    refine_language = language
+    if refine_language in (None, AUTO_LANGUAGE) and draft_info.get("language") not in (None, "unknown"):
+        refine_language = draft_info["language"]
+
+    def refine() -> dict:
+        info = refine_stt.transcribe_with_info(
+            audio_path, language=refine_language, profile=profile
+        )
+        if on_refined is not None:
+            on_refined(info)
+        return info
+
+    future = (executor or _refine_executor).submit(refine)
+    return CascadeResult(
+        draft_info,
+        draft_model=draft_stt.model_name,
+        refine_model=refine_stt.model_name,
+        future=future
+    )
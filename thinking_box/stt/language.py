@@ -0,0 +1,60 @@
+"""
+Language detection cache
+
+파일 내용 해시 → 감지된 언어 코드.
+같은 오디오에 대해 초안/정밀 전사, 청크별/병렬 전사가 언어 감지를 반복하지 않도록
+프로세스 전체에서 공유합니다.
+"""
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import threading
+
+
+AUTO_LANGUAGE = "auto"  # language 인자로 넘기면 캐시된 감지 결과 사용
+
+
+def audio_hash(audio_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """오디오 파일 내용의 SHA-1 (임시 파일 경로가 달라도 같은 내용이면 같은 키)"""
+    digest = hashlib.sha1()
+    with open(audio_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LanguageCache:
+    """크기 제한 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            language = self._entries.get(key)
+            if language is not None:
+                self._entries.move_to_end(key)
+            return language
+
+    def put(self, key: str, language: str):
+        with self._lock:
+            self._entries[key] = language
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_for_file(self, audio_path: str) -> Optional[str]:
+        return self.get(audio_hash(audio_path))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 프로세스 공유 캐시
+language_cache = LanguageCache()
@@ -0,0 +1,295 @@
+"""
+Memory-bounded Whisper model pool
+
+모델을 요청 시점에 로딩하고, 일정 시간 사용되지 않으면 내려서
+텍스트 전용 요청이 대부분인 환경에서 메모리를 돌려줍니다.
+여러 모델 크기(tiny/base/small)를 전역 메모리 예산 안에서 LRU로 관리합니다.
+
+사용법:
+    pool = STTModelPool(memory_budget_mb=1200, idle_timeout=600)
+    text = pool.transcribe("meeting.m4a", language="ko", model_name="small")
+
+    stt = pool.model("base")   # WhisperSTT와 같은 인터페이스
+    text = stt.transcribe("meeting.m4a")
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Optional
+import gc
+import sys
+import threading
+import time
+
+from .cascade import CascadeResult, run_cascade
+from .language import language_cache
+from .whisper_stt import WhisperSTT
+
+
+# 로딩 후 상주 메모리 추정치 (MB, CPU 기준)
+MODEL_MEMORY_MB = {
+    "tiny": 150,
+    "base": 300,
+    "small": 900,
+    "medium": 2500,
+    "large": 5000,
+}
+
+
+class _PoolEntry:
+    """모델 크기 1개에 대한 슬롯"""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.stt: Optional[WhisperSTT] = None
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        # 로딩과 전사를 직렬화 (Whisper 모델은 스레드 안전하지 않음)
+        self.lock = threading.Lock()
+
+    @property
+    def memory_mb(self) -> int:
+        return MODEL_MEMORY_MB.get(self.model_name, MODEL_MEMORY_MB["small"])
+
+
+class STTModelPool:
+    """
+    Lazy loading + idle unloading + LRU eviction
+    """
+
+    def __init__(
+        self,
+        memory_budget_mb: int = 1200,
+        idle_timeout: float = 600,
+        default_model: str = "base",
+        preprocess: bool = False,
+        **stt_options
+    ):
+        """
+        Args:
+            memory_budget_mb: 동시에 올려둘 모델들의 메모리 예산 (MB)
+            idle_timeout: 마지막 사용 후 이 시간(초)이 지나면 모델 해제 (0이면 해제 안 함)
+            default_model: model_name 미지정 시 사용할 모델
+            preprocess: 무음 제거 전처리 사용 여부
+            **stt_options: WhisperSTT에 그대로 전달 (quantize, intra_op_threads 등)
+        """
+        self.memory_budget_mb = memory_budget_mb
+        self.idle_timeout = idle_timeout
+        self.default_model = default_model
+        self.preprocess = preprocess
+        self.stt_options = stt_options
+
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        if idle_timeout:
+            self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+            self._reaper.start()
+
+    @property
+    def model_name(self) -> str:
+        return self.default_model
+
+    def model(self, model_name: Optional[str] = None) -> "PooledSTT":
+        """특정 모델 크기에 고정된 WhisperSTT 호환 뷰"""
+        return PooledSTT(self, model_name or self.default_model)
+
+    def transcribe(
+        self,
+        audio_path: str,
+        language: Optional[str] = None,
+        model_name: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> str:
+        with self._use(model_name or self.default_model) as stt:
+            return stt.transcribe(audio_path, language=language, profile=profile)
+
+    def transcribe_with_info(
+        self,
+        audio_path: str,
+        language: Optional[str] = None,
+        model_name: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> dict:
+        with self._use(model_name or self.default_model) as stt:
+            return stt.transcribe_with_info(audio_path, language=language, profile=profile)
+
+    def preload(self, model_name: Optional[str] = None):
+        """요청 전에 미리 로딩 (앱 시작 시 warm-up용)"""
+        with self._use(model_name or self.default_model):
+            pass
+
+    def detect_language(self, audio_path: str, model_name: Optional[str] = None) -> str:
+        """캐시에 있으면 모델을 로딩하지 않고 바로 반환"""
+        cached = language_cache.get_for_file(audio_path)
+        if cached is not None:
+            return cached
+        with self._use(model_name or self.default_model) as stt:
+            return stt.detect_language(audio_path)
+
+    def loaded_models(self) -> list:
+        """현재 메모리에 올라와 있는 모델 (LRU 순서, 오래된 것부터)"""
+        with self._lock:
+            return [name for name, entry in self._entries.items() if entry.stt is not None]
+
+    def stats(self) -> dict:
+        with self._lock:
+            loaded = [e for e in self._entries.values() if e.stt is not None]
+            now = time.monotonic()
+            return {
+                "memory_budget_mb": self.memory_budget_mb,
+                "memory_used_mb": sum(e.memory_mb for e in loaded),
+                "models": {
+                    e.model_name: {
+                        "in_use": e.in_use,
+                        "idle_seconds": round(now - e.last_used, 1)
+                    }
+                    for e in loaded
+                }
+            }
+
+    def unload(self, model_name: str) -> bool:
+        """사용 중이 아니면 모델 해제"""
+        with self._lock:
+            entry = self._entries.get(model_name)
+            if entry is None or entry.stt is None or entry.in_use:
+                return False
+            self._release(entry)
+        gc.collect()
+        return True
+
+    def unload_idle(self) -> list:
+        """idle_timeout을 넘긴 모델 해제, 해제된 모델 이름 반환"""
+        now = time.monotonic()
+        unloaded = []
+        with self._lock:
+            for entry in self._entries.values():
+                if (
+                    entry.stt is not None
+                    and not entry.in_use
+                    and now - entry.last_used >= self.idle_timeout
+                ):
+                    self._release(entry)
+                    unloaded.append(entry.model_name)
+        if unloaded:
+            gc.collect()
+        return unloaded
+
+    def close(self):
+        """리퍼 스레드 종료 + 모든 모델 해제"""
+        self._stop.set()
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.stt is not None and not entry.in_use:
+                    self._release(entry)
+        gc.collect()
+
+    @contextmanager
+    def _use(self, model_name: str):
+        with self._lock:
+            entry = self._entries.get(model_name)
+            if entry is None:
+                entry = _PoolEntry(model_name)
+                self._entries[model_name] = entry
+            entry.in_use += 1
+            self._entries.move_to_end(model_name)
+
+        try:
+            with entry.lock:
+                if entry.stt is None:
+                    self._make_room(entry)
+                    entry.stt = WhisperSTT(
+                        model_name=model_name,
+                        preprocess=self.preprocess,
+                        **self.stt_options
+                    )
+                    # auto 프로필: 같은 모델을 기다리는 다른 요청 수를 부하로 사용
+                    entry.stt.load_monitor = lambda: max(entry.in_use - 1, 0)
+                yield entry.stt
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def _make_room(self, target: _PoolEntry):
+        """target을 올릴 수 있도록 오래 사용되지 않은 모델부터 해제"""
+        evicted = False
+        with self._lock:
+            used = sum(
+                e.memory_mb for e in self._entries.values()
+                if e.stt is not None and e is not target
+            )
+            for entry in self._entries.values():  # LRU 순서
+                if used + target.memory_mb <= self.memory_budget_mb:
+                    break
+                if entry is target or entry.stt is None or entry.in_use:
+                    continue
+                used -= entry.memory_mb
+                self._release(entry)
+                evicted = True
+        # 모두 사용 중이면 예산을 잠시 넘기더라도 요청은 처리
+        if evicted:
+            gc.collect()
+
+    @staticmethod
+    def _release(entry: _PoolEntry):
+        entry.stt = None
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _reap_loop(self):
+        interval = min(max(self.idle_timeout / 4, 1), 60)
+        while not self._stop.wait(interval):
+            self.unload_idle()
+
+
+class PooledSTT:
+    """
+    STTModelPool의 모델 1개를 WhisperSTT처럼 사용하는 얇은 래퍼
+    """
+
+    def __init__(self, pool: STTModelPool, model_name: str):
+        self.pool = pool
+        self.model_name = model_name
+
+    def transcribe(
+        self,
+        audio_path: str,
+        language: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> str:
+        return self.pool.transcribe(
+            audio_path, language=language, model_name=self.model_name, profile=profile
+        )
+
+    def transcribe_with_info(
+        self,
+        audio_path: str,
+        language: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> dict:
+        return self.pool.transcribe_with_info(
+            audio_path, language=language, model_name=self.model_name, profile=profile
+        )
+
+    def detect_language(self, audio_path: str) -> str:
+        return self.pool.detect_language(audio_path, model_name=self.model_name)
+
+    def transcribe_cascade(
+        self,
+        audio_path: str,
+        language: Optional[str] = None,
+        draft_model: str = "tiny",
+        on_refined: Optional[Callable[[dict], None]] = None,
+        profile: Optional[str] = None
+    ) -> CascadeResult:
+        """풀의 draft_model로 초안, 이 모델로 백그라운드 정밀 전사"""
+        return run_cascade(
+            self.pool.model(draft_model),
+            self,
+            audio_path,
+            language=language,
+            on_refined=on_refined,
+            profile=profile
+        )
@@ -0,0 +1,382 @@
+"""
+Audio preprocessing for Whisper STT
+16 kHz mono PCM 정규화 + 긴 무음 구간 제거
+
+ffmpeg 한 번의 스트리밍 패스로 리샘플/다운믹스하고,
+무음 구간을 잘라낸 뒤 원본 타임스탬프로 되돌릴 수 있는 offset map을 기록합니다.
+회의 녹음은 보통 30-40%가 무음이므로 Whisper 연산량이 그만큼 줄어듭니다.
+"""
+from bisect import bisect_left, bisect_right
+from collections import deque
+from pathlib import Path
+from typing import List, Optional, Tuple
+import subprocess
+
+import numpy as np
+
+
+SAMPLE_RATE = 16000  # Whisper 입력 샘플레이트
+
+
+class OffsetMap:
+    """
+    잘라낸 오디오의 위치 → 원본 오디오의 위치 변환표
+
+    각 span은 (out_start, src_start, length) 샘플 단위 튜플이며,
+    잘라낸 오디오에서 연속으로 이어 붙인 원본 구간 하나를 의미합니다.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.spans: List[Tuple[int, int, int]] = []
+        self._out_starts: List[int] = []
+
+    def add(self, out_start: int, src_start: int, length: int):
+        """원본 src_start부터 length 샘플을 out_start 위치에 붙였음을 기록"""
+        if self.spans:
+            last_out, last_src, last_len = self.spans[-1]
+            # 원본/출력 모두 이어지면 마지막 span을 연장
+            if last_out + last_len == out_start and last_src + last_len == src_start:
+                self.spans[-1] = (last_out, last_src, last_len + length)
+                return
+        self.spans.append((out_start, src_start, length))
+        self._out_starts.append(out_start)
+
+    def to_original(self, seconds: float, end: bool = False) -> float:
+        """
+        잘라낸 오디오 기준 시각(초)을 원본 기준 시각으로 변환
+
+        Args:
+            seconds: 잘라낸 오디오에서의 시각
+            end: 구간 끝 시각이면 True (span 경계에서 이전 span에 붙임)
+        """
+        if not self.spans:
+            return seconds
+
+        sample = int(round(seconds * self.sample_rate))
+        if end:
+            idx = bisect_left(self._out_starts, sample) - 1
+        else:
+            idx = bisect_right(self._out_starts, sample) - 1
+        idx = max(idx, 0)
+
+        out_start, src_start, length = self.spans[idx]
+        offset = min(max(sample - out_start, 0), length)
+        return (src_start + offset) / self.sample_rate
+
+    def remap_segments(self, segments: list) -> list:
+        """Whisper segment(및 word) 타임스탬프를 원본 기준으로 변환"""
+        remapped = []
+        for segment in segments:
+            segment = dict(segment)
+            segment["start"] = self.to_original(segment["start"])
+            segment["end"] = self.to_original(segment["end"], end=True)
+            if segment.get("words"):
+                segment["words"] = [
+                    {
+                        **word,
+                        "start": self.to_original(word["start"]),
+                        "end": self.to_original(word["end"], end=True),
+                    }
+                    for word in segment["words"]
+                ]
+            remapped.append(segment)
+        return remapped
+
+
+class PreprocessedAudio:
+    """전처리 결과: Whisper에 바로 넣을 수 있는 float32 배열 + offset map"""
+
+    def __init__(
+        self,
+        audio: np.ndarray,
+        offset_map: OffsetMap,
+        original_samples: int,
+        sample_rate: int = SAMPLE_RATE
+    ):
+        self.audio = audio
+        self.offset_map = offset_map
+        self.original_samples = original_samples
+        self.sample_rate = sample_rate
+
+    @property
+    def original_duration(self) -> float:
+        return self.original_samples / self.sample_rate
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.sample_rate
+
+    @property
+    def removed_ratio(self) -> float:
+        """잘라낸 무음 비율 (0~1)"""
+        if not self.original_samples:
+            return 0.0
+        return 1.0 - len(self.audio) / self.original_samples
+
+
+class AudioPreprocessor:
+    """
+    ffmpeg 스트리밍 디코딩 + 에너지 기반 무음 제거
+
+    - 앞/뒤 무음은 keep_silence 만큼만 남기고 제거
+    - 내부 무음은 min_silence보다 길 때만 keep_silence 길이로 축소
+    """
+
+    def __init__(
+        self,
+        silence_threshold_db: float = -40.0,
+        min_silence: float = 1.0,
+        keep_silence: float = 0.3,
+        frame_ms: int = 30,
+        sample_rate: int = SAMPLE_RATE
+    ):
+        """
+        Args:
+            silence_threshold_db: 이 dBFS 미만 프레임은 무음으로 간주
+            min_silence: 이보다 긴 내부 무음만 축소 (초)
+            keep_silence: 발화 경계에 남겨둘 무음 길이 (초, 양쪽 합계)
+            frame_ms: 에너지 계산 프레임 길이 (ms)
+            sample_rate: 출력 샘플레이트 (Whisper는 16000)
+        """
+        self.silence_threshold_db = silence_threshold_db
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.min_silence_frames = max(int(min_silence * 1000 / frame_ms), 1)
+        # 앞/뒤 pad가 겹치지 않도록 min_silence의 절반으로 제한
+        self.pad_frames = min(
+            max(int(keep_silence * 1000 / frame_ms / 2), 0),
+            self.min_silence_frames // 2
+        )
+        self.chunk_bytes = self.frame_size * 2 * 256  # s16le, 프레임 256개 단위로 읽기
+
+    def process(self, audio_path: str) -> PreprocessedAudio:
+        """
+        오디오 파일을 16 kHz mono로 디코딩하고 무음을 제거
+
+        Raises:
+            FileNotFoundError: 오디오 파일이 없을 때
+            RuntimeError: ffmpeg 디코딩 실패 시
+        """
+        audio_path = Path(audio_path)
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        return self.process_frames(self._decode(audio_path))
+
+    def process_prefix(
+        self,
+        audio_path: str,
+        seconds: float,
+        max_source_seconds: Optional[float] = None
+    ) -> PreprocessedAudio:
+        """
+        앞부분만 디코딩해 무음 제거 (언어 감지용)
+
+        발화 프레임이 seconds초만큼 모이거나 원본을 max_source_seconds초(기본 seconds의 4배)
+        읽으면 ffmpeg를 멈추므로, 긴 녹음도 전체를 디코딩하지 않습니다.
+
+        Raises:
+            FileNotFoundError: 오디오 파일이 없을 때
+            RuntimeError: ffmpeg 디코딩 실패 시
+        """
+        audio_path = Path(audio_path)
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        target = int(seconds * self.sample_rate)
+        limit = int((max_source_seconds or seconds * 4) * self.sample_rate)
+
+        def frames():
+            decoded = self._decode(audio_path)
+            voiced = read = 0
+            try:
+                for frame in decoded:
+                    yield frame
+                    read += len(frame)
+                    if self._is_voiced(frame):
+                        voiced += len(frame)
+                    if voiced >= target or read >= limit:
+                        return
+            finally:
+                # 중간에 멈추면 ffmpeg 파이프를 닫아 프로세스 종료
+                decoded.close()
+
+        result = self.process_frames(frames())
+        result.audio = result.audio[:target]
+        return result
+
+    def process_frames(self, frames) -> PreprocessedAudio:
+        """
+        int16 PCM 프레임 iterator를 받아 무음 제거
+
+        스트리밍 입력(WebSocket 등)에도 그대로 사용할 수 있도록 분리
+        """
+        output: List[np.ndarray] = []
+        offset_map = OffsetMap(self.sample_rate)
+        out_pos = 0
+        src_pos = 0
+
+        # 아직 유지 여부가 결정되지 않은 무음 프레임
+        pending: List[Tuple[int, np.ndarray]] = []
+        pending_tail: Optional[deque] = None  # 긴 무음일 때 마지막 pad 프레임만 유지
+        seen_voice = False
+
+        def emit(items):
+            nonlocal out_pos
+            for start, frame in items:
+                output.append(frame)
+                offset_map.add(out_pos, start, len(frame))
+                out_pos += len(frame)
+
+        def flush_pending(before_voice: bool):
+            if not pending:
+                return
+            head = pending[:self.pad_frames]
+            if pending_tail is not None:
+                tail = list(pending_tail)
+            else:
+                tail = pending[-self.pad_frames:] if self.pad_frames else []
+
+            if not seen_voice:
+                # 앞쪽 무음: 발화 직전 pad만 유지
+                emit(tail if before_voice else [])
+            elif not before_voice:
+                # 뒤쪽 무음: 발화 직후 pad만 유지
+                emit(head)
+            elif pending_tail is None and len(pending) <= self.min_silence_frames:
+                # 짧은 내부 무음은 그대로 유지
+                emit(pending)
+            else:
+                emit(head + tail)
+
+        for frame in frames:
+            if self._is_voiced(frame):
+                flush_pending(before_voice=True)
+                pending = []
+                pending_tail = None
+                emit([(src_pos, frame)])
+                seen_voice = True
+            elif pending_tail is not None:
+                pending_tail.append((src_pos, frame))
+            else:
+                pending.append((src_pos, frame))
+                if len(pending) > self.min_silence_frames:
+                    # 긴 무음: 메모리를 아끼기 위해 앞/뒤 pad만 보관
+                    pending_tail = deque(
+                        pending[len(pending) - self.pad_frames:] if self.pad_frames else [],
+                        maxlen=self.pad_frames
+                    )
+                    pending = pending[:self.pad_frames]
+            src_pos += len(frame)
+
+        flush_pending(before_voice=False)
+
+        if output:
+            audio = np.concatenate(output).astype(np.float32) / 32768.0
+        else:
+            audio = np.zeros(0, dtype=np.float32)
+
+        return PreprocessedAudio(audio, offset_map, src_pos, self.sample_rate)
+
+    def _is_voiced(self, frame: np.ndarray) -> bool:
+        rms = np.sqrt(np.mean(np.square(frame.astype(np.float32) / 32768.0)))
+        if rms <= 0:
+            return False
+        return 20 * np.log10(rms) >= self.silence_threshold_db
+
+    def _decode(self, audio_path: Path):
+        """ffmpeg stdout을 읽으면서 프레임 단위로 yield (전체 파일을 메모리에 올리지 않음)"""
+        cmd = [
+            "ffmpeg",
+            "-nostdin",
+            "-loglevel", "error",
+            "-threads", "0",
+            "-i", str(audio_path),
+            "-f", "s16le",
+            "-ac", "1",
+            "-acodec", "pcm_s16le",
+            "-ar", str(self.sample_rate),
+            "-"
+        ]
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise RuntimeError("ffmpeg not found. Install ffmpeg (e.g. brew install ffmpeg)")
+
+        leftover = b""
+        frame_bytes = self.frame_size * 2
+        try:
+            while True:
+                chunk = proc.stdout.read(self.chunk_bytes)
+                if not chunk:
+                    break
+                data = leftover + chunk
+                usable = len(data) - len(data) % frame_bytes
+                leftover = data[usable:]
+                samples = np.frombuffer(data[:usable], dtype=np.int16)
+                for i in range(0, len(samples), self.frame_size):
+                    yield samples[i:i + self.frame_size]
+
+            if len(leftover) >= 2:
+                yield np.frombuffer(leftover[:len(leftover) - len(leftover) % 2], dtype=np.int16)
+        finally:
+            proc.stdout.close()
+            stderr = proc.stderr.read().decode(errors="ignore")
+            proc.stderr.close()
+            returncode = proc.wait()
+
+        if returncode != 0:
+            raise RuntimeError(f"Failed to load audio: {stderr.strip()}")
+
+
+def probe_duration(audio_path: str) -> float:
+    """
+    ffprobe로 오디오 길이(초) 조회 (디코딩 없이 컨테이너 메타데이터만 읽음)
+
+    Raises:
+        RuntimeError: ffprobe 실패 시
+    """
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        str(audio_path)
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True, text=True).stdout
+        return float(out.strip())
+    except FileNotFoundError:
+        raise RuntimeError("ffprobe not found. Install ffmpeg (e.g. brew install ffmpeg)")
+    except (subprocess.CalledProcessError, ValueError) as e:
+        raise RuntimeError(f"Failed to probe audio duration: {e}")
+
+
+def load_prefix(audio_path: str, seconds: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    앞부분 seconds초만 16 kHz mono float32로 디코딩 (언어 감지용)
+
+    Raises:
+        RuntimeError: ffmpeg 디코딩 실패 시
+    """
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-loglevel", "error",
+        "-i", str(audio_path),
+        "-t", str(seconds),
+        "-f", "s16le",
+        "-ac", "1",
+        "-acodec", "pcm_s16le",
+        "-ar", str(sample_rate),
+        "-"
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg not found. Install ffmpeg (e.g. brew install ffmpeg)")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode(errors='ignore').strip()}")
+
+    return np.frombuffer(out, dtype=np.int16).astype(np.float32) / 32768.0
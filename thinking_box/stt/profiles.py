@@ -0,0 +1,75 @@
+"""
+Whisper decode profiles (speed ↔ quality)
+
+- fast: greedy, temperature fallback 없음, 이전 문맥 조건 없음
+- balanced: greedy + 짧은 temperature fallback
+- accurate: beam search 5 + 전체 temperature fallback (Whisper CLI 기본값 수준)
+- auto: 오디오 길이와 현재 대기 요청 수로 위 셋 중 하나 선택
+  → 부하가 몰리면 큐에 쌓아두는 대신 더 빠른 디코딩으로 내려감
+"""
+from typing import Optional
+
+
+DECODE_PROFILES = {
+    "fast": {
+        "beam_size": None,
+        "best_of": None,
+        "temperature": 0.0,
+        "compression_ratio_threshold": None,
+        "logprob_threshold": None,
+        "condition_on_previous_text": False,
+    },
+    "balanced": {
+        "beam_size": None,
+        "best_of": 3,
+        "temperature": (0.0, 0.4, 0.8),
+        "compression_ratio_threshold": 2.4,
+        "logprob_threshold": -1.0,
+        "condition_on_previous_text": True,
+    },
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "compression_ratio_threshold": 2.4,
+        "logprob_threshold": -1.0,
+        "condition_on_previous_text": True,
+    },
+}
+
+AUTO_PROFILE = "auto"
+
+# auto 선택 기준: (최대 오디오 길이(초), 최대 대기 요청 수) 순서대로 확인
+AUTO_RULES = (
+    ("accurate", 5 * 60, 0),
+    ("balanced", 30 * 60, 2),
+)
+
+
+def select_profile(duration: Optional[float], queue_depth: int = 0) -> str:
+    """
+    오디오 길이와 대기 요청 수로 프로필 선택
+
+    Args:
+        duration: 오디오 길이 (초, 모르면 None - 길이 조건은 통과로 간주)
+        queue_depth: 이 요청 외에 대기/처리 중인 요청 수
+    """
+    for name, max_duration, max_queue in AUTO_RULES:
+        if queue_depth <= max_queue and (duration is None or duration <= max_duration):
+            return name
+    return "fast"
+
+
+def decode_options(profile: str) -> dict:
+    """
+    프로필 이름 → model.transcribe() 옵션
+
+    Raises:
+        ValueError: 알 수 없는 프로필
+    """
+    if profile not in DECODE_PROFILES:
+        raise ValueError(
+            f"Unknown decode profile: {profile} "
+            f"(choose from {', '.join(DECODE_PROFILES)} or {AUTO_PROFILE})"
+        )
+    return dict(DECODE_PROFILES[profile])
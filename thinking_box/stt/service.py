@@ -0,0 +1,300 @@
+"""
+Shared Whisper STT service (Unix socket daemon)
+
+Whisper 모델을 호스트당 한 번만 로딩하고, Streamlit/CLI/배치 워커는
+STTClient로 Unix socket을 통해 전사를 요청합니다.
+프로세스마다 ~300MB / 10-15초 로딩을 반복하지 않아도 됩니다.
+
+사용법:
+    cd thinking_box
+    python -m stt.service --model base --socket /tmp/thinking_box_stt.sock
+
+    # 클라이언트 (WhisperSTT와 동일한 인터페이스)
+    from stt.service import STTClient
+    stt = STTClient()
+    text = stt.transcribe("meeting.m4a", language="ko")
+"""
+from pathlib import Path
+from typing import Optional
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+
+
+DEFAULT_SOCKET_PATH = os.getenv(
+    "THINKING_BOX_STT_SOCKET", "/tmp/thinking_box_stt.sock"
+)
+
+
+class _Job:
+    """큐에 들어가는 전사 요청 1건"""
+
+    def __init__(
+        self,
+        method: str,
+        audio_path: str,
+        language: Optional[str],
+        profile: Optional[str] = None
+    ):
+        self.method = method
+        self.audio_path = audio_path
+        self.language = language
+        self.profile = profile
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[Exception] = None
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """요청 1줄(JSON) → 응답 1줄(JSON)"""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        try:
+            request = json.loads(line)
+            response = {"ok": True, "result": self.server.service.handle(request)}
+        except Exception as e:
+            response = {
+                "ok": False,
+                "error_type": type(e).__name__,
+                "error": str(e)
+            }
+
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class STTService:
+    """
+    모델 1개 + 요청 큐 + 전용 워커 스레드
+
+    Whisper 모델은 스레드 안전하지 않으므로 요청은 큐에 쌓고
+    워커 스레드 하나가 순서대로 처리합니다.
+    """
+
+    METHODS = ("transcribe", "transcribe_with_info", "detect_language")
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        model_name: str = "base",
+        preprocess: bool = False,
+        max_queue: int = 32,
+        **stt_options
+    ):
+        """
+        Args:
+            socket_path: Unix socket 경로
+            model_name: Whisper model size (tiny/base/small)
+            preprocess: 무음 제거 전처리 사용 여부
+            max_queue: 대기 가능한 최대 요청 수 (초과 시 즉시 거절)
+            **stt_options: WhisperSTT에 그대로 전달 (quantize, intra_op_threads 등)
+        """
+        # 클라이언트(STTClient)만 쓰는 프로세스는 numpy/whisper를 불러오지 않도록 여기서 import
+        from .whisper_stt import WhisperSTT
+
+        self.socket_path = socket_path
+        self.stt = WhisperSTT(model_name=model_name, preprocess=preprocess, **stt_options)
+        # auto 프로필은 큐에 쌓인 요청 수를 보고 디코딩 속도를 조절
+        self.stt.load_monitor = lambda: self.queue_depth
+        self._queue: "queue.Queue[_Job]" = queue.Queue(maxsize=max_queue)
+        self._worker = threading.Thread(target=self._work, daemon=True)
+        self._server: Optional[_UnixServer] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def handle(self, request: dict):
+        """소켓 요청 처리 (핸들러 스레드에서 호출)"""
+        method = request.get("method")
+
+        if method == "info":
+            return {"model_name": self.stt.model_name, "queue_depth": self.queue_depth}
+
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method: {method}")
+
+        job = _Job(
+            method,
+            request["audio_path"],
+            request.get("language"),
+            request.get("profile")
+        )
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            raise RuntimeError("STT queue is full, try again later")
+
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job.method == "detect_language":
+                    job.result = self.stt.detect_language(job.audio_path)
+                else:
+                    fn = getattr(self.stt, job.method)
+                    job.result = fn(job.audio_path, language=job.language, profile=job.profile)
+            except Exception as e:
+                job.error = e
+            finally:
+                job.done.set()
+                self._queue.task_done()
+
+    def serve_forever(self):
+        """소켓을 열고 요청 대기 (블로킹)"""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # 이전 실행에서 남은 소켓
+
+        self._server = _UnixServer(self.socket_path, _RequestHandler)
+        self._server.service = self
+        os.chmod(self.socket_path, 0o660)
+        self._worker.start()
+
+        print(f"🎤 STT service ready: {self.socket_path} (model: {self.stt.model_name})")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class STTClient:
+    """
+    STTService 클라이언트
+
+    WhisperSTT와 동일한 인터페이스 (transcribe / transcribe_with_info / model_name)
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: Optional[float] = None):
+        """
+        Args:
+            socket_path: STTService 소켓 경로
+            timeout: 요청 타임아웃 (초, None이면 무제한 - 긴 오디오 대비)
+
+        Raises:
+            ConnectionError: 서비스가 실행 중이 아닐 때
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.model_name = self._request({"method": "info"}, timeout=5)["model_name"]
+
+    @staticmethod
+    def is_available(socket_path: str = DEFAULT_SOCKET_PATH) -> bool:
+        """소켓 파일 존재 여부로 서비스 실행 여부를 빠르게 확인"""
+        return Path(socket_path).is_socket()
+
+    def transcribe(
+        self,
+        audio_path: str,
+        language: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> str:
+        return self._call("transcribe", audio_path, language, profile)
+
+    def transcribe_with_info(
+        self,
+        audio_path: str,
+        language: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> dict:
+        return self._call("transcribe_with_info", audio_path, language, profile)
+
+    def detect_language(self, audio_path: str) -> str:
+        return self._call("detect_language", audio_path, None, None)
+
+    def _call(
+        self,
+        method: str,
+        audio_path: str,
+        language: Optional[str],
+        profile: Optional[str]
+    ):
+        audio_path = Path(audio_path)
+
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        return self._request({
+            "method": method,
+            # 서비스는 다른 작업 디렉토리에서 실행되므로 절대 경로 전달
+            "audio_path": str(audio_path.resolve()),
+            "language": language,
+            "profile": profile
+        })
+
+    def _request(self, payload: dict, timeout: Optional[float] = None):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout if timeout is not None else self.timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+                with sock.makefile("rb") as reader:
+                    line = reader.readline()
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise ConnectionError(
+                f"STT service not running at {self.socket_path}: {e}"
+            )
+
+        if not line:
+            raise ConnectionError("STT service closed the connection")
+
+        response = json.loads(line)
+        if response["ok"]:
+            return response["result"]
+
+        if response.get("error_type") == "FileNotFoundError":
+            raise FileNotFoundError(response["error"])
+        raise Exception(response["error"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Thinking Box 공유 STT 서비스")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket 경로")
+    parser.add_argument("--model", default="base", help="Whisper 모델 (tiny/base/small)")
+    parser.add_argument("--preprocess", action="store_true", help="무음 제거 전처리 사용")
+    parser.add_argument("--max-queue", type=int, default=32, help="최대 대기 요청 수")
+    parser.add_argument("--quantize", action="store_true", help="int8 dynamic quantization (CPU)")
+    parser.add_argument("--threads", type=int, help="PyTorch intra-op 스레드 수")
+    parser.add_argument("--interop-threads", type=int, help="PyTorch inter-op 스레드 수")
+    parser.add_argument(
+        "--profile", default="auto",
+        help="기본 디코딩 프로필 (fast/balanced/accurate/auto, 기본 auto: 큐 길이에 따라 조절)"
+    )
+    args = parser.parse_args()
+
+    service = STTService(
+        socket_path=args.socket,
+        model_name=args.model,
+        preprocess=args.preprocess,
+        max_queue=args.max_queue,
+        quantize=args.quantize,
+        intra_op_threads=args.threads,
+        inter_op_threads=args.interop_threads,
+        profile=args.profile
+    )
+    service.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
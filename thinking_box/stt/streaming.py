@@ -0,0 +1,183 @@
+"""
+Rolling-window streaming transcription
+
+실시간으로 들어오는 PCM 프레임을 버퍼에 쌓고, step_seconds마다 아직 확정되지 않은
+구간만 다시 전사합니다. 버퍼 끝에서 stable_margin 이상 떨어진 segment는 더 이상
+바뀌지 않는다고 보고 확정(commit)한 뒤 버퍼에서 잘라내므로,
+디코딩 비용은 회의 전체 길이가 아니라 max_window 이내로 유지됩니다.
+"""
+from typing import List, Optional
+import threading
+
+import numpy as np
+
+from .language import AUTO_LANGUAGE
+from .preprocess import SAMPLE_RATE
+
+
+class StreamingTranscriber:
+    """
+    16 kHz mono s16le PCM 스트림 → 확정 segment + 미확정(partial) 텍스트
+
+    feed()는 수신 쪽(이벤트 루프)에서, step()/flush()는 워커 스레드에서 호출해도 됩니다.
+    """
+
+    def __init__(
+        self,
+        stt,
+        language: Optional[str] = None,
+        profile: Optional[str] = "fast",
+        step_seconds: float = 2.0,
+        max_window: float = 20.0,
+        stable_margin: float = 1.5,
+        silence_threshold_db: float = -40.0,
+        prompt_chars: int = 200,
+        sample_rate: int = SAMPLE_RATE
+    ):
+        """
+        Args:
+            stt: transcribe_array()를 지원하는 STT (WhisperSTT)
+            language: 언어 코드. None/'auto'면 첫 디코딩에서 감지한 언어로 고정
+            profile: 디코딩 프로필 (짧은 윈도우를 자주 디코딩하므로 기본 fast)
+            step_seconds: 새 오디오가 이만큼 쌓이면 다시 전사 (화면 갱신 주기)
+            max_window: 미확정 버퍼 최대 길이 (초과 시 마지막 segment 빼고 강제 확정)
+            stable_margin: 버퍼 끝에서 이만큼 떨어진 segment만 확정 (초)
+            silence_threshold_db: 버퍼 전체가 이 dBFS 미만이면 전사하지 않고 버림
+            prompt_chars: 다음 윈도우 initial_prompt로 넘길 확정 텍스트 길이
+            sample_rate: 입력 샘플레이트 (Whisper는 16000)
+        """
+        self.stt = stt
+        self.language = None if language == AUTO_LANGUAGE else language
+        self.profile = profile
+        self.sample_rate = sample_rate
+        self.step_samples = int(step_seconds * sample_rate)
+        self.max_window_samples = int(max_window * sample_rate)
+        self.stable_margin = stable_margin
+        self.silence_threshold_db = silence_threshold_db
+        self.prompt_chars = prompt_chars
+
+        self.committed: List[dict] = []
+        self.partial = ""
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0.0  # 버퍼 첫 샘플의 스트림 기준 시각 (초)
+        self._new_samples = 0
+        self._carry = b""  # 홀수 바이트로 잘려 들어온 프레임 조각
+        self._lock = threading.Lock()
+        self._decode_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """다시 전사할 만큼 새 오디오가 쌓였는지"""
+        return self._new_samples >= self.step_samples
+
+    @property
+    def transcript(self) -> str:
+        """지금까지 확정된 전체 텍스트"""
+        return " ".join(segment["text"] for segment in self.committed)
+
+    def feed(self, pcm: bytes):
+        """s16le PCM 바이트 추가"""
+        pcm = self._carry + pcm
+        usable = len(pcm) - len(pcm) % 2
+        self._carry = pcm[usable:]
+        if not usable:
+            return
+
+        samples = np.frombuffer(pcm[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+        with self._lock:
+            self._buffer = np.concatenate([self._buffer, samples])
+            self._new_samples += len(samples)
+
+    def step(self, final: bool = False) -> Optional[dict]:
+        """
+        미확정 버퍼를 전사하고 안정된 segment를 확정
+
+        Args:
+            final: True면 마지막 segment까지 모두 확정 (스트림 종료 시)
+
+        Returns:
+            {'committed': [새로 확정된 segment], 'partial': str} 또는
+            전사할 음성이 없으면 None
+        """
+        with self._decode_lock:
+            with self._lock:
+                audio = self._buffer
+                start = self._buffer_start
+                self._new_samples = 0
+
+            if not len(audio):
+                return None
+
+            if not self._is_voiced(audio):
+                # 무음만 쌓였으면 디코딩하지 않고 step 길이만 남기고 버림
+                self._consume(max(len(audio) - self.step_samples, 0))
+                self.partial = ""
+                return None
+
+            result = self.stt.transcribe_array(
+                audio,
+                language=self.language,
+                profile=self.profile,
+                initial_prompt=self.transcript[-self.prompt_chars:] or None
+            )
+            if self.language is None and result.get("language"):
+                # 윈도우마다 언어가 흔들리지 않도록 첫 감지 결과로 고정
+                self.language = result["language"]
+
+            segments = [s for s in result.get("segments", []) if s["text"].strip()]
+            duration = len(audio) / self.sample_rate
+            overflow = len(audio) >= self.max_window_samples
+
+            if final:
+                stable = segments
+            else:
+                stable = [s for s in segments[:-1] if s["end"] <= duration - self.stable_margin]
+                if overflow and len(stable) < len(segments) - 1:
+                    stable = segments[:-1]
+                if overflow and not stable and len(segments) == 1:
+                    # 한 segment가 윈도우를 다 채우면 더 기다려도 잘라낼 경계가 생기지 않음
+                    stable = segments
+
+            new_segments = [
+                {
+                    "start": start + s["start"],
+                    "end": start + s["end"],
+                    "text": s["text"].strip()
+                }
+                for s in stable
+            ]
+            self.committed.extend(new_segments)
+
+            if final:
+                cut = len(audio)
+            elif stable:
+                cut = min(int(stable[-1]["end"] * self.sample_rate), len(audio))
+            elif overflow:
+                # 인식된 말이 없는 긴 버퍼 - 최근 step만 남기고 버림
+                cut = len(audio) - self.step_samples
+            else:
+                cut = 0
+            self._consume(cut)
+
+            self.partial = " ".join(s["text"].strip() for s in segments[len(stable):])
+            return {"committed": new_segments, "partial": self.partial}
+
+    def flush(self) -> dict:
+        """남은 버퍼를 모두 전사/확정 (스트림 종료 시)"""
+        return self.step(final=True) or {"committed": [], "partial": ""}
+
+    def _consume(self, samples: int):
+        if samples <= 0:
+            return
+        with self._lock:
+            self._buffer = self._buffer[samples:]
+            self._buffer_start += samples / self.sample_rate
+
+    def _is_voiced(self, audio: np.ndarray, frame_ms: int = 30) -> bool:
+        """30 ms 프레임 중 하나라도 임계값 이상이면 음성으로 간주"""
+        frame = int(self.sample_rate * frame_ms / 1000)
+        usable = len(audio) - len(audio) % frame
+        if not usable:
+            return False
+        rms = np.sqrt(np.mean(np.square(audio[:usable].reshape(-1, frame)), axis=1))
+        return bool(np.any(rms >= 10 ** (self.silence_threshold_db / 20)))
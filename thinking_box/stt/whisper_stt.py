@@ -5,8 +5,14 @@ base 모델 사용 - 한국어 정확도 최적화
 Supports Korean and English with good accuracy
 """
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 import os
+import threading
+
+from .cascade import CascadeResult, run_cascade
+from .language import AUTO_LANGUAGE, audio_hash, language_cache
+from .preprocess import SAMPLE_RATE, AudioPreprocessor, load_prefix, probe_duration
+from .profiles import AUTO_PROFILE, decode_options, select_profile
 
 
 class WhisperSTT:
@@ -21,7 +27,15 @@ class WhisperSTT:
     - Streamlit Cloud에서 작동 가능
     """
     
-    def __init__(self, model_name: str = "base"):
+    def __init__(
+        self,
+        model_name: str = "base",
+        preprocess: bool = False,
+        quantize: bool = False,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+        profile: Optional[str] = None
+    ):
         """
         Initialize Whisper model
         
@@ -30,10 +44,43 @@ class WhisperSTT:
                 - tiny: 39MB, 60-70% accuracy (빠르지만 부정확)
                 - base: 74MB, 80-85% accuracy (권장)
                 - small: 244MB, 90%+ accuracy (메모리 부족 위험)
+            preprocess: True면 16kHz mono 변환 + 무음 제거 후 전사
+                (segment 타임스탬프는 원본 기준으로 복원됨)
+            quantize: True면 Linear 레이어를 int8 dynamic quantization (CPU 전용)
+            intra_op_threads: PyTorch 연산 내부 스레드 수 (torch.set_num_threads)
+            inter_op_threads: PyTorch 연산 간 스레드 수 (프로세스당 1회만 설정 가능)
+                한 호스트에 워커가 여러 개면 코어 수 / 워커 수로 맞춰 과다 구독 방지
+            profile: 기본 디코딩 프로필 (fast/balanced/accurate/auto)
+                None이면 Whisper 기본 디코딩 옵션 사용
         """
+        if profile is not None and profile != AUTO_PROFILE:
+            decode_options(profile)  # 잘못된 이름은 모델 로딩 전에 실패
+        self.preprocessor = AudioPreprocessor() if preprocess else None
+        self.quantized = quantize
+        self.profile = profile
+        # auto 프로필용 외부 부하 지표 (예: STTService 큐 길이)
+        self.load_monitor: Optional[Callable[[], int]] = None
+        self._inflight = 0
+        self._inflight_lock = threading.Lock()
+        # 다른 크기 모델(cascade 초안 등)을 같은 옵션으로 만들기 위해 보관
+        self._options = {
+            "preprocess": preprocess,
+            "quantize": quantize,
+            "intra_op_threads": intra_op_threads,
+            "inter_op_threads": inter_op_threads,
+        }
+        self._draft_stt: Optional["WhisperSTT"] = None
+        self._lock = threading.Lock()  # Whisper 모델은 스레드 안전하지 않음
         try:
             import whisper
-            self.model = whisper.load_model(model_name)
+            
+            if intra_op_threads or inter_op_threads:
+                _configure_torch_threads(intra_op_threads, inter_op_threads)
+            
+            # quantized 커널은 CPU에서만 동작
+            self.model = whisper.load_model(model_name, device="cpu" if quantize else None)
+            if quantize:
+                self.model = _quantize_linear_layers(self.model)
             self.model_name = model_name
         except ImportError:
             raise ImportError(
@@ -45,7 +92,8 @@ class WhisperSTT:
     def transcribe(
         self, 
         audio_path: str,
-        language: Optional[str] = None
+        language: Optional[str] = None,
+        profile: Optional[str] = None
     ) -> str:
         """
         Transcribe audio file to text
@@ -53,7 +101,10 @@ class WhisperSTT:
         Args:
             audio_path: Path to audio file (.wav, .mp3, .m4a, etc)
             language: Language code (e.g., 'ko', 'en'). 
-                     If None, auto-detected
+                     If None, auto-detected by Whisper.
+                     If 'auto', uses the cached per-file detect_language()
+            profile: Decode profile (fast/balanced/accurate/auto).
+                     If None, uses the instance default
         
         Returns:
             Transcribed text as plain string
@@ -62,34 +113,16 @@ class WhisperSTT:
             FileNotFoundError: If audio file doesn't exist
             Exception: If transcription fails
         """
-        audio_path = Path(audio_path)
-        
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
-        
-        # Transcribe with optional language hint
-        transcribe_options = {
-            "fp16": False  # CPU compatibility
-        }
-        if language:
-            transcribe_options['language'] = language
+        result = self._transcribe(audio_path, language, profile)
         
-        try:
-            result = self.model.transcribe(
-                str(audio_path),
-                **transcribe_options
-            )
-            
-            # Return plain text only
-            return result["text"].strip()
-            
-        except Exception as e:
-            raise Exception(f"Transcription failed: {str(e)}")
+        # Return plain text only
+        return result["text"].strip()
     
     def transcribe_with_info(
         self,
         audio_path: str,
-        language: Optional[str] = None
+        language: Optional[str] = None,
+        profile: Optional[str] = None
     ) -> dict:
         """
         Transcribe with additional metadata
@@ -98,32 +131,276 @@ class WhisperSTT:
             {
                 'text': str,
                 'language': str,  # detected or specified
-                'segments': list  # optional segment info
+                'segments': list,  # optional segment info
+                'profile': str  # decode profile actually used (None: Whisper default)
             }
         """
+        result = self._transcribe(audio_path, language, profile)
+        
+        return {
+            'text': result['text'].strip(),
+            'language': result.get('language', 'unknown'),
+            'segments': result.get('segments', []),
+            'profile': result.get('profile')
+        }
+    
+    def transcribe_array(
+        self,
+        audio,
+        language: Optional[str] = None,
+        profile: Optional[str] = "fast",
+        initial_prompt: Optional[str] = None
+    ) -> dict:
+        """
+        Transcribe an in-memory 16 kHz mono float32 buffer (실시간 스트리밍용)
+
+        Args:
+            audio: numpy float32 array (-1.0 ~ 1.0, 16 kHz mono)
+            language: Language code. None이면 Whisper가 윈도우마다 감지
+            profile: Decode profile (기본 fast - 짧은 윈도우를 자주 다시 디코딩하므로)
+            initial_prompt: 이전 확정 텍스트 (윈도우 경계 문맥 유지)
+
+        Returns:
+            Raw Whisper result (segment 타임스탬프는 buffer 시작 기준)
+        """
+        transcribe_options = {"fp16": False}
+        if language and language != AUTO_LANGUAGE:
+            transcribe_options['language'] = language
+        if profile is not None and profile != AUTO_PROFILE:
+            transcribe_options.update(decode_options(profile))
+        if initial_prompt:
+            transcribe_options['initial_prompt'] = initial_prompt
+
+        with self._inflight_lock:
+            self._inflight += 1
+        try:
+            with self._lock:
+                return self.model.transcribe(audio, **transcribe_options)
+        except Exception as e:
+            raise Exception(f"Transcription failed: {str(e)}")
+        finally:
+            with self._inflight_lock:
+                self._inflight -= 1
+
+    def detect_language(self, audio_path: str, prefix_seconds: float = 30.0) -> str:
+        """
+        Detect language from a short prefix, cached by audio content hash
+        
+        전체 파일을 디코딩하지 않고 앞부분(최대 30초, Whisper 윈도우 1개)만 사용합니다.
+        같은 내용의 파일은 경로가 달라도 다시 감지하지 않습니다.
+        
+        Returns:
+            Language code (e.g., 'ko', 'en')
+        
+        Raises:
+            FileNotFoundError: If audio file doesn't exist
+            Exception: If detection fails
+        """
         audio_path = Path(audio_path)
         
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
-        transcribe_options = {"fp16": False}
-        if language:
+        key = audio_hash(str(audio_path))
+        cached = language_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            if self.preprocessor is not None:
+                # 녹음 앞부분 무음 때문에 감지가 흔들리지 않도록 무음 제거 후 앞부분 사용
+                # (발화가 prefix_seconds만큼 모이면 디코딩 중단)
+                audio = self.preprocessor.process_prefix(str(audio_path), prefix_seconds).audio
+            else:
+                audio = load_prefix(str(audio_path), prefix_seconds)
+            language = self._detect_language_array(audio)
+        except Exception as e:
+            raise Exception(f"Language detection failed: {str(e)}")
+        
+        language_cache.put(key, language)
+        return language
+    
+    def _detect_language_array(self, audio) -> str:
+        import whisper
+        
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio), n_mels=self.model.dims.n_mels
+        ).to(self.model.device)
+        
+        with self._lock:
+            _, probs = self.model.detect_language(mel)
+        return max(probs, key=probs.get)
+    
+    def queue_depth(self) -> int:
+        """이 인스턴스에 대기/처리 중인 요청 수 (+ load_monitor 값)"""
+        depth = self._inflight
+        if self.load_monitor is not None:
+            depth += self.load_monitor()
+        return depth
+    
+    def transcribe_cascade(
+        self,
+        audio_path: str,
+        language: Optional[str] = None,
+        draft_model: str = "tiny",
+        on_refined: Optional[Callable[[dict], None]] = None,
+        profile: Optional[str] = None
+    ) -> CascadeResult:
+        """
+        Draft with a small model now, refine with this model in the background
+        
+        초안(draft_model)은 즉시 반환되어 화면 표시/InputAgent 입력에 바로 쓰고,
+        이 인스턴스의 모델(base/small)로 다시 전사한 결과는 준비되면 교체합니다.
+        
+        Args:
+            audio_path: Path to audio file
+            language: Language code. None이면 초안에서 감지한 언어를 재사용
+            draft_model: 초안용 모델 (기본 tiny, 처음 호출 시 로딩)
+            on_refined: 정밀 전사 완료 콜백 (백그라운드 스레드)
+            profile: 정밀 전사 디코딩 프로필 (초안은 항상 fast)
+        
+        Returns:
+            CascadeResult (.draft 즉시 사용 가능, .text / .wait()로 정밀 결과)
+        """
+        if self._draft_stt is None or self._draft_stt.model_name != draft_model:
+            self._draft_stt = WhisperSTT(model_name=draft_model, **self._options)
+        
+        return run_cascade(
+            self._draft_stt,
+            self,
+            audio_path,
+            language=language,
+            on_refined=on_refined,
+            profile=profile
+        )
+    
+    def _transcribe(
+        self,
+        audio_path: str,
+        language: Optional[str],
+        profile: Optional[str] = None
+    ) -> dict:
+        """
+        Run Whisper on a file (optionally preprocessed)
+        
+        Returns raw Whisper result with segment timestamps
+        relative to the original audio.
+        """
+        audio_path = Path(audio_path)
+        
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        
+        if language == AUTO_LANGUAGE and self.preprocessor is None:
+            language = self.detect_language(str(audio_path))
+        
+        # Transcribe with optional language hint
+        transcribe_options = {
+            "fp16": False  # CPU compatibility
+        }
+        if language and language != AUTO_LANGUAGE:
             transcribe_options['language'] = language
         
+        profile = profile or self.profile
+        if profile is not None and profile != AUTO_PROFILE:
+            transcribe_options.update(decode_options(profile))
+        
+        with self._inflight_lock:
+            self._inflight += 1
         try:
-            result = self.model.transcribe(
-                str(audio_path),
-                **transcribe_options
-            )
+            prepared = None
+            audio = str(audio_path)
+            if self.preprocessor is not None:
+                prepared = self.preprocessor.process(audio)
+                if not len(prepared.audio):
+                    # 전부 무음이면 모델을 돌릴 필요 없음
+                    return {
+                        'text': '',
+                        'language': language if language not in (None, AUTO_LANGUAGE) else 'unknown',
+                        'segments': [],
+                        'profile': profile
+                    }
+                audio = prepared.audio
+                
+                if language == AUTO_LANGUAGE:
+                    # 이미 무음 제거된 오디오가 있으므로 다시 디코딩하지 않고 앞부분으로 감지
+                    key = audio_hash(str(audio_path))
+                    language = language_cache.get(key)
+                    if language is None:
+                        language = self._detect_language_array(audio[:30 * SAMPLE_RATE])
+                        language_cache.put(key, language)
+                    transcribe_options['language'] = language
             
-            return {
-                'text': result['text'].strip(),
-                'language': result.get('language', 'unknown'),
-                'segments': result.get('segments', [])
-            }
+            if profile == AUTO_PROFILE:
+                duration = prepared.duration if prepared is not None else _safe_duration(audio)
+                profile = select_profile(duration, queue_depth=self.queue_depth() - 1)
+                transcribe_options.update(decode_options(profile))
+            
+            with self._lock:
+                result = self.model.transcribe(audio, **transcribe_options)
+            
+            if prepared is not None:
+                result['segments'] = prepared.offset_map.remap_segments(
+                    result.get('segments', [])
+                )
+            if not language and result.get('language'):
+                # Whisper가 감지한 언어도 버리지 않고 캐시에 기록
+                language_cache.put(audio_hash(str(audio_path)), result['language'])
+            result['profile'] = profile
+            return result
             
         except Exception as e:
             raise Exception(f"Transcription failed: {str(e)}")
+        finally:
+            with self._inflight_lock:
+                self._inflight -= 1
+
+
+def _safe_duration(audio_path: str) -> Optional[float]:
+    """길이를 모르면 None (auto 프로필은 대기 요청 수만으로 판단)"""
+    try:
+        return probe_duration(audio_path)
+    except RuntimeError:
+        return None
+
+
+def _configure_torch_threads(
+    intra_op_threads: Optional[int],
+    inter_op_threads: Optional[int]
+):
+    """PyTorch CPU 스레드 수 설정"""
+    import torch
+    
+    if intra_op_threads:
+        torch.set_num_threads(intra_op_threads)
+    if inter_op_threads:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError:
+            # 이미 병렬 작업이 실행된 프로세스에서는 변경 불가 - 기존 값 유지
+            pass
+
+
+def _quantize_linear_layers(model):
+    """
+    Apply dynamic int8 quantization to all Linear layers
+    
+    whisper.model.Linear는 forward만 재정의한 nn.Linear 서브클래스인데,
+    quantize_dynamic은 정확한 타입만 교체하므로 먼저 기본 nn.Linear로 되돌림
+    (fp32 CPU 추론에서는 동작이 동일)
+    """
+    import torch
+    
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear) and type(module) is not torch.nn.Linear:
+            module.__class__ = torch.nn.Linear
+    
+    return torch.ao.quantization.quantize_dynamic(
+        model,
+        {torch.nn.Linear},
+        dtype=torch.qint8,
+        inplace=True  # 복사본을 만들지 않아 로딩 시 메모리가 두 배로 뛰지 않음
+    )
 
 
 # Quick test function
@@ -34,8 +34,14 @@ if __name__ == "__main__":
     sys.path.insert(0, str(repo_root))
 
 from thinking_box import ThinkingBox
-from thinking_box.stt import WhisperSTT
-from thinking_box_mcp.notion_storage import NotionStorage
+from thinking_box.stt import STTClient, STTModelPool
+from thinking_box.core.jobs import DONE, JobRunner
+from thinking_box.core.history import HistoryStore
+from thinking_box.core.result_cache import ResultCache, input_hash, pipeline_version
+from thinking_box.core.warmup import Warmup, warm_llm, warm_notion, warmup_enabled
+from thinking_box_mcp.notion_blocks import analysis_markdown
+from thinking_box_mcp.notion_storage import NotionStorage, env_flag
+from thinking_box_mcp.outbox import DONE as OUTBOX_DONE, FAILED as OUTBOX_FAILED, NotionOutbox
 from typing import Dict, Any
 
 
@@ -52,31 +58,176 @@ st.set_page_config(
 def load_thinking_box():
     """캐시된 Thinking Box (한 번만 로딩)"""
     try:
-        return ThinkingBox()
+        # 분석마다 기록 저장 (source="streamlit")
+        return ThinkingBox(history=get_history_store())
     except Exception as e:
         st.error(f"❌ Thinking Box 초기화 실패: {e}")
         st.info("💡 Claude API 키가 설정되었는지 확인하세요 (Settings → Secrets)")
         return None
 
 @st.cache_resource
-def load_stt():
-    """캐시된 STT 모델 (한 번만 로딩)"""
+def load_stt_pool(preprocess: bool = False):
+    """프로세스 공유 STT 모델 풀 (요청 시 로딩, 유휴 시 해제)"""
+    return STTModelPool(
+        memory_budget_mb=int(os.getenv("THINKING_BOX_STT_MEMORY_MB", "1200")),
+        idle_timeout=float(os.getenv("THINKING_BOX_STT_IDLE_TIMEOUT", "600")),
+        preprocess=preprocess,
+        quantize=os.getenv("THINKING_BOX_STT_QUANTIZE") == "1",
+        intra_op_threads=int(os.getenv("THINKING_BOX_STT_THREADS", "0")) or None
+    )
+
+def load_stt(preprocess: bool = False, model_name: str = "base"):
+    """STT 인스턴스 (공유 서비스 또는 모델 풀)"""
+    # 공유 STT 서비스가 떠 있으면 모델을 직접 로딩하지 않고 소켓으로 요청
+    socket_path = os.getenv("THINKING_BOX_STT_SOCKET")
+    if socket_path and STTClient.is_available(socket_path):
+        try:
+            return STTClient(socket_path)
+        except ConnectionError as e:
+            st.warning(f"⚠️ STT 서비스 연결 실패, 로컬 모델 사용: {e}")
     try:
-        with st.spinner("🎤 STT 모델 로딩 중... (최초 1회, ~15초)"):
-            return WhisperSTT(model_name="base")
+        # 모델은 첫 전사 요청 시 로딩되고, 유휴 상태가 길어지면 해제됨
+        return load_stt_pool(preprocess).model(model_name)
     except Exception as e:
         st.error(f"❌ STT 모델 로딩 실패: {e}")
         return None
 
+@st.cache_resource
 def load_notion_storage():
     """캐시된 Notion 클라이언트"""
     try:
-        return NotionStorage()
+        # 분석 결과별 session_id로 재클릭/재전송을 같은 페이지에 upsert하고 전체 분석을 본문으로 저장
+        # (NotionStorage 기본값은 끔 - 끄려면 각 환경 변수를 0으로)
+        return NotionStorage(
+            upsert=env_flag("NOTION_UPSERT", True),
+            write_content=env_flag("NOTION_PAGE_CONTENT", True),
+            validate=env_flag("NOTION_VALIDATE", True)
+        )
     except Exception as e:
         st.error(f"❌ Notion 클라이언트 초기화 실패: {e}")
         st.info("💡 NOTION_TOKEN, NOTION_DATABASE_ID 환경 변수를 확인하세요.")
         return None
 
+@st.cache_resource
+def get_notion_outbox():
+    """
+    프로세스 공유 Notion 저장 대기열 (NOTION_OUTBOX_DB)
+
+    버튼은 대기열에 넣고 바로 반환하고, 백그라운드 flusher가 속도 제한을 지키며 저장
+    """
+    def storage_factory():
+        storage = load_notion_storage()
+        if storage is None:
+            raise RuntimeError("Notion 클라이언트 초기화 실패")
+        return storage
+
+    def link_history(entry, notion_result):
+        history = get_history_store()
+        history_id = entry["meta"].get("history_id")
+        if history is not None and history_id:
+            history.set_notion_page(history_id, notion_result["page_id"], notion_result["page_url"])
+
+    return NotionOutbox(storage_factory, on_saved=link_history).start()
+
+@st.cache_resource
+def get_job_runner():
+    """프로세스 공유 작업 실행기 (전사/분석을 스크립트 스레드 밖에서 실행)"""
+    return JobRunner(max_workers=int(os.getenv("THINKING_BOX_JOB_WORKERS", "4")))
+
+
+def transcribe_job(job, stt, audio_path: str, language, profile: str, draft_first: bool) -> Dict[str, Any]:
+    """백그라운드 전사 작업"""
+    job.update(0.1, f"음성을 텍스트로 변환 중... ({stt.model_name} 모델, 첫 요청 시 로딩 ~15초)")
+    if draft_first and hasattr(stt, "transcribe_cascade"):
+        cascade = stt.transcribe_cascade(audio_path, language=language, profile=profile)
+        return {"text": cascade.draft, "cascade": cascade}
+    text = stt.transcribe(audio_path, language=language, profile=profile)
+    return {"text": text, "cascade": None}
+
+
+@st.cache_resource
+def get_result_cache():
+    """프로세스 공유 분석 결과 캐시 (입력 해시 + 프롬프트/모델 버전 키)"""
+    return ResultCache(
+        max_entries=int(os.getenv("THINKING_BOX_RESULT_CACHE_SIZE", "256")),
+        ttl=float(os.getenv("THINKING_BOX_RESULT_CACHE_TTL", "0")) or None
+    )
+
+
+@st.cache_resource
+def get_history_store():
+    """분석 기록 저장소 (SQLite, THINKING_BOX_HISTORY_DB)"""
+    try:
+        return HistoryStore()
+    except Exception as e:
+        print(f"분석 기록 저장소 초기화 실패: {e}")
+        return None
+
+
+def analysis_job(job, box, raw_input: str, cache: ResultCache, cache_key: str) -> Dict[str, Any]:
+    """백그라운드 3단계 분석 작업 (완료 시 결과 캐시/분석 기록에 저장)"""
+    try:
+        # 단계별 진행률/소요 시간은 job에, 분석 기록은 box.history에 남음
+        results = box.run(raw_input, job=job, source="streamlit")
+        result = {
+            "cleaned": results["cleaned_conversation"],
+            "ideas": results["ranked_ideas"],
+            "plan": results["planning_document"]
+        }
+        if "history_id" in results:
+            result["history_id"] = results["history_id"]
+        cache.put(cache_key, result)
+        return result
+    finally:
+        cache.clear_pending(cache_key)
+
+
+def collect_job(key: str):
+    """끝난 작업을 세션에서 꺼내 반환 (없거나 진행 중이면 None)"""
+    job_id = st.session_state.jobs.get(key)
+    if job_id is None:
+        return None
+    job = get_job_runner().get(job_id)
+    if job is None or job.finished:
+        # 보관 기간이 지나 사라진 작업도 세션에서 정리
+        del st.session_state.jobs[key]
+    return job if job is not None and job.finished else None
+
+
+@st.fragment(run_every=1.0)
+def job_progress(key: str):
+    """진행 상태만 1초마다 다시 그리고, 작업이 끝나면 전체 rerun으로 결과 반영"""
+    job = get_job_runner().get(st.session_state.jobs.get(key, ""))
+    if job is None or job.finished:
+        st.rerun()
+    st.progress(job.progress, text=job.message or "⏳ 대기 중...")
+
+
+@st.fragment(run_every=2.0)
+def refine_progress():
+    """정밀 전사가 끝나면 전체 rerun으로 초안 교체"""
+    refine = st.session_state.get("refine")
+    if refine is None or refine.refined_ready:
+        st.rerun()
+    st.info(f"⏳ {refine.refine_model} 모델로 정밀 전사 중... 초안으로 바로 분석할 수 있습니다")
+
+
+@st.fragment(run_every=2.0)
+def notion_save_progress(entry_id: int):
+    """대기열에 넣은 Notion 저장 결과 표시 (완료/실패할 때까지 2초마다 갱신)"""
+    entry = get_notion_outbox().get(entry_id)
+    if entry is None:
+        return
+    if entry["status"] == OUTBOX_DONE:
+        st.success("✅ Notion 저장 완료!")
+        st.markdown(f"[Notion 페이지 바로가기]({entry['page_url']})")
+    elif entry["status"] == OUTBOX_FAILED:
+        st.error(f"❌ Notion 저장 실패 ({entry['attempts']}회 시도): {entry['last_error']}")
+    else:
+        retry = f" · 재시도 대기 ({entry['last_error']})" if entry["last_error"] else ""
+        st.info(f"📤 Notion 저장 대기 중... (outbox #{entry_id}){retry}")
+    st.caption(f"Session ID: {entry['session_id']}")
+
 
 def _convert_to_notion_format(session_id: str, cleaned: str, ideas: str, plan: str) -> Dict[str, Any]:
     """Thinking Box 결과를 Notion 저장 포맷으로 단순 변환"""
@@ -149,9 +300,55 @@ def _convert_to_notion_format(session_id: str, cleaned: str, ideas: str, plan: s
         "key_points": extract_key_points(plan),
         "tasks": extract_tasks(plan),
         "confidence": calculate_confidence(plan, ideas),
+        "content": analysis_markdown(cleaned, ideas, plan),
     }
 
 
+@st.cache_resource
+def start_warmup():
+    """
+    프로세스당 1회 백그라운드 warm-up (THINKING_BOX_WARMUP=1)
+
+    각 단계는 위의 캐시된 로더를 호출하므로, 미리 만든 객체를 실제 요청이 그대로 사용
+    """
+    warmup = Warmup()
+    if not warmup_enabled():
+        return warmup
+
+    def warm_claude():
+        box = load_thinking_box()
+        if box is None:
+            raise RuntimeError("Thinking Box 초기화 실패")
+        warm_llm(box.llm)
+
+    def warm_stt():
+        # 사이드바 기본값(무음 제거 켬, base 모델)과 같은 풀/모델을 예열
+        model_name = os.getenv("THINKING_BOX_WARMUP_STT_MODEL", "base")
+        load_stt_pool(preprocess=True).preload(model_name)
+
+    def warm_notion_storage():
+        storage = load_notion_storage()
+        if storage is None:
+            raise RuntimeError("Notion 클라이언트 초기화 실패")
+        warm_notion(storage)
+
+    warmup.add("claude", warm_claude)
+    warmup.add("stt", warm_stt)
+    if os.getenv("NOTION_TOKEN") and os.getenv("NOTION_DATABASE_ID"):
+        warmup.add("notion", warm_notion_storage)
+    return warmup.start()
+
+
+warmup = start_warmup()
+
+# 세션별 진행 중 작업 ID (kind → job_id)
+if "jobs" not in st.session_state:
+    st.session_state.jobs = {}
+
+# 분석 결과(계획 해시)별 Notion outbox ID
+if "notion_saves" not in st.session_state:
+    st.session_state.notion_saves = {}
+
 # Title and description
 st.title("🧠 Thinking Box")
 st.markdown("""
@@ -175,6 +372,7 @@ with st.sidebar:
     if "음성" in input_mode:
         st.markdown("---")
         language_options = {
+            "자동 감지 (캐시)": "auto",
             "자동 감지": None,
             "한국어": "ko",
             "English": "en"
@@ -184,8 +382,33 @@ with st.sidebar:
             list(language_options.keys())
         )
         language_code = language_options[language]
+        stt_model = st.selectbox(
+            "STT 모델",
+            ["base", "tiny", "small"],
+            help="tiny: 빠르지만 부정확 / base: 권장 / small: 정확하지만 메모리 사용 큼"
+        )
+        decode_profile = st.selectbox(
+            "디코딩 프로필",
+            ["auto", "balanced", "fast", "accurate"],
+            help="auto: 오디오 길이와 서버 부하에 따라 속도/정확도 자동 조절"
+        )
+        trim_silence = st.checkbox(
+            "무음 구간 제거",
+            value=True,
+            help="16kHz mono 변환 후 긴 무음을 잘라내고 전사합니다 (회의 녹음에서 30-40% 단축)"
+        )
+        draft_first = st.checkbox(
+            "빠른 초안 먼저 (tiny → 정밀)",
+            value=stt_model != "tiny",
+            disabled=stt_model == "tiny",
+            help="tiny 모델 초안을 바로 보여주고, 선택한 모델의 정밀 전사가 끝나면 교체합니다"
+        )
     else:
         language_code = None
+        stt_model = "base"
+        decode_profile = "auto"
+        trim_silence = False
+        draft_first = False
     
     # Info
     st.markdown("---")
@@ -204,6 +427,23 @@ with st.sidebar:
     notion_ok = bool(os.getenv("NOTION_TOKEN")) and bool(os.getenv("NOTION_DATABASE_ID"))
     st.markdown("---")
     st.caption(f"Notion env 상태: {'✅' if notion_ok else '❌'} (토큰/DB ID)")
+    if notion_ok:
+        outbox_status = get_notion_outbox().status()
+        if outbox_status["pending"] or outbox_status["failed"]:
+            st.caption(
+                f"Notion 저장 대기열: 대기 {outbox_status['pending']} / 실패 {outbox_status['failed']}"
+            )
+            if outbox_status["failed"] and st.button("🔁 실패한 Notion 저장 재시도"):
+                get_notion_outbox().retry_failed()
+
+    # Warm-up 상태 (THINKING_BOX_WARMUP=1)
+    warmup_status = warmup.status()
+    if warmup_status["enabled"]:
+        icons = {"pending": "⏸️", "running": "⏳", "ready": "✅", "failed": "❌"}
+        st.caption("Warm-up: " + " / ".join(
+            f"{name} {icons[step['status']]}"
+            for name, step in warmup_status["steps"].items()
+        ))
     
     # API status check
     if st.button("🔌 API 연결 확인"):
@@ -213,6 +453,36 @@ with st.sidebar:
         else:
             st.error("❌ API 키 확인 필요")
 
+    # 분석 기록 (로컬 SQLite, 전문 검색)
+    history = get_history_store()
+    if history is not None:
+        st.markdown("---")
+        with st.expander("🕘 분석 기록"):
+            history_query = st.text_input(
+                "검색",
+                placeholder="키워드 (예: 출시 일정)",
+                key="history_query"
+            )
+            runs = history.search(history_query, limit=10)
+            if not runs:
+                st.caption("기록이 없습니다")
+            for run in runs:
+                label = f"{run['created_at'][5:16].replace('T', ' ')} · {run['title']}"
+                if run["notion_page_id"]:
+                    label += " 📝"
+                if st.button(label, key=f"history_{run['id']}", use_container_width=True):
+                    loaded = history.get(run["id"])
+                    st.session_state.transcript = loaded["transcript"]
+                    st.session_state.analysis = {
+                        "cleaned": loaded["cleaned"],
+                        "ideas": loaded["ideas"],
+                        "plan": loaded["plan"],
+                        "history_id": loaded["id"]
+                    }
+                    st.rerun()
+                if run.get("snippet"):
+                    st.caption(run["snippet"])
+
 st.markdown("---")
 
 # Main content
@@ -255,30 +525,69 @@ else:  # 음성 입력
         st.audio(audio_path)
         
         # Transcribe button
-        if st.button("🔊 음성 인식 시작", type="primary"):
-            stt = load_stt()
+        if st.button(
+            "🔊 음성 인식 시작",
+            type="primary",
+            disabled="transcribe" in st.session_state.jobs
+        ):
+            stt = load_stt(preprocess=trim_silence, model_name=stt_model)
             
             if stt is None:
                 st.error("❌ STT 모델을 로드할 수 없습니다")
             else:
-                with st.spinner("음성을 텍스트로 변환 중... (base 모델)"):
-                    try:
-                        raw_input = stt.transcribe(audio_path, language=language_code)
-                        st.success("✅ 음성 인식 완료!")
-                        
-                        with st.expander("📄 인식된 텍스트 보기"):
-                            st.text_area(
-                                "Transcript:",
-                                raw_input,
-                                height=150,
-                                disabled=True
-                            )
-                        
-                        st.session_state.transcript = raw_input
-                        
-                    except Exception as e:
-                        st.error(f"❌ 음성 인식 실패: {e}")
-                        raw_input = None
+                # 전사는 백그라운드 작업으로 실행 - 다른 위젯을 눌러도 끊기지 않음
+                job = get_job_runner().submit(
+                    transcribe_job,
+                    stt,
+                    audio_path,
+                    language_code,
+                    decode_profile,
+                    draft_first,
+                    name="transcribe"
+                )
+                st.session_state.jobs["transcribe"] = job.id
+    
+    transcribe_done = collect_job("transcribe")
+    if transcribe_done is not None:
+        if transcribe_done.status == DONE:
+            raw_input = transcribe_done.result["text"]
+            cascade = transcribe_done.result["cascade"]
+            if cascade is not None:
+                st.session_state.refine = cascade
+                st.success(
+                    f"✅ 초안 완료! ({cascade.draft_model}) "
+                    f"{cascade.refine_model} 모델로 정밀 전사 중..."
+                )
+            else:
+                st.success("✅ 음성 인식 완료!")
+            
+            with st.expander("📄 인식된 텍스트 보기"):
+                st.text_area(
+                    "Transcript:",
+                    raw_input,
+                    height=150,
+                    disabled=True
+                )
+            
+            st.session_state.transcript = raw_input
+        else:
+            st.error(f"❌ 음성 인식 실패: {transcribe_done.error}")
+    elif "transcribe" in st.session_state.jobs:
+        job_progress("transcribe")
+
+# Cascade: 정밀 전사가 끝났으면 초안을 교체
+if 'refine' in st.session_state:
+    refine = st.session_state.refine
+    if refine.refined_ready:
+        del st.session_state.refine
+        if refine.error is None:
+            st.session_state.transcript = refine.text
+            raw_input = None  # 초안 대신 정밀 전사 사용
+            st.success(f"✅ 정밀 전사({refine.refine_model})로 교체되었습니다")
+        else:
+            st.warning(f"⚠️ 정밀 전사 실패, 초안을 유지합니다: {refine.error}")
+    else:
+        refine_progress()
 
 # Use transcript from session if available
 if 'transcript' in st.session_state and raw_input is None:
@@ -293,7 +602,7 @@ with col1:
     run_button = st.button(
         "▶️ 분석 시작",
         type="primary",
-        disabled=not raw_input,
+        disabled=not raw_input or "analysis" in st.session_state.jobs,
         use_container_width=True
     )
 
@@ -301,6 +610,9 @@ with col2:
     if st.button("🗑️ 초기화", use_container_width=True):
         if 'transcript' in st.session_state:
             del st.session_state.transcript
+        if 'refine' in st.session_state:
+            del st.session_state.refine
+        st.session_state.jobs = {}
         st.rerun()
 
 with col3:
@@ -329,64 +641,52 @@ if run_button:
             st.error("❌ Thinking Box를 초기화할 수 없습니다. API 키를 확인하세요.")
             st.stop()
         
-        # Output container
-        output_container = st.container()
+        cache = get_result_cache()
+        cache_key = ResultCache.make_key(raw_input, pipeline_version(box.llm.model))
+        cached = cache.get(cache_key)
+        pending_id = cache.pending_job(cache_key)
         
-        with output_container:
-            st.markdown("---")
-            st.subheader("📊 분석 진행 중...")
+        if cached is not None:
+            # 같은 입력 + 같은 프롬프트/모델 → Claude 호출 없이 즉시 반환
+            st.session_state.analysis = cached
+            st.success("⚡ 이전 분석 결과를 재사용했습니다 (동일한 입력)")
+        elif pending_id is not None and get_job_runner().get(pending_id) is not None:
+            # 다른 사용자가 같은 입력을 분석 중이면 그 작업 결과를 함께 기다림
+            st.session_state.jobs["analysis"] = pending_id
+        else:
+            # 분석은 백그라운드 작업으로 실행 - 스크립트 스레드를 1분씩 붙잡지 않음
+            job = get_job_runner().submit(
+                analysis_job, box, raw_input, cache, cache_key, name="analysis"
+            )
+            cache.set_pending(cache_key, job.id)
+            st.session_state.jobs["analysis"] = job.id
+
+analysis_done = collect_job("analysis")
+if analysis_done is not None:
+    if analysis_done.status == DONE:
+        # Store results in session for reuse (Notion 저장 버튼 등)
+        st.session_state.analysis = analysis_done.result
+        st.success("✅ 분석 완료!")
+    else:
+        st.error(f"❌ 처리 중 오류 발생: {analysis_done.error}")
+        
+        if "API key" in analysis_done.error or "authentication" in analysis_done.error.lower():
+            st.info("""
+            💡 **Claude API 키 설정 방법:**
             
-            # Progress
-            progress_bar = st.progress(0)
-            status_text = st.empty()
+            Streamlit Cloud:
+            1. 앱 대시보드 → Settings
+            2. Secrets → Edit
+            3. 추가: `ANTHROPIC_API_KEY = "sk-ant-..."`
             
-            try:
-                # Stage 1: Cleaning
-                status_text.info("🔍 1/3: 입력 정제 중... (Claude Sonnet 4)")
-                progress_bar.progress(10)
-                
-                cleaned = box.input_agent.process(raw_input)
-                progress_bar.progress(33)
-                
-                # Stage 2: Ideas
-                status_text.info("💡 2/3: 아이디어 추출 중... (Claude Sonnet 4)")
-                progress_bar.progress(40)
-                
-                ideas = box.idea_agent.process(cleaned)
-                progress_bar.progress(66)
-                
-                # Stage 3: Planning
-                status_text.info("📋 3/3: 계획 구조화 중... (Claude Sonnet 4)")
-                progress_bar.progress(75)
-                
-                plan = box.planning_agent.process(ideas)
-                progress_bar.progress(100)
-                
-                status_text.success("✅ 분석 완료!")
-                # Store results in session for reuse (Notion 저장 버튼 등)
-                st.session_state.analysis = {
-                    "cleaned": cleaned,
-                    "ideas": ideas,
-                    "plan": plan
-                }
-                
-            except Exception as e:
-                st.error(f"❌ 처리 중 오류 발생:")
-                st.exception(e)
-                
-                if "API key" in str(e) or "authentication" in str(e).lower():
-                    st.info("""
-                    💡 **Claude API 키 설정 방법:**
-                    
-                    Streamlit Cloud:
-                    1. 앱 대시보드 → Settings
-                    2. Secrets → Edit
-                    3. 추가: `ANTHROPIC_API_KEY = "sk-ant-..."`
-                    
-                    로컬:
-                    1. `.streamlit/secrets.toml` 파일 생성
-                    2. 추가: `ANTHROPIC_API_KEY = "sk-ant-..."`
-                    """)
+            로컬:
+            1. `.streamlit/secrets.toml` 파일 생성
+            2. 추가: `ANTHROPIC_API_KEY = "sk-ant-..."`
+            """)
+elif "analysis" in st.session_state.jobs:
+    st.markdown("---")
+    st.subheader("📊 분석 진행 중...")
+    job_progress("analysis")
 
 # Persisted results display (works after rerun, e.g., Notion 버튼 클릭)
 if 'analysis' in st.session_state:
@@ -426,27 +726,27 @@ if 'analysis' in st.session_state:
     st.markdown("---")
     st.subheader("📥 Notion 저장")
     notion_btn = st.button("💾 Notion에 저장", type="primary", use_container_width=True)
+    # 지금 보고 있는 분석 결과의 저장 상태만 표시 (분석 결과별 outbox ID)
+    plan_key = input_hash(plan)
     
     if notion_btn:
-        notion_client = load_notion_storage()
-        if notion_client is None:
-            st.error("Notion 클라이언트 초기화에 실패했습니다.")
-        else:
-            with st.spinner("Notion에 저장 중..."):
-                try:
-                    session_id = str(uuid.uuid4())
-                    notion_payload = _convert_to_notion_format(
-                        session_id=session_id,
-                        cleaned=cleaned,
-                        ideas=ideas,
-                        plan=plan,
-                    )
-                    notion_result = notion_client.save_thinking_result(notion_payload)
-                    st.success("✅ Notion 저장 완료!")
-                    st.markdown(f"[Notion 페이지 바로가기]({notion_result['page_url']})")
-                    st.caption(f"Session ID: {session_id}")
-                except Exception as e:
-                    st.error(f"❌ Notion 저장 실패: {e}")
+        try:
+            notion_payload = _convert_to_notion_format(
+                # 같은 분석 결과면 같은 session_id → 중복 클릭/재실행/재전송이 같은 페이지를 upsert
+                session_id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"thinking-box:{plan_key}")),
+                cleaned=cleaned,
+                ideas=ideas,
+                plan=plan,
+            )
+            # 로컬 대기열에 넣고 바로 반환 - Notion이 느리거나 429여도 화면은 멈추지 않음
+            st.session_state.notion_saves[plan_key] = get_notion_outbox().enqueue(
+                notion_payload, meta={"history_id": data.get("history_id")}
+            )
+        except Exception as e:
+            st.error(f"❌ Notion 저장 대기열 추가 실패: {e}")
+
+    if plan_key in st.session_state.notion_saves:
+        notion_save_progress(st.session_state.notion_saves[plan_key])
 
 # Footer
 st.markdown("---")
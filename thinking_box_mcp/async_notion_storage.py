@@ -0,0 +1,176 @@
+"""
+Async Notion Database 연동 모듈
+
+http_server / mcp_server처럼 이벤트 루프 안에서 Notion을 호출하는 곳에서 사용합니다.
+- notion_client.AsyncClient + 공유 httpx.AsyncClient (keep-alive 커넥션 풀)
+- 세마포어로 동시 요청 수 제한, 요청 속도는 동기 버전과 같은 공유 rate limiter
+- 저장 포맷/upsert/본문 블록 로직은 NotionStorage의 _*_steps를 그대로 쓰고 요청 실행만 async
+"""
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+from notion_client import AsyncClient
+
+try:
+    from .notion_storage import NotionStorage
+except ImportError:
+    from notion_storage import NotionStorage
+
+
+class AsyncNotionStorage(NotionStorage):
+    """
+    NotionStorage의 async 버전
+
+    I/O 메서드(save_thinking_result, upsert_thinking_result, test_connection)는 코루틴이고,
+    속성 변환과 세션 인덱스는 동기 버전을 그대로 사용합니다.
+    """
+
+    def __init__(
+        self,
+        token: str = None,
+        database_id: str = None,
+        max_concurrency: Optional[int] = None,
+        timeout: float = 30.0,
+        **kwargs
+    ):
+        """
+        Args:
+            token: Notion Integration Token
+            database_id: 저장할 Database ID
+            max_concurrency: 동시에 진행할 Notion 요청 수 (기본: NOTION_MAX_CONCURRENCY 또는 8)
+            timeout: 요청 타임아웃 (초)
+            **kwargs: NotionStorage 옵션 (rate_limiter, upsert, session_index, write_content, validate, base_url)
+        """
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("NOTION_MAX_CONCURRENCY", "8"))
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._http: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._async_session_locks: Optional[List[asyncio.Lock]] = None
+        self._schema_lock: Optional[asyncio.Lock] = None
+        super().__init__(token=token, database_id=database_id, **kwargs)
+
+    def _make_client(self):
+        # 커넥션 풀 크기 = 동시 요청 수 → 요청마다 TLS handshake를 새로 하지 않음
+        # (타임아웃은 notion_client가 httpx 클라이언트에 덮어쓰므로 _client_options의 timeout_ms로 전달)
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+        )
+        return AsyncClient(client=self._http, **self._client_options())
+
+    def _client_options(self) -> Dict[str, Any]:
+        options = super()._client_options()
+        options["timeout_ms"] = int(self.timeout * 1000)
+        return options
+
+    async def aclose(self):
+        """풀 커넥션 정리 (서버 종료 시)"""
+        if self._http is not None:
+            await self._http.aclose()
+
+    async def save_thinking_result(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Thinking Box 결과를 Notion Database에 저장 (NotionStorage.save_thinking_result 참고)
+        """
+        if self.upsert and data.get("session_id"):
+            return await self.upsert_thinking_result(data)
+
+        properties = self._checked_properties(data, await self._schema_for_validation())
+        response = await self._run(self._create_page_steps(properties, self._content_batches(data)))
+
+        return {
+            "success": True,
+            "page_id": response["id"],
+            "page_url": response["url"],
+            "created_time": response["created_time"]
+        }
+
+    async def upsert_thinking_result(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        session_id 기준 idempotent 저장 (NotionStorage.upsert_thinking_result 참고)
+        """
+        session_id = str(data["session_id"])
+        schema = await self._schema_for_validation()
+        properties, values, batches, content_hash = self._prepare_upsert(data, schema)
+        if content_hash is not None and schema is None:
+            schema = await self.database_schema()
+        hash_property = self._content_hash_property(content_hash, schema)
+
+        async with self._session_lock(session_id):
+            return await self._run(
+                self._upsert_steps(session_id, properties, values, batches, content_hash, hash_property)
+            )
+
+    async def test_connection(self, refresh: bool = False) -> bool:
+        """
+        Notion 연결 테스트 (스키마 캐시가 유효하면 네트워크 호출 없음)
+        """
+        try:
+            await self.database_schema(refresh=refresh)
+            return True
+        except Exception as e:
+            print(f"Notion 연결 실패: {e}")
+            return False
+
+    async def database_schema(self, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """DB 스키마 (TTL 캐시, NotionStorage.database_schema 참고)"""
+        if refresh:
+            self._schema_cache.invalidate()
+        cached = self._schema_cache.cached()
+        if cached is not None:
+            return cached
+        if self._schema_lock is None:
+            self._schema_lock = asyncio.Lock()
+        # 캐시가 빈 순간 몰린 요청들이 각자 retrieve하지 않도록 한 번만 조회
+        async with self._schema_lock:
+            cached = self._schema_cache.cached()
+            if cached is not None:
+                return cached
+            database = await self._call(self.client.databases.retrieve, database_id=self.database_id)
+            return self._schema_cache.set(database)
+
+    async def _schema_for_validation(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        return await self.database_schema() if self.validate else None
+
+    async def _run(self, steps):
+        """_*_steps 제너레이터 실행 (async 드라이버, NotionStorage._run 참고)"""
+        result, error = None, None
+        while True:
+            try:
+                request = steps.send(result) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                result, error = await self._execute(request), None
+            except Exception as e:
+                result, error = None, e
+
+    async def _execute(self, request):
+        if isinstance(request, list):
+            # 요청 묶음(예: 블록 삭제)은 순서와 무관하므로 동시에 (세마포어/rate limiter가 상한)
+            return list(await asyncio.gather(*(self._execute(item) for item in request)))
+        fn, kwargs = request
+        return await self._call(fn, **kwargs)
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        # asyncio 객체는 사용하는 이벤트 루프 안에서 만들어야 하므로 첫 사용 시 생성
+        if self._async_session_locks is None:
+            self._async_session_locks = [asyncio.Lock() for _ in range(64)]
+        return self._async_session_locks[hash(session_id) % len(self._async_session_locks)]
+
+    async def _call(self, fn, *args, **kwargs):
+        """동시 요청 수 제한 + 공유 rate limiter + 429 재시도"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            try:
+                return await self.rate_limiter.acall(fn, *args, **kwargs)
+            except Exception as e:
+                self._on_error(e)
+                raise
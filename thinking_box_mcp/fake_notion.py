@@ -0,0 +1,589 @@
+"""
+Notion API 로컬 대역 서버 (부하/통합 테스트용)
+
+NotionStorage가 쓰는 엔드포인트만 메모리 저장소로 흉내냅니다.
+- pages.create / pages.update
+- databases.retrieve / databases.query (필터, 정렬, 페이지네이션)
+- blocks.children.append / blocks.children.list / blocks.delete
+- 응답 지연(latency + jitter), 429 주입(무작위 비율 + 초당 요청 한도)
+- 실제 Notion처럼 last_edited_time은 분 단위, 텍스트 2000자/children 100개 제한은 400
+
+실제 워크스페이스 없이 /ingest, outbox, 미러 동기화를 부하 테스트할 수 있습니다.
+database ID는 아무 값이나 쓰면 처음 접근할 때 README의 기본 스키마로 만들어집니다.
+
+사용법:
+    python fake_notion.py --port 8100 --latency 0.2 --jitter 0.1 --rate 3 --error-rate 0.05
+
+    NOTION_BASE_URL=http://localhost:8100 NOTION_TOKEN=fake NOTION_DATABASE_ID=test-db \\
+        python http_server.py
+
+    curl localhost:8100/_fake/stats
+    curl -X PATCH localhost:8100/_fake/config -H 'Content-Type: application/json' -d '{"error_rate": 0.5}'
+"""
+import argparse
+import asyncio
+import os
+import random
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    from .rate_limit import TokenBucket
+except ImportError:
+    from rate_limit import TokenBucket
+
+
+MAX_TEXT_LENGTH = 2000
+MAX_CHILDREN = 100
+MAX_PAGE_SIZE = 100
+
+# README "Database 생성 및 연결"의 속성 구성
+DEFAULT_SCHEMA = {
+    "Title": {"type": "title"},
+    "Idea Stage": {"type": "select", "options": ["발산", "수렴"]},
+    "Summary": {"type": "rich_text"},
+    "Key Points": {"type": "multi_select", "options": []},
+    "Tasks": {"type": "rich_text"},
+    "Confidence": {"type": "number"},
+    "Session ID": {"type": "rich_text"},
+    "Created At": {"type": "date"},
+    "Content Hash": {"type": "rich_text"},
+}
+
+
+class NotionError(Exception):
+    """Notion 형식 오류 응답 ({"object": "error", "status", "code", "message"})"""
+
+    def __init__(self, status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.headers = headers or {}
+
+    def response(self) -> JSONResponse:
+        return JSONResponse(
+            status_code=self.status,
+            content={"object": "error", "status": self.status, "code": self.code, "message": str(self)},
+            headers=self.headers
+        )
+
+
+def _now() -> str:
+    # Notion의 created_time/last_edited_time은 분 단위로 잘림
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    return now.strftime("%Y-%m-%dT%H:%M:00.000Z")
+
+
+def _plain_text(items: List[Dict[str, Any]]) -> str:
+    return "".join((item.get("text") or {}).get("content", "") for item in items or [])
+
+
+def _rich_text_response(items: List[Dict[str, Any]], where: str) -> List[Dict[str, Any]]:
+    result = []
+    for item in items or []:
+        content = (item.get("text") or {}).get("content", "")
+        if len(content) > MAX_TEXT_LENGTH:
+            raise NotionError(
+                400, "validation_error",
+                f"{where}.text.content.length should be ≤ `{MAX_TEXT_LENGTH}`, instead was `{len(content)}`."
+            )
+        result.append({
+            "type": "text",
+            "text": {"content": content, "link": None},
+            "annotations": item.get("annotations") or {},
+            "plain_text": content,
+            "href": None
+        })
+    return result
+
+
+class FakeDatabase:
+    """메모리 database 1개 (스키마 + 페이지)"""
+
+    def __init__(self, database_id: str):
+        self.id = database_id
+        self.created_time = _now()
+        self.schema = {
+            name: {"type": field["type"], "options": list(field.get("options") or [])}
+            for name, field in DEFAULT_SCHEMA.items()
+        }
+        self.pages: Dict[str, Dict[str, Any]] = {}
+
+    def to_json(self) -> Dict[str, Any]:
+        properties = {}
+        for name, field in self.schema.items():
+            kind = field["type"]
+            config = {}
+            if kind in ("select", "multi_select"):
+                config = {"options": [{"name": option} for option in field["options"]]}
+            properties[name] = {"id": name, "name": name, "type": kind, kind: config}
+        return {
+            "object": "database",
+            "id": self.id,
+            "created_time": self.created_time,
+            "last_edited_time": self.created_time,
+            "title": [{"type": "text", "text": {"content": "Thinking Box (fake)"}, "plain_text": "Thinking Box (fake)"}],
+            "properties": properties,
+            "url": f"https://www.notion.so/{self.id.replace('-', '')}",
+        }
+
+    def convert_properties(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """요청 속성 → 저장 포맷 (스키마와 맞지 않으면 Notion처럼 400)"""
+        converted = {}
+        for name, prop in (properties or {}).items():
+            field = self.schema.get(name)
+            if field is None:
+                raise NotionError(400, "validation_error", f"{name} is not a property that exists.")
+            kind = field["type"]
+            if kind not in prop:
+                given = next(iter(prop), None)
+                raise NotionError(
+                    400, "validation_error",
+                    f"{name} is expected to be {kind}. Instead got {given}."
+                )
+            value = prop[kind]
+            where = f"body.properties.{name}.{kind}"
+
+            if kind in ("title", "rich_text"):
+                value = _rich_text_response(value, where)
+            elif kind == "select":
+                if value is not None:
+                    value = self._option(field, value.get("name", ""), where)
+            elif kind == "multi_select":
+                value = [self._option(field, option.get("name", ""), where) for option in value or []]
+            elif kind == "number":
+                if value is not None and not isinstance(value, (int, float)):
+                    raise NotionError(400, "validation_error", f"{where} should be a number or `null`.")
+            elif kind == "date":
+                if value is not None and not value.get("start"):
+                    raise NotionError(400, "validation_error", f"{where}.start should be defined.")
+            converted[name] = {"id": name, "type": kind, kind: value}
+        return converted
+
+    @staticmethod
+    def _option(field: Dict[str, Any], name: str, where: str) -> Dict[str, Any]:
+        if "," in name:
+            raise NotionError(400, "validation_error", f"{where}.name should not contain commas.")
+        if len(name) > 100:
+            raise NotionError(400, "validation_error", f"{where}.name.length should be ≤ `100`.")
+        # 실제 Notion처럼 없는 옵션은 새로 만듦
+        if name not in field["options"]:
+            field["options"].append(name)
+        return {"id": name, "name": name, "color": "default"}
+
+
+class FakeNotion:
+    """
+    메모리 Notion 워크스페이스 + 장애 주입 설정
+
+    이벤트 루프 하나에서만 접근하므로 (await 사이에 상태를 바꾸지 않음) 별도 락이 없습니다.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate: Optional[float] = None,
+        retry_after: float = 1.0
+    ):
+        """
+        Args:
+            latency: 모든 응답 전 기본 지연 (초)
+            jitter: 지연에 더하는 0~jitter초 무작위 값
+            error_rate: 요청을 무작위로 429 처리할 비율 (0~1)
+            rate: 초당 허용 요청 수 (넘으면 429, None이면 제한 없음)
+            retry_after: 429 응답의 Retry-After (초)
+        """
+        self.databases: Dict[str, FakeDatabase] = {}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[str, List[Dict[str, Any]]] = {}
+        self.block_parents: Dict[str, str] = {}
+        self.counts: Counter = Counter()
+        self.configure(latency=latency, jitter=jitter, error_rate=error_rate, rate=rate, retry_after=retry_after)
+
+    def configure(self, **options):
+        """장애 주입 설정 변경 (None이 아닌 값만)"""
+        for name in ("latency", "jitter", "error_rate", "retry_after"):
+            if options.get(name) is not None:
+                setattr(self, name, float(options[name]))
+        if "rate" in options:
+            self.rate = options["rate"]
+            self.bucket = TokenBucket(self.rate) if self.rate else None
+
+    def config(self) -> Dict[str, Any]:
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "error_rate": self.error_rate,
+            "rate": self.rate,
+            "retry_after": self.retry_after,
+        }
+
+    def reset(self):
+        self.databases.clear()
+        self.pages.clear()
+        self.children.clear()
+        self.block_parents.clear()
+        self.counts.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": dict(self.counts),
+            "databases": len(self.databases),
+            "pages": len(self.pages),
+            "blocks": sum(len(blocks) for blocks in self.children.values()),
+        }
+
+    async def before_request(self, endpoint: str):
+        """요청 카운트 → 429 주입 → 지연"""
+        self.counts[endpoint] += 1
+        self.counts["total"] += 1
+
+        if (self.bucket is not None and self.bucket.try_acquire()) or random.random() < self.error_rate:
+            self.counts["rate_limited"] += 1
+            raise NotionError(
+                429, "rate_limited",
+                "You have been rate limited. Please try again in a few minutes.",
+                headers={"Retry-After": str(self.retry_after)}
+            )
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def database(self, database_id: str) -> FakeDatabase:
+        if database_id not in self.databases:
+            self.databases[database_id] = FakeDatabase(database_id)
+        return self.databases[database_id]
+
+    def page(self, page_id: str) -> Dict[str, Any]:
+        page = self.pages.get(page_id)
+        if page is None or page["archived"]:
+            raise NotionError(404, "object_not_found", f"Could not find page with ID: {page_id}.")
+        return page
+
+    def create_page(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        database_id = (body.get("parent") or {}).get("database_id")
+        if not database_id:
+            raise NotionError(400, "validation_error", "body.parent.database_id should be defined.")
+        database = self.database(database_id)
+        properties = database.convert_properties(body.get("properties"))
+
+        page_id = str(uuid.uuid4())
+        now = _now()
+        page = {
+            "object": "page",
+            "id": page_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+            "parent": {"type": "database_id", "database_id": database_id},
+            "properties": properties,
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        }
+        self.children[page_id] = []
+        try:
+            self.append_children(page_id, body.get("children") or [])
+        except NotionError:
+            del self.children[page_id]
+            raise
+        self.pages[page_id] = page
+        database.pages[page_id] = page
+        return page
+
+    def update_page(self, page_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        page = self.page(page_id)
+        database = self.databases[page["parent"]["database_id"]]
+        page["properties"].update(database.convert_properties(body.get("properties")))
+        if body.get("archived"):
+            page["archived"] = True
+            database.pages.pop(page_id, None)
+        page["last_edited_time"] = _now()
+        return page
+
+    def query(self, database_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        pages = [page for page in self.database(database_id).pages.values() if _matches(page, body.get("filter"))]
+        for sort in reversed(body.get("sorts") or []):
+            pages.sort(key=lambda page: _sort_key(page, sort), reverse=sort.get("direction") == "descending")
+        return _paginate(pages, body.get("start_cursor"), body.get("page_size"))
+
+    def append_children(
+        self,
+        block_id: str,
+        children: List[Dict[str, Any]],
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if block_id not in self.children:
+            raise NotionError(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+        if len(children) > MAX_CHILDREN:
+            raise NotionError(
+                400, "validation_error",
+                f"body.children.length should be ≤ `{MAX_CHILDREN}`, instead was `{len(children)}`."
+            )
+        appended = []
+        for index, child in enumerate(children):
+            kind = child.get("type")
+            content = dict(child.get(kind) or {})
+            if "rich_text" in content:
+                content["rich_text"] = _rich_text_response(content["rich_text"], f"body.children[{index}].{kind}")
+            block = {
+                "object": "block",
+                "id": str(uuid.uuid4()),
+                "type": kind,
+                kind: content,
+                "has_children": False,
+                "archived": False,
+                "created_time": _now(),
+            }
+            appended.append(block)
+        blocks = self.children[block_id]
+        if after:
+            # after 블록 바로 뒤에 끼워 넣기
+            index = next((i for i, block in enumerate(blocks) if block["id"] == after), None)
+            if index is None:
+                raise NotionError(400, "validation_error", f"body.after block {after} is not a child of {block_id}.")
+            blocks[index + 1:index + 1] = appended
+        else:
+            blocks.extend(appended)
+        self.block_parents.update((block["id"], block_id) for block in appended)
+        if block_id in self.pages:
+            self.pages[block_id]["last_edited_time"] = _now()
+        return {"object": "list", "results": appended, "next_cursor": None, "has_more": False}
+
+    def list_children(self, block_id: str, start_cursor: Optional[str], page_size: Optional[int]) -> Dict[str, Any]:
+        if block_id not in self.children:
+            raise NotionError(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+        return _paginate(self.children[block_id], start_cursor, page_size)
+
+    def delete_block(self, block_id: str) -> Dict[str, Any]:
+        parent_id = self.block_parents.pop(block_id, None)
+        if parent_id is None:
+            raise NotionError(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+        blocks = self.children[parent_id]
+        block = next(block for block in blocks if block["id"] == block_id)
+        blocks.remove(block)
+        if parent_id in self.pages:
+            self.pages[parent_id]["last_edited_time"] = _now()
+        return {**block, "archived": True}
+
+
+def _paginate(items: List[Dict[str, Any]], start_cursor: Optional[str], page_size: Optional[int]) -> Dict[str, Any]:
+    """Notion 방식 커서 페이지네이션 (next_cursor = 다음 항목의 ID)"""
+    start = 0
+    if start_cursor:
+        ids = [item["id"] for item in items]
+        if start_cursor not in ids:
+            raise NotionError(400, "validation_error", "start_cursor is invalid.")
+        start = ids.index(start_cursor)
+    size = min(int(page_size or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+    chunk = items[start:start + size]
+    has_more = start + size < len(items)
+    return {
+        "object": "list",
+        "results": chunk,
+        "next_cursor": items[start + size]["id"] if has_more else None,
+        "has_more": has_more,
+    }
+
+
+def _property_value(page: Dict[str, Any], name: str) -> Any:
+    prop = page["properties"].get(name)
+    if prop is None:
+        return None
+    value = prop.get(prop["type"])
+    if prop["type"] in ("title", "rich_text"):
+        return _plain_text(value)
+    if prop["type"] == "select":
+        return (value or {}).get("name")
+    if prop["type"] == "multi_select":
+        return [option["name"] for option in value or []]
+    if prop["type"] == "date":
+        return (value or {}).get("start")
+    return value
+
+
+def _sort_key(page: Dict[str, Any], sort: Dict[str, Any]):
+    value = page.get(sort["timestamp"]) if "timestamp" in sort else _property_value(page, sort.get("property"))
+    # None은 항상 뒤로
+    return (value is None, value if value is not None else 0)
+
+
+def _compare(value: Any, condition: Dict[str, Any]) -> bool:
+    for operator, expected in condition.items():
+        if operator == "is_empty":
+            return value in (None, "", [])
+        if operator == "is_not_empty":
+            return value not in (None, "", [])
+        if value is None:
+            return False
+        if operator == "equals" and value != expected:
+            return False
+        if operator == "does_not_equal" and value == expected:
+            return False
+        if operator == "contains" and expected not in value:
+            return False
+        if operator == "does_not_contain" and expected in value:
+            return False
+        if operator == "starts_with" and not str(value).startswith(expected):
+            return False
+        if operator in ("greater_than", "after") and not value > expected:
+            return False
+        if operator in ("less_than", "before") and not value < expected:
+            return False
+        if operator in ("greater_than_or_equal_to", "on_or_after") and not value >= expected:
+            return False
+        if operator in ("less_than_or_equal_to", "on_or_before") and not value <= expected:
+            return False
+    return True
+
+
+def _matches(page: Dict[str, Any], condition: Optional[Dict[str, Any]]) -> bool:
+    """databases.query filter 평가 (and/or, 속성 필터, timestamp 필터)"""
+    if not condition:
+        return True
+    if "and" in condition:
+        return all(_matches(page, part) for part in condition["and"])
+    if "or" in condition:
+        return any(_matches(page, part) for part in condition["or"])
+    if "timestamp" in condition:
+        name = condition["timestamp"]
+        return _compare(page.get(name), condition.get(name) or {})
+
+    value = _property_value(page, condition.get("property"))
+    for kind, rule in condition.items():
+        if kind != "property":
+            return _compare(value, rule)
+    return True
+
+
+class ConfigUpdate(BaseModel):
+    """PATCH /_fake/config 요청 (보낸 값만 변경)"""
+    latency: Optional[float] = None
+    jitter: Optional[float] = None
+    error_rate: Optional[float] = None
+    rate: Optional[float] = None
+    retry_after: Optional[float] = None
+
+
+def create_app(notion: Optional[FakeNotion] = None) -> FastAPI:
+    """
+    Notion API 경로(/v1/...)를 흉내내는 FastAPI 앱
+
+    Args:
+        notion: 상태/설정을 담은 FakeNotion (기본: 새 인스턴스, 장애 주입 없음)
+    """
+    notion = notion or FakeNotion()
+    app = FastAPI(title="Fake Notion API", version="1.0.0")
+    app.state.notion = notion
+
+    @app.exception_handler(NotionError)
+    async def notion_error_handler(request, exc: NotionError):
+        return exc.response()
+
+    async def begin(request: Request, endpoint: str) -> Dict[str, Any]:
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            raise NotionError(401, "unauthorized", "API token is invalid.")
+        await notion.before_request(endpoint)
+        if request.method in ("POST", "PATCH"):
+            body = await request.body()
+            return await request.json() if body else {}
+        return {}
+
+    @app.post("/v1/pages")
+    async def create_page(request: Request):
+        body = await begin(request, "pages.create")
+        return notion.create_page(body)
+
+    @app.patch("/v1/pages/{page_id}")
+    async def update_page(page_id: str, request: Request):
+        body = await begin(request, "pages.update")
+        return notion.update_page(page_id, body)
+
+    @app.get("/v1/pages/{page_id}")
+    async def retrieve_page(page_id: str, request: Request):
+        await begin(request, "pages.retrieve")
+        return notion.page(page_id)
+
+    @app.get("/v1/databases/{database_id}")
+    async def retrieve_database(database_id: str, request: Request):
+        await begin(request, "databases.retrieve")
+        return notion.database(database_id).to_json()
+
+    @app.post("/v1/databases/{database_id}/query")
+    async def query_database(database_id: str, request: Request):
+        body = await begin(request, "databases.query")
+        return notion.query(database_id, body)
+
+    @app.patch("/v1/blocks/{block_id}/children")
+    async def append_children(block_id: str, request: Request):
+        body = await begin(request, "blocks.children.append")
+        return notion.append_children(block_id, body.get("children") or [], body.get("after"))
+
+    @app.get("/v1/blocks/{block_id}/children")
+    async def list_children(
+        block_id: str,
+        request: Request,
+        start_cursor: Optional[str] = None,
+        page_size: Optional[int] = None
+    ):
+        await begin(request, "blocks.children.list")
+        return notion.list_children(block_id, start_cursor, page_size)
+
+    @app.delete("/v1/blocks/{block_id}")
+    async def delete_block(block_id: str, request: Request):
+        await begin(request, "blocks.delete")
+        return notion.delete_block(block_id)
+
+    @app.get("/_fake/stats")
+    async def fake_stats():
+        """엔드포인트별 요청 수, 429 수, 저장된 페이지/블록 수"""
+        return {**notion.stats(), "config": notion.config()}
+
+    @app.patch("/_fake/config")
+    async def fake_config(update: ConfigUpdate):
+        """실행 중 장애 주입 설정 변경 (rate: 0이면 제한 해제)"""
+        notion.configure(**update.dict(exclude_unset=True))
+        return notion.config()
+
+    @app.post("/_fake/reset")
+    async def fake_reset():
+        """저장된 데이터와 카운터 초기화"""
+        notion.reset()
+        return notion.stats()
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Notion API 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("FAKE_NOTION_PORT", "8100")))
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연에 더할 무작위 값 최대 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="무작위 429 비율 (0~1)")
+    parser.add_argument("--rate", type=float, default=None, help="초당 허용 요청 수 (넘으면 429)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After (초)")
+    args = parser.parse_args()
+
+    notion = FakeNotion(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate=args.rate,
+        retry_after=args.retry_after
+    )
+    print(f"🧪 Fake Notion API: http://{args.host}:{args.port}  ({notion.config()})")
+    print(f"   NOTION_BASE_URL=http://{args.host}:{args.port} 로 NotionStorage를 연결하세요")
+    uvicorn.run(create_app(notion), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
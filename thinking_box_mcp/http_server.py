@@ -4,16 +4,37 @@ Thinking Box HTTP API 서버
 FastAPI 기반 REST API
 외부 시스템에서 HTTP POST로 Notion에 데이터 저장
 """
+import asyncio
+import json
 import os
-from typing import Dict, Any, List, Optional
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.datastructures import UploadFile
 from pydantic import BaseModel, Field, validator
 from dotenv import load_dotenv
 
-from notion_storage import NotionStorage
+from async_notion_storage import AsyncNotionStorage
+from notion_storage import NotionStorage, env_flag
+from rate_limit import RateLimitExceeded
+from outbox import NotionOutbox
+from notion_mirror import NotionMirror
+
+# Thinking Box 공용 모듈 (warm-up)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'thinking_box'))
+from core.jobs import PENDING, JobRunner
+from core.warmup import Warmup, warmup_enabled
 
 
 # 환경 변수 로드
@@ -26,8 +47,74 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Notion 클라이언트
-notion_client = NotionStorage()
+# 서버는 upsert/본문 블록/스키마 검사를 명시적으로 켬 (NotionStorage 기본값은 모두 끔)
+# - 재시도/outbox 재전송이 같은 session_id 페이지를 갱신하도록, 끄려면 각 환경 변수를 0으로
+STORAGE_OPTIONS = {
+    "upsert": env_flag("NOTION_UPSERT", True),
+    "write_content": env_flag("NOTION_PAGE_CONTENT", True),
+    "validate": env_flag("NOTION_VALIDATE", True),
+}
+
+# Notion 클라이언트 (async - 요청 처리 중 이벤트 루프를 막지 않고, 동시 ingest가 겹쳐서 진행)
+notion_client = AsyncNotionStorage(**STORAGE_OPTIONS)
+
+# 시작 시 Notion 연결 예열 (THINKING_BOX_WARMUP=1)
+warmup = Warmup()
+
+
+# 백그라운드 스레드(outbox flusher, 미러 동기화)용 동기 클라이언트 (rate limiter/세션 인덱스는 공유)
+sync_notion_client = NotionStorage(**STORAGE_OPTIONS)
+
+# Notion 저장 대기열 (CLI/Streamlit이 넣어둔 항목도 같은 DB면 함께 전송)
+outbox = NotionOutbox(lambda: sync_notion_client)
+
+# 로컬 미러 (조회는 SQLite, 동기화는 python notion_mirror.py sync 또는 POST /results/sync)
+notion_mirror = NotionMirror(sync_notion_client)
+
+
+@app.on_event("startup")
+async def start_warmup():
+    if not warmup_enabled():
+        return
+    loop = asyncio.get_running_loop()
+    
+    def warm_notion():
+        # 요청이 실제로 쓰는 async 커넥션 풀을 예열 (warm-up 스레드 → 서버 이벤트 루프)
+        connected = asyncio.run_coroutine_threadsafe(notion_client.test_connection(), loop).result()
+        if not connected:
+            raise RuntimeError("Notion 연결 실패")
+    
+    warmup.add("notion", warm_notion).start()
+
+
+@app.on_event("startup")
+async def start_outbox():
+    outbox.start()
+
+
+@app.on_event("shutdown")
+async def close_notion():
+    analysis_runner.shutdown(wait=False)
+    outbox.stop(timeout=5)
+    await notion_client.aclose()
+
+
+# /ingest/batch 한 번에 받을 최대 항목 수, 동시에 진행할 항목 수 (Notion 요청 수는 rate limiter가 제한)
+BATCH_MAX_ITEMS = int(os.getenv("INGEST_BATCH_MAX_ITEMS", "5000"))
+BATCH_CONCURRENCY = int(os.getenv("INGEST_BATCH_CONCURRENCY", str(notion_client.max_concurrency * 2)))
+
+
+# /analyze 작업 실행기 - 동시 분석 수 제한 (STT 모델/LLM 호출이 무거움), 대기 작업이 많으면 503
+analysis_runner = JobRunner(
+    max_workers=int(os.getenv("ANALYZE_WORKERS", "2")),
+    retention=float(os.getenv("ANALYZE_JOB_RETENTION", "3600"))
+)
+ANALYZE_MAX_PENDING = int(os.getenv("ANALYZE_MAX_PENDING", "32"))
+
+# 분석 파이프라인(3-agent)과 STT는 첫 /analyze 요청 때 만들어 계속 재사용
+_analysis_pipeline = None
+_stt = None
+_analysis_lock = threading.Lock()
 
 
 # 요청 모델
@@ -46,6 +133,7 @@ class ThinkingResult(BaseModel):
     key_points: List[str] = Field(default_factory=list, description="핵심 포인트")
     tasks: List[Task] = Field(default_factory=list, description="작업 목록")
     confidence: float = Field(..., ge=0.0, le=1.0, description="신뢰도 (0~1)")
+    content: Optional[str] = Field(None, description="페이지 본문으로 저장할 전체 분석 (마크다운)")
     
     @validator('idea_stage')
     def validate_stage(cls, v):
@@ -61,9 +149,17 @@ class IngestResponse(BaseModel):
     page_id: str
     page_url: str
     created_time: str
+    action: str = "created"
     message: str
 
 
+INGEST_MESSAGES = {
+    "created": "데이터가 성공적으로 저장되었습니다",
+    "updated": "기존 페이지의 변경된 속성을 업데이트했습니다",
+    "unchanged": "이미 같은 내용으로 저장되어 있습니다",
+}
+
+
 class ErrorResponse(BaseModel):
     """에러 응답"""
     success: bool = False
@@ -80,7 +176,12 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "ingest": "POST /ingest - Notion에 데이터 저장",
-            "health": "GET /health - 서버 상태 확인"
+            "ingest_batch": "POST /ingest/batch - 여러 결과 저장 (JSON 배열/NDJSON → NDJSON 스트리밍)",
+            "health": "GET /health - 서버 상태 확인",
+            "outbox": "GET /outbox - Notion 저장 대기열 상태",
+            "results": "GET /results - 저장된 결과 조회 (로컬 미러)",
+            "analyze": "POST /analyze - 회의록/음성 분석 작업 시작 (202 + job ID)",
+            "jobs": "GET /jobs/{job_id} - 분석 작업 상태/단계별 소요 시간/결과"
         }
     }
 
@@ -88,13 +189,18 @@ async def root():
 @app.get("/health")
 async def health_check():
     """
-    서버 상태 및 Notion 연결 확인
+    서버 상태 및 Notion 연결 확인 (스키마 캐시가 유효하면 Notion 호출 없음)
     """
-    notion_ok = notion_client.test_connection()
+    notion_ok = await notion_client.test_connection()
     
     return {
         "status": "healthy" if notion_ok else "degraded",
         "notion_connection": "ok" if notion_ok else "failed",
+        "warmup": warmup.status(),
+        "notion_rate_limit": notion_client.rate_limit_stats(),
+        "notion_schema_age": notion_client.schema_age(),
+        "notion_outbox": outbox.status(),
+        "analysis_jobs": analysis_runner.stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -106,7 +212,8 @@ async def health_check():
     responses={
         201: {"description": "데이터가 성공적으로 저장됨"},
         400: {"model": ErrorResponse, "description": "잘못된 입력 데이터"},
-        500: {"model": ErrorResponse, "description": "서버 에러"}
+        500: {"model": ErrorResponse, "description": "서버 에러"},
+        503: {"model": ErrorResponse, "description": "Notion 요청 한도 초과 (Retry-After 후 재시도)"}
     }
 )
 async def ingest_thinking_result(data: ThinkingResult):
@@ -136,20 +243,26 @@ async def ingest_thinking_result(data: ThinkingResult):
         "page_id": "abc123...",
         "page_url": "https://notion.so/...",
         "created_time": "2025-01-08T12:00:00.000Z",
+        "action": "created",
         "message": "데이터가 성공적으로 저장되었습니다"
     }
     ```
+    
+    같은 session_id로 다시 요청하면(클라이언트 재시도 등) 새 페이지를 만들지 않고
+    바뀐 속성만 업데이트합니다 (action: updated / unchanged).
     """
     try:
         # Notion에 저장
-        result = notion_client.save_thinking_result(data.dict())
+        result = await notion_client.save_thinking_result(data.dict())
+        action = result.get("action", "created")
         
         return IngestResponse(
             success=True,
             page_id=result["page_id"],
             page_url=result["page_url"],
             created_time=result["created_time"],
-            message="데이터가 성공적으로 저장되었습니다"
+            action=action,
+            message=INGEST_MESSAGES[action]
         )
     
     except ValueError as e:
@@ -158,6 +271,14 @@ async def ingest_thinking_result(data: ThinkingResult):
             detail=f"잘못된 데이터 형식: {str(e)}"
         )
     
+    except RateLimitExceeded as e:
+        # Notion 429는 500이 아니라 재시도 가능한 503으로 전달
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Notion 요청 한도 초과: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after or 1))}
+        )
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -165,6 +286,390 @@ async def ingest_thinking_result(data: ThinkingResult):
         )
 
 
+def _batch_items(body: bytes) -> Iterator[Tuple[int, Any]]:
+    """
+    요청 본문 → (index, 항목) - JSON 배열이면 파싱된 값, NDJSON이면 줄 단위 bytes
+    
+    NDJSON은 줄마다 따로 파싱하므로 한 줄이 깨져도 나머지 항목은 처리됩니다.
+    """
+    if body.lstrip().startswith(b"["):
+        try:
+            items = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"잘못된 JSON 배열: {str(e)}"
+            )
+        yield from enumerate(items)
+        return
+    
+    index = 0
+    for line in body.splitlines():
+        if line.strip():
+            yield index, line
+            index += 1
+
+
+async def _ingest_batch_item(index: int, item: Any) -> Dict[str, Any]:
+    """배치 항목 1개 검사 + 저장 → 결과 줄 (실패해도 예외 대신 success: false)"""
+    session_id = None
+    try:
+        if isinstance(item, bytes):
+            item = json.loads(item)
+        if isinstance(item, dict):
+            session_id = item.get("session_id")
+        data = ThinkingResult.parse_obj(item)
+        result = await notion_client.save_thinking_result(data.dict())
+        return {
+            "index": index,
+            "success": True,
+            "session_id": data.session_id,
+            "page_id": result["page_id"],
+            "page_url": result["page_url"],
+            "action": result.get("action", "created")
+        }
+    
+    except ValueError as e:
+        # JSON 파싱, 모델 검사, 스키마 검사 실패 - 다시 보내도 같은 결과
+        return {"index": index, "success": False, "session_id": session_id,
+                "status": 400, "error": f"잘못된 데이터 형식: {str(e)}", "retryable": False}
+    
+    except RateLimitExceeded as e:
+        return {"index": index, "success": False, "session_id": session_id,
+                "status": 503, "error": f"Notion 요청 한도 초과: {str(e)}", "retryable": True,
+                "retry_after": e.retry_after}
+    
+    except Exception as e:
+        return {"index": index, "success": False, "session_id": session_id,
+                "status": 500, "error": f"Notion 저장 실패: {str(e)}", "retryable": True}
+
+
+@app.post(
+    "/ingest/batch",
+    responses={
+        200: {"description": "항목별 결과 NDJSON 스트림 (마지막 줄은 요약)", "content": {"application/x-ndjson": {}}},
+        400: {"model": ErrorResponse, "description": "본문이 JSON 배열/NDJSON이 아님"}
+    }
+)
+async def ingest_batch(request: Request):
+    """
+    여러 Thinking Box 결과를 한 번에 저장
+    
+    본문: `ThinkingResult` JSON 배열, 또는 한 줄에 하나씩인 NDJSON (chunked 전송 가능)
+    
+    응답: 200 + NDJSON 스트림 - 항목이 끝나는 순서대로 한 줄씩, 마지막 줄은 요약
+    ```
+    {"index": 1, "success": true, "session_id": "...", "page_id": "...", "page_url": "...", "action": "created"}
+    {"index": 0, "success": false, "session_id": "...", "status": 400, "error": "...", "retryable": false}
+    {"summary": {"total": 2, "succeeded": 1, "failed": 1, "actions": {"created": 1}, "failed_indexes": [0], ...}}
+    ```
+    
+    항목은 각각 /ingest와 같은 검사(400) / 한도 초과(503) / 저장 실패(500)를 거치고,
+    일부가 실패해도 나머지는 계속 저장합니다. 재시도할 때는 failed_indexes 항목만 다시 보내면
+    됩니다 (같은 session_id는 upsert라 중복 페이지가 생기지 않음 - NOTION_UPSERT=0이면 예외).
+    """
+    # 본문은 다 받은 뒤 처리 (업로드는 Notion 저장보다 훨씬 빠르고, 응답 스트리밍 중에는
+    # 서버가 연결 종료 감지를 위해 요청 채널을 읽으므로 본문을 함께 읽을 수 없음)
+    body = await request.body()
+    items = _batch_items(body)
+    # JSON 배열 형식 오류는 스트리밍 전에 400으로
+    first = next(items, None)
+    
+    async def results():
+        start = time.perf_counter()
+        pending = set()
+        actions = Counter()
+        failed_indexes = []
+        total = 0
+        
+        def finished(done):
+            for task in done:
+                result = task.result()
+                if result["success"]:
+                    actions[result["action"]] += 1
+                else:
+                    failed_indexes.append(result["index"])
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        
+        try:
+            for index, item in chain([first] if first else [], items):
+                total += 1
+                if index >= BATCH_MAX_ITEMS:
+                    failed_indexes.append(index)
+                    yield json.dumps({
+                        "index": index, "success": False, "session_id": None, "status": 413,
+                        "error": f"배치 최대 크기 초과 ({BATCH_MAX_ITEMS}개)", "retryable": False
+                    }, ensure_ascii=False) + "\n"
+                    continue
+                # 동시에 진행하는 항목 수를 제한 (끝난 항목부터 바로 응답으로 내보냄)
+                while len(pending) >= BATCH_CONCURRENCY:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for line in finished(done):
+                        yield line
+                pending.add(asyncio.create_task(_ingest_batch_item(index, item)))
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for line in finished(done):
+                    yield line
+        finally:
+            # 클라이언트가 연결을 끊으면 남은 저장 취소
+            for task in pending:
+                task.cancel()
+        
+        yield json.dumps({"summary": {
+            "total": total,
+            "succeeded": sum(actions.values()),
+            "failed": len(failed_indexes),
+            "actions": dict(actions),
+            "failed_indexes": sorted(failed_indexes),
+            "seconds": round(time.perf_counter() - start, 2)
+        }}, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@app.get("/outbox")
+async def outbox_status():
+    """
+    Notion 저장 대기열 상태 (대기/완료/실패 개수, 가장 오래된 대기 항목, 최근 실패)
+    """
+    return outbox.status()
+
+
+@app.post("/outbox/retry")
+async def retry_outbox():
+    """
+    실패한 Notion 저장을 다시 대기열에 넣기
+    """
+    return {"requeued": outbox.retry_failed()}
+
+
+@app.get("/results")
+async def query_results(
+    stage: Optional[str] = None,
+    min_confidence: Optional[float] = None,
+    max_confidence: Optional[float] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    text: Optional[str] = None,
+    order: str = "created_at",
+    limit: int = 50
+):
+    """
+    저장된 결과 조회 (Notion API 대신 로컬 미러에서, 대시보드용)
+    """
+    try:
+        pages = notion_mirror.query(
+            stage=stage,
+            min_confidence=min_confidence,
+            max_confidence=max_confidence,
+            since=since,
+            until=until,
+            text=text,
+            order=order,
+            limit=min(limit, 500)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"count": len(pages), "results": pages, "mirror": notion_mirror.status()}
+
+
+@app.post("/results/sync")
+async def sync_results(full: bool = False):
+    """
+    Notion → 로컬 미러 증분 동기화 (full=true면 전체 + 삭제 정리)
+    """
+    return await asyncio.to_thread(notion_mirror.sync, full)
+
+
+def get_analysis_pipeline():
+    """프로세스 공유 3-agent 파이프라인 (Notion은 outbox/미러와 같은 동기 클라이언트 사용)"""
+    global _analysis_pipeline
+    with _analysis_lock:
+        if _analysis_pipeline is None:
+            try:
+                from integrated_system import ThinkingBoxNotion
+            except SystemExit:
+                # integrated_system은 Thinking Box 모듈을 못 찾으면 종료하므로 서버는 계속 동작하도록 변환
+                raise RuntimeError("Thinking Box 모듈을 불러올 수 없습니다")
+            _analysis_pipeline = ThinkingBoxNotion(notion=sync_notion_client)
+        return _analysis_pipeline
+
+
+def get_stt():
+    """STT 인스턴스 (공유 STT 서비스가 떠 있으면 소켓 클라이언트, 아니면 모델 풀)"""
+    global _stt
+    with _analysis_lock:
+        if _stt is None:
+            from stt import STTClient, STTModelPool
+            
+            socket_path = os.getenv("THINKING_BOX_STT_SOCKET")
+            if socket_path and STTClient.is_available(socket_path):
+                _stt = STTClient(socket_path)
+            else:
+                # 모델은 첫 전사 때 로딩되고, 유휴 상태가 길어지면 해제됨
+                _stt = STTModelPool(
+                    memory_budget_mb=int(os.getenv("THINKING_BOX_STT_MEMORY_MB", "1200")),
+                    idle_timeout=float(os.getenv("THINKING_BOX_STT_IDLE_TIMEOUT", "600"))
+                ).model(os.getenv("THINKING_BOX_STT_MODEL", "base"))
+        return _stt
+
+
+def save_analysis(notion_data: Dict[str, Any], history_id: int) -> Dict[str, Any]:
+    """
+    분석 결과를 Notion에 저장 (실패하면 outbox에 넣어 나중에 재시도)
+    
+    속성 검사 실패(ValueError)는 재시도해도 같으므로 대기열에 넣지 않습니다.
+    """
+    pipeline = get_analysis_pipeline()
+    try:
+        result = sync_notion_client.save_thinking_result(notion_data)
+    except ValueError:
+        raise
+    except Exception as e:
+        outbox_id = outbox.enqueue(notion_data, meta={"history_id": history_id})
+        return {"success": False, "queued": True, "outbox_id": outbox_id, "error": str(e)}
+    
+    pipeline.history.set_notion_page(history_id, result["page_id"], result["page_url"])
+    return result
+
+
+def analysis_job(
+    job,
+    session_id: str,
+    transcript: Optional[str] = None,
+    audio_path: Optional[str] = None,
+    language: Optional[str] = None,
+    save: bool = True
+) -> Dict[str, Any]:
+    """백그라운드 분석 작업: (STT) → 3-agent → Notion 저장, 단계별 소요 시간은 job.timings"""
+    if audio_path is not None:
+        try:
+            with job.stage("stt", 0.02, "🎙️ 음성을 텍스트로 변환 중..."):
+                transcript = get_stt().transcribe(audio_path, language=language)
+        finally:
+            os.unlink(audio_path)
+    if not transcript or not transcript.strip():
+        raise ValueError("분석할 텍스트가 비어 있습니다")
+    
+    pipeline = get_analysis_pipeline()
+    analysis = pipeline.analyze(transcript, job=job, source="http")
+    result = {
+        "session_id": session_id,
+        "transcript": transcript if audio_path is not None else None,
+        "history_id": analysis["history_id"],
+        "thinking_results": analysis["thinking_results"],
+        "notion_result": None
+    }
+    
+    if save:
+        notion_data = pipeline.convert_to_notion_format(session_id, analysis["thinking_results"])
+        with job.stage("notion", 0.9, "💾 Notion에 저장 중..."):
+            result["notion_result"] = save_analysis(notion_data, analysis["history_id"])
+    return result
+
+
+def _save_upload(upload: UploadFile) -> str:
+    """업로드된 음성을 임시 파일로 저장 (STT는 파일 경로를 받음, 작업이 끝나면 삭제)"""
+    suffix = Path(upload.filename or "").suffix or ".wav"
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, prefix="thinking_box_") as f:
+        shutil.copyfileobj(upload.file, f)
+        return f.name
+
+
+@app.post(
+    "/analyze",
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        202: {"description": "분석 작업이 대기열에 추가됨 (GET /jobs/{job_id}로 조회)"},
+        400: {"model": ErrorResponse, "description": "transcript 또는 audio가 없음"},
+        503: {"model": ErrorResponse, "description": "대기 작업이 너무 많음 / 파이프라인 초기화 실패"}
+    }
+)
+async def analyze(request: Request):
+    """
+    회의록(텍스트) 또는 음성 파일 분석 작업 시작
+    
+    - JSON: `{"transcript": "...", "session_id": "...", "save": true}`
+    - multipart/form-data: `audio` 파일(또는 `transcript`), `session_id`, `language`, `save`
+    
+    바로 202와 job ID를 반환하고, 워커가 STT → 3-agent → Notion 저장을 실행합니다.
+    진행 상태와 단계별 소요 시간, 결과는 `GET /jobs/{job_id}`로 조회합니다.
+    """
+    if request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            fields = await request.json()
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"잘못된 JSON: {str(e)}")
+        if not isinstance(fields, dict):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="JSON 객체여야 합니다")
+        audio = None
+    else:
+        form = await request.form()
+        fields = dict(form)
+        audio = form.get("audio")
+    
+    transcript = fields.get("transcript")
+    if not isinstance(audio, UploadFile):
+        audio = None
+    if audio is None and not (isinstance(transcript, str) and transcript.strip()):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="transcript(텍스트) 또는 audio(파일) 중 하나가 필요합니다"
+        )
+    
+    if analysis_runner.stats()[PENDING] >= ANALYZE_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"대기 중인 분석 작업이 너무 많습니다 ({ANALYZE_MAX_PENDING}개)",
+            headers={"Retry-After": "30"}
+        )
+    
+    try:
+        # 모듈 로딩/클라이언트 생성은 첫 요청 한 번만 (이후에는 즉시 반환)
+        await asyncio.to_thread(get_analysis_pipeline)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"분석 파이프라인 초기화 실패: {str(e)}"
+        )
+    
+    save = fields.get("save", True)
+    if isinstance(save, str):
+        save = save.lower() not in ("0", "false", "no")
+    
+    job = analysis_runner.submit(
+        analysis_job,
+        session_id=str(fields.get("session_id") or uuid.uuid4()),
+        transcript=None if audio is not None else transcript,
+        audio_path=await asyncio.to_thread(_save_upload, audio) if audio is not None else None,
+        language=fields.get("language") or None,
+        save=bool(save),
+        name="analyze"
+    )
+    
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={**job.to_dict(), "status_url": f"/jobs/{job.id}"},
+        headers={"Location": f"/jobs/{job.id}"}
+    )
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    분석 작업 상태 (status, progress, message, 단계별 timings, 끝났으면 result)
+    """
+    job = analysis_runner.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="작업을 찾을 수 없습니다 (보관 기간이 지났거나 잘못된 ID)"
+        )
+    return {**job.to_dict(), "result": job.result if job.finished else None}
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """HTTP 예외 핸들러"""
@@ -174,7 +679,8 @@ async def http_exception_handler(request, exc):
             "success": False,
             "error": exc.detail,
             "timestamp": datetime.now().isoformat()
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -9,7 +9,7 @@ import json
 import uuid
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 # Thinking Box 모듈 임포트 (원본 프로젝트에서)
@@ -19,6 +19,9 @@ try:
     from agents.input_agent import InputAgent
     from agents.idea_agent import IdeaAgent
     from agents.planning_agent import PlanningAgent
+    from core.history import HistoryStore
+    from core.jobs import Job
+    from core.result_cache import input_hash
 except ImportError:
     print("❌ Thinking Box 모듈을 찾을 수 없습니다.")
     print("thinking_box 폴더가 동일한 위치에 있는지 확인하세요.")
@@ -26,6 +29,8 @@ except ImportError:
 
 # MCP 서버 모듈 임포트
 from notion_storage import NotionStorage
+from outbox import NotionOutbox
+from notion_blocks import analysis_markdown
 
 # 환경 변수 로드 (.env)
 load_dotenv()
@@ -38,16 +43,34 @@ class ThinkingBoxNotion:
     회의록 → 3-agent 처리 → Notion 자동 저장
     """
     
-    def __init__(self):
-        """초기화"""
+    def __init__(self, use_outbox: bool = False, notion: Optional[NotionStorage] = None):
+        """
+        초기화
+        
+        Args:
+            use_outbox: True면 Notion 저장을 로컬 대기열(outbox)에 넣고 바로 반환
+                        (백그라운드 flusher가 속도 제한/재시도를 지키며 저장)
+            notion: 사용할 Notion 클라이언트 (기본: 새 NotionStorage, http_server는 공유 클라이언트 전달)
+        """
         # Thinking Box 에이전트
         self.llm = LLMClient()
         self.input_agent = InputAgent(self.llm)
         self.idea_agent = IdeaAgent(self.llm)
         self.planning_agent = PlanningAgent(self.llm)
         
-        # Notion 클라이언트
-        self.notion = NotionStorage()
+        # Notion 클라이언트 (outbox 재전송이 중복 페이지를 만들지 않도록 outbox 사용 시 upsert)
+        self.notion = notion or NotionStorage(upsert=True if use_outbox else None)
+        
+        # 로컬 분석 기록 (SQLite)
+        self.history = HistoryStore()
+        
+        # Notion 저장 대기열 (write-behind)
+        self.outbox = None
+        if use_outbox:
+            self.outbox = NotionOutbox(
+                lambda: self.notion,
+                on_saved=self._link_history
+            ).start()
         
         print("✅ Thinking Box + Notion 통합 시스템 초기화 완료")
     
@@ -75,25 +98,13 @@ class ThinkingBoxNotion:
         
         # ===== 1단계: Thinking Box 처리 =====
         print("📝 1단계: Thinking Box 에이전트 실행 중...\n")
-        
-        # Agent 1: 입력 정제
-        cleaned = self.input_agent.process(raw_input)
-        
-        # Agent 2: 아이디어 추출
-        ideas = self.idea_agent.process(cleaned)
-        
-        # Agent 3: 계획 구조화
-        plan = self.planning_agent.process(ideas)
-        
-        thinking_results = {
-            'cleaned_conversation': cleaned,
-            'ranked_ideas': ideas,
-            'planning_document': plan
-        }
+        analysis = self.analyze(raw_input)
+        thinking_results = analysis['thinking_results']
+        history_id = analysis['history_id']
         
         # ===== 2단계: JSON 포맷 변환 =====
         print("🔄 2단계: Notion 포맷으로 변환 중...\n")
-        notion_data = self._convert_to_notion_format(
+        notion_data = self.convert_to_notion_format(
             session_id=session_id,
             thinking_results=thinking_results
         )
@@ -106,12 +117,27 @@ class ThinkingBoxNotion:
         print()
         
         # ===== 3단계: Notion 저장 =====
-        print("💾 3단계: Notion Database에 저장 중...\n")
-        notion_result = self.notion.save_thinking_result(notion_data)
-        
-        print(f"✅ Notion 저장 완료!")
-        print(f"📄 페이지 URL: {notion_result['page_url']}")
-        print()
+        if self.outbox is not None:
+            outbox_id = self.outbox.enqueue(notion_data, meta={'history_id': history_id})
+            notion_result = {
+                'success': True,
+                'queued': True,
+                'outbox_id': outbox_id,
+                'page_id': None,
+                'page_url': None
+            }
+            print(f"📤 3단계: Notion 저장 대기열에 추가 (outbox #{outbox_id})\n")
+        else:
+            print("💾 3단계: Notion Database에 저장 중...\n")
+            notion_result = self.notion.save_thinking_result(notion_data)
+            
+            print(f"✅ Notion 저장 완료!")
+            print(f"📄 페이지 URL: {notion_result['page_url']}")
+            print()
+            
+            self.history.set_notion_page(
+                history_id, notion_result['page_id'], notion_result['page_url']
+            )
         
         print("=" * 70)
         print("✅ 전체 파이프라인 완료!")
@@ -120,10 +146,70 @@ class ThinkingBoxNotion:
         return {
             'thinking_results': thinking_results,
             'notion_data': notion_data,
-            'notion_result': notion_result
+            'notion_result': notion_result,
+            'history_id': history_id,
+            'timings': analysis['timings']
+        }
+    
+    def analyze(self, raw_input: str, job: Optional[Job] = None, source: str = "integrated") -> Dict[str, Any]:
+        """
+        3-agent 분석만 실행하고 분석 기록에 저장 (Notion 저장 전 단계)
+        
+        Args:
+            raw_input: 원본 회의록/대화 텍스트
+            job: 진행률/단계별 소요 시간을 보고할 Job (http_server /analyze 작업)
+            source: 분석 기록의 출처 표시
+            
+        Returns:
+            {'thinking_results': {...}, 'history_id': int, 'timings': {단계: 초}}
+        """
+        # 단독 실행 시에도 단계별 소요 시간 기록용으로 사용
+        job = job or Job("analyze")
+        
+        # Agent 1: 입력 정제
+        with job.stage("input", 0.1, "🔍 1/3: 입력 정제 중..."):
+            cleaned = self.input_agent.process(raw_input)
+        
+        # Agent 2: 아이디어 추출
+        with job.stage("ideas", 0.4, "💡 2/3: 아이디어 추출 중..."):
+            ideas = self.idea_agent.process(cleaned)
+        
+        # Agent 3: 계획 구조화
+        with job.stage("planning", 0.75, "📋 3/3: 계획 구조화 중..."):
+            plan = self.planning_agent.process(ideas)
+        
+        thinking_results = {
+            'cleaned_conversation': cleaned,
+            'ranked_ideas': ideas,
+            'planning_document': plan
         }
+        timings = {name: job.timings[name] for name in ("input", "ideas", "planning")}
+        
+        # Notion 저장이 실패해도 분석 결과는 남도록 먼저 기록
+        history_id = self.history.record(
+            raw_input,
+            thinking_results,
+            input_hash=input_hash(raw_input),
+            timings=timings,
+            model=self.llm.model,
+            source=source
+        )
+        
+        return {
+            'thinking_results': thinking_results,
+            'history_id': history_id,
+            'timings': timings
+        }
+    
+    def _link_history(self, entry: Dict[str, Any], notion_result: Dict[str, Any]):
+        """outbox 저장 완료 시 분석 기록에 Notion 페이지 연결"""
+        history_id = entry['meta'].get('history_id')
+        if history_id is not None:
+            self.history.set_notion_page(
+                history_id, notion_result['page_id'], notion_result['page_url']
+            )
     
-    def _convert_to_notion_format(self, session_id: str, thinking_results: Dict[str, Any]) -> Dict[str, Any]:
+    def convert_to_notion_format(self, session_id: str, thinking_results: Dict[str, Any]) -> Dict[str, Any]:
         """
         Thinking Box 출력을 Notion 포맷으로 변환
         
@@ -159,7 +245,11 @@ class ThinkingBoxNotion:
             "summary": summary,
             "key_points": key_points,
             "tasks": tasks,
-            "confidence": confidence
+            "confidence": confidence,
+            # 속성은 2000자에서 잘리므로 3단계 전체 출력은 페이지 본문 블록으로 저장
+            "content": analysis_markdown(
+                thinking_results['cleaned_conversation'], ideas, plan
+            )
         }
     
     def _extract_title(self, plan: str) -> str:
@@ -273,10 +363,16 @@ class ThinkingBoxNotion:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = f"thinking_box_output_{timestamp}.md"
         
+        notion_result = results['notion_result']
+        if notion_result.get('queued'):
+            page_url = f"(저장 대기 중 - outbox #{notion_result['outbox_id']})"
+        else:
+            page_url = notion_result['page_url']
+        
         content = f"""# Thinking Box + Notion 통합 결과
 생성 시간: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 세션 ID: {results['notion_data']['session_id']}
-Notion 페이지: {results['notion_result']['page_url']}
+Notion 페이지: {page_url}
 
 ---
 
@@ -299,7 +395,7 @@ Notion 페이지: {results['notion_result']['page_url']}
 - 제목: {results['notion_data']['title']}
 - 단계: {results['notion_data']['idea_stage']}
 - 신뢰도: {results['notion_data']['confidence']}
-- 페이지 ID: {results['notion_result']['page_id']}
+- 페이지 ID: {notion_result['page_id'] or '-'}
 """
         
         Path(output_path).write_text(content, encoding='utf-8')
@@ -314,6 +410,10 @@ def main():
     parser.add_argument("--input", "-i", help="입력 파일 경로")
     parser.add_argument("--output", "-o", help="로컬 백업 파일 경로 (선택)")
     parser.add_argument("--session-id", "-s", help="세션 ID (선택)")
+    parser.add_argument("--outbox", action="store_true",
+                        help="Notion 저장을 대기열에 넣고 종료 전까지 백그라운드로 전송")
+    parser.add_argument("--flush-timeout", type=float, default=30,
+                        help="--outbox 사용 시 종료 전 전송 대기 시간 (초)")
     args = parser.parse_args()
     
     # 입력 읽기
@@ -335,17 +435,27 @@ def main():
         raw_input = "\n".join(lines)
     
     # 통합 시스템 실행
-    system = ThinkingBoxNotion()
+    system = ThinkingBoxNotion(use_outbox=args.outbox)
     results = system.process_and_save(raw_input, session_id=args.session_id)
     
-    # 로컬 백업 저장
+    # 로컬 백업 저장 (Notion 전송과 병행)
     system.save_local_output(results, output_path=args.output)
     
+    if args.outbox:
+        # 남은 항목은 다음 실행이나 http_server flusher가 이어서 저장
+        system.outbox.flush(timeout=args.flush_timeout)
+        entry = system.outbox.get(results['notion_result']['outbox_id'])
+        results['notion_result'].update(page_id=entry['page_id'], page_url=entry['page_url'])
+    
     # 최종 결과 출력
     print("\n" + "=" * 70)
     print("📊 최종 결과")
     print("=" * 70)
-    print(f"✅ Notion 페이지: {results['notion_result']['page_url']}")
+    if results['notion_result']['page_url']:
+        print(f"✅ Notion 페이지: {results['notion_result']['page_url']}")
+    else:
+        print(f"📤 Notion 저장 대기 중: outbox #{results['notion_result']['outbox_id']} "
+              f"(python outbox.py status 로 확인)")
     print(f"📄 로컬 백업: {args.output if args.output else '저장 안 함'}")
     print()
 
@@ -12,6 +12,8 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from async_notion_storage import AsyncNotionStorage
+from notion_mirror import NotionMirror
 from notion_storage import NotionStorage
 
 
@@ -21,12 +23,22 @@ app = Server("thinking-box-mcp")
 # Notion 클라이언트 (전역)
 notion_client = None
 
+# 로컬 미러 (조회 도구용)
+notion_mirror = None
+
 
 def initialize_notion():
     """Notion 클라이언트 초기화"""
     global notion_client
     if notion_client is None:
-        notion_client = NotionStorage()
+        notion_client = AsyncNotionStorage()
+
+
+def initialize_mirror():
+    """로컬 미러 초기화 (동기화는 별도 스레드에서 동기 클라이언트로)"""
+    global notion_mirror
+    if notion_mirror is None:
+        notion_mirror = NotionMirror(NotionStorage())
 
 
 @app.list_tools()
@@ -50,7 +62,8 @@ async def list_tools() -> list[Tool]:
                 "tasks": [
                     {"owner": "담당자", "task": "작업 내용"}
                 ],
-                "confidence": 0.87
+                "confidence": 0.87,
+                "content": "# 구조화된 계획 ... (선택: 페이지 본문 마크다운)"
             }
             """,
             inputSchema={
@@ -94,10 +107,60 @@ async def list_tools() -> list[Tool]:
                         "minimum": 0,
                         "maximum": 1,
                         "description": "신뢰도 (0~1)"
+                    },
+                    "content": {
+                        "type": "string",
+                        "description": "페이지 본문으로 저장할 전체 분석 (마크다운, 선택)"
                     }
                 },
                 "required": ["title", "summary"]
             }
+        ),
+        Tool(
+            name="query_thinking_results",
+            description="""
+            저장된 Thinking Box 결과를 단계/신뢰도/날짜/키워드로 조회합니다.
+            Notion API 대신 로컬 미러(SQLite)에서 바로 조회하며,
+            sync=true면 조회 전에 Notion 변경분을 먼저 가져옵니다.
+            """,
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "stage": {
+                        "type": "string",
+                        "enum": ["발산", "수렴"],
+                        "description": "아이디어 단계"
+                    },
+                    "min_confidence": {
+                        "type": "number",
+                        "minimum": 0,
+                        "maximum": 1,
+                        "description": "최소 신뢰도"
+                    },
+                    "since": {
+                        "type": "string",
+                        "description": "생성일 시작 (YYYY-MM-DD)"
+                    },
+                    "until": {
+                        "type": "string",
+                        "description": "생성일 끝 (YYYY-MM-DD, 포함)"
+                    },
+                    "text": {
+                        "type": "string",
+                        "description": "제목/요약/작업 검색어"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": 200,
+                        "description": "최대 결과 수 (기본 20)"
+                    },
+                    "sync": {
+                        "type": "boolean",
+                        "description": "조회 전에 Notion 증분 동기화"
+                    }
+                }
+            }
         )
     ]
 
@@ -107,6 +170,8 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """
     도구 실행
     """
+    if name == "query_thinking_results":
+        return await query_thinking_results(arguments or {})
     if name != "save_thinking_result":
         raise ValueError(f"알 수 없는 도구: {name}")
     
@@ -115,7 +180,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         initialize_notion()
         
         # Notion에 저장
-        result = notion_client.save_thinking_result(arguments)
+        result = await notion_client.save_thinking_result(arguments)
         
         # 성공 메시지 반환
         return [
@@ -144,6 +209,41 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         ]
 
 
+async def query_thinking_results(arguments: dict) -> list[TextContent]:
+    """
+    로컬 미러 조회 (sync=true면 먼저 증분 동기화)
+    """
+    try:
+        initialize_mirror()
+        sync_note = ""
+        if arguments.get("sync"):
+            result = await asyncio.to_thread(notion_mirror.sync)
+            sync_note = f"🔄 {result['fetched']}개 페이지 동기화 ({result['requests']}회 요청)\n\n"
+        
+        pages = notion_mirror.query(
+            stage=arguments.get("stage"),
+            min_confidence=arguments.get("min_confidence"),
+            since=arguments.get("since"),
+            until=arguments.get("until"),
+            text=arguments.get("text"),
+            limit=arguments.get("limit", 20)
+        )
+        return [
+            TextContent(
+                type="text",
+                text=sync_note + f"📚 {len(pages)}건\n\n" + json.dumps(pages, ensure_ascii=False, indent=2)
+            )
+        ]
+    
+    except Exception as e:
+        return [
+            TextContent(
+                type="text",
+                text=f"❌ 조회 실패: {str(e)}"
+            )
+        ]
+
+
 async def main():
     """
     MCP 서버 실행
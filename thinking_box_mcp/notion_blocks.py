@@ -0,0 +1,222 @@
+"""
+Markdown → Notion blocks
+
+Thinking Box 3단계 출력(마크다운)을 Notion 페이지 본문 블록으로 변환합니다.
+- rich text는 Notion 제한(2000자)에 맞춰 분할
+- 블록은 요청당 100개, 요청 본문 크기 제한 안에서 batch로 묶음
+- 본문 갱신은 기존 블록과 비교해 바뀐 구간만 삭제/추가
+
+지원 문법: 제목(#/##/###), 글머리 목록(- * +), 번호 목록, 체크박스(- [ ] / - [x]),
+인용(>), 코드 블록(```), 구분선(---), 굵게(**), 인라인 코드(`).
+중첩 목록은 들여쓰기 없이 평평하게 변환합니다 (중첩 children은 요청 수가 늘어남).
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import re
+
+
+MAX_TEXT_LENGTH = 2000
+MAX_BLOCKS_PER_REQUEST = 100
+# Notion 요청 본문 한도(500KB)보다 여유 있게 - 한국어는 UTF-8로 글자당 3바이트
+MAX_REQUEST_BYTES = 400_000
+# 블록 1개가 혼자서 요청 크기 한도를 넘지 않도록 (Notion 자체 제한은 100개)
+MAX_RICH_TEXT_ITEMS = 50
+
+INLINE_PATTERN = re.compile(r"(\*\*[^*]+\*\*|`[^`]+`)")
+NUMBERED_PATTERN = re.compile(r"^\d+[.)]\s+")
+TODO_PATTERN = re.compile(r"^[-*+]\s+\[([ xX])\]\s*")
+BULLET_PATTERN = re.compile(r"^[-*+]\s+")
+
+
+def rich_text(text: str) -> List[Dict[str, Any]]:
+    """
+    인라인 마크다운(**굵게**, `코드`) → rich text 배열, 각 항목은 2000자 이하
+    """
+    items = []
+    for part in INLINE_PATTERN.split(text):
+        if not part:
+            continue
+        annotations = None
+        if part.startswith("**") and part.endswith("**") and len(part) > 4:
+            part, annotations = part[2:-2], {"bold": True}
+        elif part.startswith("`") and part.endswith("`") and len(part) > 2:
+            part, annotations = part[1:-1], {"code": True}
+
+        for start in range(0, len(part), MAX_TEXT_LENGTH):
+            item = {"type": "text", "text": {"content": part[start:start + MAX_TEXT_LENGTH]}}
+            if annotations:
+                item["annotations"] = annotations
+            items.append(item)
+    return items
+
+
+def _plain_rich_text(text: str) -> List[Dict[str, Any]]:
+    """인라인 문법 해석 없이 2000자 단위로 분할 (코드 블록용)"""
+    return [
+        {"type": "text", "text": {"content": text[start:start + MAX_TEXT_LENGTH]}}
+        for start in range(0, len(text), MAX_TEXT_LENGTH)
+    ] or [{"type": "text", "text": {"content": ""}}]
+
+
+def _blocks(kind: str, text: str, **extra) -> List[Dict[str, Any]]:
+    """텍스트 블록 1개 (rich text 항목이 많으면 같은 종류의 블록 여러 개로 나눔)"""
+    items = rich_text(text)
+    return [
+        {"object": "block", "type": kind, kind: {"rich_text": items[start:start + MAX_RICH_TEXT_ITEMS], **extra}}
+        for start in range(0, max(len(items), 1), MAX_RICH_TEXT_ITEMS)
+    ]
+
+
+def _code_blocks(code: str, language: str) -> List[Dict[str, Any]]:
+    items = _plain_rich_text(code)
+    return [
+        {"object": "block", "type": "code",
+         "code": {"rich_text": items[start:start + MAX_RICH_TEXT_ITEMS], "language": language}}
+        for start in range(0, len(items), MAX_RICH_TEXT_ITEMS)
+    ]
+
+
+def markdown_to_blocks(markdown: str) -> List[Dict[str, Any]]:
+    """
+    마크다운 문서 → Notion 블록 목록
+
+    연속된 일반 텍스트 줄은 문단 하나로 합치고, 빈 줄에서 문단을 나눕니다.
+    """
+    blocks: List[Dict[str, Any]] = []
+    paragraph: List[str] = []
+    code_lines: List[str] = []
+    code_language = None
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.extend(_blocks("paragraph", "\n".join(paragraph)))
+            paragraph.clear()
+
+    for raw_line in markdown.splitlines():
+        # 코드 블록 안에서는 줄을 그대로 모음
+        if code_language is not None:
+            if raw_line.strip().startswith("```"):
+                blocks.extend(_code_blocks("\n".join(code_lines), code_language))
+                code_lines, code_language = [], None
+            else:
+                code_lines.append(raw_line)
+            continue
+
+        line = raw_line.strip()
+        if line.startswith("```"):
+            flush_paragraph()
+            code_language = line[3:].strip() or "plain text"
+            continue
+        if not line:
+            flush_paragraph()
+            continue
+        if line.startswith("#"):
+            flush_paragraph()
+            level = min(len(line) - len(line.lstrip("#")), 3)
+            blocks.extend(_blocks(f"heading_{level}", line.lstrip("#").strip()))
+        elif line in ("---", "***", "___"):
+            flush_paragraph()
+            blocks.append({"object": "block", "type": "divider", "divider": {}})
+        elif TODO_PATTERN.match(line):
+            flush_paragraph()
+            checked = TODO_PATTERN.match(line).group(1).lower() == "x"
+            blocks.extend(_blocks("to_do", TODO_PATTERN.sub("", line), checked=checked))
+        elif BULLET_PATTERN.match(line):
+            flush_paragraph()
+            blocks.extend(_blocks("bulleted_list_item", BULLET_PATTERN.sub("", line)))
+        elif NUMBERED_PATTERN.match(line):
+            flush_paragraph()
+            blocks.extend(_blocks("numbered_list_item", NUMBERED_PATTERN.sub("", line)))
+        elif line.startswith(">"):
+            flush_paragraph()
+            blocks.extend(_blocks("quote", line.lstrip(">").strip()))
+        else:
+            paragraph.append(line)
+
+    flush_paragraph()
+    if code_language is not None:
+        # 닫히지 않은 코드 블록
+        blocks.extend(_code_blocks("\n".join(code_lines), code_language))
+    return blocks
+
+
+def batch_blocks(
+    blocks: List[Dict[str, Any]],
+    max_blocks: int = MAX_BLOCKS_PER_REQUEST,
+    max_bytes: int = MAX_REQUEST_BYTES
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    블록을 요청 1회 분량으로 묶음 (개수 max_blocks, 직렬화 크기 max_bytes 이하)
+    """
+    batch: List[Dict[str, Any]] = []
+    size = 0
+    for block in blocks:
+        block_size = len(json.dumps(block, ensure_ascii=False).encode("utf-8"))
+        if batch and (len(batch) >= max_blocks or size + block_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+        batch.append(block)
+        size += block_size
+    if batch:
+        yield batch
+
+
+def block_key(block: Dict[str, Any]) -> str:
+    """
+    블록 비교 키 (종류 + 텍스트/서식 + checked/language)
+
+    요청 포맷(markdown_to_blocks)과 blocks.children.list 응답 포맷을 같은 키로 맞춤
+    """
+    kind = block.get("type")
+    content = block.get(kind) or {}
+    items = [
+        [
+            (item.get("text") or {}).get("content", item.get("plain_text", "")),
+            sorted(name for name, value in (item.get("annotations") or {}).items() if value is True)
+        ]
+        for item in content.get("rich_text") or []
+    ]
+    extra = {name: content[name] for name in ("checked", "language") if name in content}
+    return json.dumps([kind, items, extra], ensure_ascii=False, sort_keys=True)
+
+
+def diff_blocks(
+    existing: List[Dict[str, Any]],
+    blocks: List[Dict[str, Any]]
+) -> Tuple[List[str], List[Dict[str, Any]], Optional[str]]:
+    """
+    기존 본문 → 새 본문으로 바꾸는 최소 변경 (같은 앞부분/뒷부분은 유지)
+
+    Args:
+        existing: blocks.children.list 결과 (id 포함)
+        blocks: 새 본문 블록
+
+    Returns:
+        (삭제할 블록 ID, 넣을 블록, 넣을 위치 - 이 블록 ID 뒤, None이면 맨 끝)
+        뒤에 덧붙이기만 했으면 삭제 없이 새 블록만 append
+    """
+    old = [block_key(block) for block in existing]
+    new = [block_key(block) for block in blocks]
+
+    prefix = 0
+    while prefix < min(len(old), len(new)) and old[prefix] == new[prefix]:
+        prefix += 1
+    # Notion은 맨 앞에 끼워 넣을 수 없으므로 유지할 앞부분이 있을 때만 뒷부분도 유지
+    suffix = 0
+    if prefix:
+        while suffix < min(len(old), len(new)) - prefix and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+
+    delete_ids = [block["id"] for block in existing[prefix:len(existing) - suffix]]
+    insert = blocks[prefix:len(blocks) - suffix]
+    after = existing[prefix - 1]["id"] if suffix else None
+    return delete_ids, insert, after
+
+
+def analysis_markdown(cleaned: str, ideas: str, plan: str) -> str:
+    """3단계 출력 → 페이지 본문용 마크다운 (계획 → 아이디어 → 정제된 대화 순)"""
+    return "\n\n".join([
+        "# 구조화된 계획", plan or "",
+        "# 순위화된 아이디어", ideas or "",
+        "# 정제된 대화", cleaned or "",
+    ])
@@ -0,0 +1,381 @@
+"""
+Incremental local mirror of the Notion database
+
+Notion DB의 Thinking Box 페이지를 last_edited_time 커서 + 페이지네이션으로 증분 동기화해
+로컬 SQLite에 복제합니다. 단계/신뢰도/날짜 조회는 Notion API 대신 인덱스된 로컬 DB에서
+밀리초 단위로 처리합니다 (대시보드, MCP 서버 query_thinking_results 도구).
+
+사용법:
+    python notion_mirror.py sync                 # 마지막 동기화 이후 변경분만
+    python notion_mirror.py sync --full          # 전체 다시 받기 (삭제된 페이지 정리)
+    python notion_mirror.py query --stage 수렴 --min-confidence 0.8 --since 2025-01-01
+    python notion_mirror.py status
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+try:
+    from .notion_storage import plain_property_value
+    from .sqlite_util import connect
+except ImportError:
+    from notion_storage import plain_property_value
+    from sqlite_util import connect
+
+
+DEFAULT_MIRROR_PATH = os.getenv(
+    "NOTION_MIRROR_DB",
+    str(Path.home() / ".thinking_box" / "notion_mirror.db")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page_id TEXT PRIMARY KEY,
+    database_id TEXT NOT NULL,
+    session_id TEXT,
+    title TEXT,
+    idea_stage TEXT,
+    summary TEXT,
+    key_points TEXT,
+    tasks TEXT,
+    confidence REAL,
+    created_at TEXT,
+    last_edited_time TEXT NOT NULL,
+    url TEXT,
+    properties TEXT NOT NULL,
+    sync_id INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS pages_stage ON pages(database_id, idea_stage, created_at);
+CREATE INDEX IF NOT EXISTS pages_confidence ON pages(database_id, confidence);
+CREATE INDEX IF NOT EXISTS pages_created_at ON pages(database_id, created_at);
+CREATE INDEX IF NOT EXISTS pages_session ON pages(session_id);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    database_id TEXT PRIMARY KEY,
+    cursor TEXT,
+    last_sync_at TEXT,
+    sync_id INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# 목록 조회 컬럼 (원본 properties JSON 제외)
+LIST_COLUMNS = (
+    "page_id, session_id, title, idea_stage, summary, key_points, tasks, "
+    "confidence, created_at, last_edited_time, url"
+)
+
+# Notion DB 속성 이름 → 미러 컬럼
+PROPERTY_COLUMNS = {
+    "Session ID": "session_id",
+    "Title": "title",
+    "Idea Stage": "idea_stage",
+    "Summary": "summary",
+    "Key Points": "key_points",
+    "Tasks": "tasks",
+    "Confidence": "confidence",
+    "Created At": "created_at",
+}
+
+
+def page_row(page: Dict[str, Any], database_id: str) -> Dict[str, Any]:
+    """databases.query 결과 페이지 1개 → 미러 행"""
+    values = {
+        name: plain_property_value(prop)
+        for name, prop in page.get("properties", {}).items()
+    }
+    row = {column: values.get(name) for name, column in PROPERTY_COLUMNS.items()}
+    row["key_points"] = json.dumps(row["key_points"] or [], ensure_ascii=False)
+    # Created At 속성이 없으면 Notion 생성 시각
+    row["created_at"] = row["created_at"] or page.get("created_time")
+    row.update(
+        page_id=page["id"],
+        database_id=database_id,
+        last_edited_time=page["last_edited_time"],
+        url=page.get("url"),
+        properties=json.dumps(values, ensure_ascii=False),
+    )
+    return row
+
+
+class NotionMirror:
+    """
+    Notion DB → 로컬 SQLite 증분 복제
+
+    - 커서: 지금까지 본 가장 늦은 last_edited_time
+    - Notion의 last_edited_time은 분 단위이므로 커서 '이후 포함(on_or_after)'으로 조회하고
+      page_id 기준 upsert로 중복을 흡수
+    - 결과 페이지(100개)마다 커밋하고 커서를 옮겨, 중간에 끊겨도 다음 sync가 이어서 진행
+    """
+
+    def __init__(self, storage=None, path: str = DEFAULT_MIRROR_PATH, database_id: Optional[str] = None):
+        """
+        Args:
+            storage: NotionStorage (sync에만 필요 - 조회만 할 때는 None)
+            path: SQLite 파일 경로
+            database_id: 미러링할 DB (기본: storage.database_id 또는 NOTION_DATABASE_ID)
+        """
+        self.storage = storage
+        self.path = path
+        self.database_id = database_id or getattr(storage, "database_id", None) or os.getenv("NOTION_DATABASE_ID")
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def sync(self, full: bool = False, page_size: int = 100) -> Dict[str, Any]:
+        """
+        변경된 페이지 가져오기
+
+        Args:
+            full: 커서를 무시하고 전체 동기화 + Notion에서 사라진(삭제/보관) 페이지 정리
+            page_size: 요청당 페이지 수 (최대 100)
+
+        Returns:
+            {"fetched": 받은 페이지 수, "requests": API 요청 수, "deleted": 정리된 수, "cursor": ..., "seconds": ...}
+        """
+        if self.storage is None:
+            raise ValueError("sync에는 NotionStorage가 필요합니다")
+
+        start = time.perf_counter()
+        state = self._state()
+        sync_id = state["sync_id"] + 1
+        cursor = None if full else state["cursor"]
+
+        query = {
+            "database_id": self.database_id,
+            "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
+            "page_size": page_size,
+        }
+        if cursor:
+            query["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": cursor}}
+
+        fetched = requests = 0
+        start_cursor = None
+        while True:
+            kwargs = {"start_cursor": start_cursor} if start_cursor else {}
+            response = self.storage.query_database(**query, **kwargs)
+            requests += 1
+
+            rows = [page_row(page, self.database_id) for page in response.get("results", [])]
+            if rows:
+                cursor = max([cursor or ""] + [row["last_edited_time"] for row in rows])
+                self._upsert(rows, sync_id, cursor)
+                fetched += len(rows)
+
+            if not response.get("has_more"):
+                break
+            start_cursor = response.get("next_cursor")
+
+        deleted = 0
+        with self._connect() as conn:
+            if full:
+                # 전체 동기화에서 보이지 않은 페이지 = Notion에서 삭제/보관됨
+                deleted = conn.execute(
+                    "DELETE FROM pages WHERE database_id = ? AND sync_id != ?",
+                    (self.database_id, sync_id)
+                ).rowcount
+            conn.execute(
+                """
+                INSERT INTO sync_state (database_id, cursor, last_sync_at, sync_id) VALUES (?, ?, ?, ?)
+                ON CONFLICT (database_id) DO UPDATE SET
+                    cursor = excluded.cursor, last_sync_at = excluded.last_sync_at, sync_id = excluded.sync_id
+                """,
+                (self.database_id, cursor, datetime.now(timezone.utc).isoformat(timespec="seconds"), sync_id)
+            )
+
+        return {
+            "fetched": fetched,
+            "requests": requests,
+            "deleted": deleted,
+            "cursor": cursor,
+            "seconds": round(time.perf_counter() - start, 2),
+        }
+
+    def query(
+        self,
+        stage: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        text: Optional[str] = None,
+        session_id: Optional[str] = None,
+        limit: int = 50,
+        order: str = "created_at"
+    ) -> List[Dict[str, Any]]:
+        """
+        로컬 미러 조회 (최신순)
+
+        Args:
+            stage: 아이디어 단계 (발산 / 수렴)
+            min_confidence, max_confidence: 신뢰도 범위
+            since, until: 생성일 범위 (ISO 날짜, until은 그 날짜 포함)
+            text: 제목/요약/작업 부분 일치
+            session_id: 세션 ID
+            limit: 최대 결과 수
+            order: 정렬 기준 (created_at / confidence / last_edited_time, 내림차순)
+        """
+        if order not in ("created_at", "confidence", "last_edited_time"):
+            raise ValueError(f"지원하지 않는 정렬 기준: {order}")
+
+        where, params = ["database_id = ?"], [self.database_id]
+        if stage:
+            where.append("idea_stage = ?")
+            params.append(stage)
+        if min_confidence is not None:
+            where.append("confidence >= ?")
+            params.append(min_confidence)
+        if max_confidence is not None:
+            where.append("confidence <= ?")
+            params.append(max_confidence)
+        if since:
+            where.append("created_at >= ?")
+            params.append(since)
+        if until:
+            # '2025-01-31'이 그날 전체를 포함하도록 다음 문자 범위까지
+            where.append("created_at < ?")
+            params.append(until + "\uffff")
+        if text:
+            where.append("(title LIKE ? OR summary LIKE ? OR tasks LIKE ?)")
+            params.extend([f"%{text}%"] * 3)
+        if session_id:
+            where.append("session_id = ?")
+            params.append(session_id)
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {LIST_COLUMNS} FROM pages WHERE {' AND '.join(where)} "
+                f"ORDER BY {order} DESC LIMIT ?",
+                params + [limit]
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def status(self) -> Dict[str, Any]:
+        """페이지 수, 단계별 개수/평균 신뢰도, 마지막 동기화 정보"""
+        state = self._state()
+        with self._connect() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM pages WHERE database_id = ?", (self.database_id,)
+            ).fetchone()[0]
+            stages = conn.execute(
+                """
+                SELECT idea_stage, COUNT(*) AS count, ROUND(AVG(confidence), 3) AS avg_confidence
+                FROM pages WHERE database_id = ? GROUP BY idea_stage
+                """,
+                (self.database_id,)
+            ).fetchall()
+        return {
+            "database_id": self.database_id,
+            "pages": total,
+            "stages": {row["idea_stage"] or "-": {"count": row["count"], "avg_confidence": row["avg_confidence"]}
+                       for row in stages},
+            "cursor": state["cursor"],
+            "last_sync_at": state["last_sync_at"],
+        }
+
+    def _state(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT cursor, last_sync_at, sync_id FROM sync_state WHERE database_id = ?",
+                (self.database_id,)
+            ).fetchone()
+        return dict(row) if row else {"cursor": None, "last_sync_at": None, "sync_id": 0}
+
+    def _upsert(self, rows: List[Dict[str, Any]], sync_id: int, cursor: str):
+        columns = list(rows[0].keys()) + ["sync_id"]
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "page_id")
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO pages ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT (page_id) DO UPDATE SET {updates}",
+                [list(row.values()) + [sync_id] for row in rows]
+            )
+            # 이 결과 페이지까지 반영되었음을 기록 (중간에 끊겨도 여기서부터 이어짐)
+            conn.execute(
+                """
+                INSERT INTO sync_state (database_id, cursor, sync_id) VALUES (?, ?, ?)
+                ON CONFLICT (database_id) DO UPDATE SET cursor = excluded.cursor
+                """,
+                (self.database_id, cursor, sync_id - 1)
+            )
+
+    def _connect(self):
+        return connect(self.path)
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        data["key_points"] = json.loads(data["key_points"] or "[]")
+        return data
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Notion DB 로컬 미러 (증분 동기화 + 조회)")
+    parser.add_argument("--db", default=DEFAULT_MIRROR_PATH, help="SQLite 파일 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Notion에서 변경분 가져오기")
+    sync_parser.add_argument("--full", action="store_true", help="전체 동기화 (삭제된 페이지 정리)")
+
+    query_parser = subparsers.add_parser("query", help="로컬 미러 조회")
+    query_parser.add_argument("--stage", choices=["발산", "수렴"], help="아이디어 단계")
+    query_parser.add_argument("--min-confidence", type=float, help="최소 신뢰도")
+    query_parser.add_argument("--max-confidence", type=float, help="최대 신뢰도")
+    query_parser.add_argument("--since", help="생성일 시작 (YYYY-MM-DD)")
+    query_parser.add_argument("--until", help="생성일 끝 (YYYY-MM-DD, 포함)")
+    query_parser.add_argument("--text", help="제목/요약/작업 검색어")
+    query_parser.add_argument("--order", default="created_at",
+                              choices=["created_at", "confidence", "last_edited_time"])
+    query_parser.add_argument("--limit", "-n", type=int, default=20, help="최대 결과 수")
+    query_parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+
+    subparsers.add_parser("status", help="미러 상태")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if args.command == "sync":
+        from notion_storage import NotionStorage
+
+        mirror = NotionMirror(NotionStorage(), path=args.db)
+        result = mirror.sync(full=args.full)
+        print(f"🔄 {result['fetched']}개 페이지 동기화 ({result['requests']}회 요청, "
+              f"{result['seconds']}초, 정리 {result['deleted']}개)")
+        print(f"   커서: {result['cursor']}")
+        return
+
+    mirror = NotionMirror(path=args.db)
+
+    if args.command == "status":
+        print(json.dumps(mirror.status(), ensure_ascii=False, indent=2))
+        return
+
+    results = mirror.query(
+        stage=args.stage,
+        min_confidence=args.min_confidence,
+        max_confidence=args.max_confidence,
+        since=args.since,
+        until=args.until,
+        text=args.text,
+        order=args.order,
+        limit=args.limit,
+    )
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"📚 {len(results)}건\n")
+    for page in results:
+        confidence = f"{page['confidence']:.2f}" if page["confidence"] is not None else "-"
+        print(f"[{page['idea_stage'] or '-'}] {confidence}  {(page['created_at'] or '')[:10]}  {page['title']}")
+        print(f"       {page['url']}")
+
+
+if __name__ == "__main__":
+    main()
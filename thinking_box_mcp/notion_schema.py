@@ -0,0 +1,208 @@
+"""
+Notion database schema cache + local property validation
+
+databases.retrieve 결과(속성 이름/타입/select 옵션)를 TTL 동안 캐시하고,
+저장 전에 속성을 스키마에 맞춰 검사/변환합니다.
+잘못된 payload는 Notion 왕복 + 400 대신 로컬에서 바로 실패합니다.
+"""
+from typing import Any, Callable, Dict, Optional
+import math
+import os
+import threading
+import time
+
+
+TEXT_TYPES = ("title", "rich_text")
+OPTION_TYPES = ("select", "multi_select", "status")
+# Notion이 자동으로 채우는 속성 - 보내면 400이므로 조용히 제외
+READ_ONLY_TYPES = (
+    "created_time", "created_by", "last_edited_time", "last_edited_by",
+    "formula", "rollup", "unique_id"
+)
+MAX_TEXT_LENGTH = 2000
+MAX_OPTION_LENGTH = 100
+
+
+class PropertyValidationError(ValueError):
+    """스키마와 맞지 않는 속성 (http_server에서 400으로 응답)"""
+
+    def __init__(self, errors: Dict[str, str]):
+        super().__init__("; ".join(f"{name}: {message}" for name, message in errors.items()))
+        self.errors = errors
+
+
+def parse_schema(database: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    databases.retrieve 응답 → {속성 이름: {"type": ..., "options": [...] | None}}
+    """
+    schema = {}
+    for name, prop in database.get("properties", {}).items():
+        kind = prop.get("type")
+        options = None
+        if kind in OPTION_TYPES:
+            options = [option["name"] for option in (prop.get(kind) or {}).get("options", [])]
+        schema[name] = {"type": kind, "options": options}
+    return schema
+
+
+class SchemaCache:
+    """
+    데이터베이스 스키마 TTL 캐시 (스레드 안전)
+
+    만료되었거나 invalidate() 후에만 fetch를 다시 호출합니다.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        Args:
+            ttl: 캐시 유지 시간 (초, 기본: NOTION_SCHEMA_TTL 또는 300)
+        """
+        if ttl is None:
+            ttl = float(os.getenv("NOTION_SCHEMA_TTL", "300"))
+        self.ttl = ttl
+        self._schema: Optional[Dict[str, Dict[str, Any]]] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Args:
+            fetch: databases.retrieve 호출 (캐시 miss일 때만)
+        """
+        cached = self.cached()
+        if cached is not None:
+            return cached
+        return self.set(fetch())
+
+    def cached(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """유효한 캐시가 있으면 반환 (없으면 None - async 호출자가 직접 fetch 후 set)"""
+        with self._lock:
+            if self._schema is not None and time.monotonic() - self._fetched_at < self.ttl:
+                return self._schema
+        return None
+
+    def set(self, database: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        schema = parse_schema(database)
+        with self._lock:
+            self._schema = schema
+            self._fetched_at = time.monotonic()
+        return schema
+
+    def invalidate(self):
+        with self._lock:
+            self._schema = None
+
+    def age(self) -> Optional[float]:
+        """캐시된 스키마의 나이 (초, 없으면 None)"""
+        with self._lock:
+            if self._schema is None:
+                return None
+            return round(time.monotonic() - self._fetched_at, 1)
+
+
+def _text_of(prop: Dict[str, Any]) -> str:
+    for kind in TEXT_TYPES:
+        if kind in prop:
+            return "".join(item.get("text", {}).get("content", "") for item in prop[kind] or [])
+    if "select" in prop:
+        return (prop["select"] or {}).get("name", "")
+    return ""
+
+
+def _text_items(text: str):
+    return [
+        {"text": {"content": text[start:start + MAX_TEXT_LENGTH]}}
+        for start in range(0, len(text), MAX_TEXT_LENGTH)
+    ]
+
+
+def _option_name(name: Any) -> str:
+    # select 옵션 이름에는 쉼표를 쓸 수 없음
+    return str(name).replace(",", " ").strip()[:MAX_OPTION_LENGTH]
+
+
+def validate_properties(
+    properties: Dict[str, Any],
+    schema: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    속성을 스키마에 맞춰 검사하고 가능한 것은 변환
+
+    - 스키마에 없는 속성 → 오류, 읽기 전용 속성(created_time 등) → 제외
+    - title ↔ rich_text ↔ select 사이 타입 차이 → 스키마 타입으로 변환
+    - 텍스트는 2000자 단위로 분할, 옵션 이름은 쉼표 제거/100자 제한/중복 제거
+    - select/status 값이 기존 옵션에 없으면 → 오류
+    - number는 유한한 숫자여야 함
+
+    Raises:
+        PropertyValidationError: 변환할 수 없는 속성이 있을 때 (모든 오류를 모아서)
+    """
+    validated = {}
+    errors = {}
+
+    for name, prop in properties.items():
+        field = schema.get(name)
+        if field is None:
+            errors[name] = "데이터베이스에 없는 속성"
+            continue
+        kind = field["type"]
+        options = field["options"]
+
+        if kind in READ_ONLY_TYPES:
+            continue
+
+        if kind in TEXT_TYPES:
+            if not any(key in prop for key in TEXT_TYPES + ("select",)):
+                errors[name] = f"{kind} 속성에 텍스트가 아닌 값"
+                continue
+            validated[name] = {kind: _text_items(_text_of(prop))}
+
+        elif kind in ("select", "status"):
+            if any(key in prop for key in TEXT_TYPES + ("select", "status")):
+                value = _option_name(_text_of(prop) or (prop.get("status") or {}).get("name", ""))
+            else:
+                errors[name] = f"{kind} 속성에 옵션이 아닌 값"
+                continue
+            if options and value not in options:
+                errors[name] = f"허용되지 않은 옵션 '{value}' (가능: {', '.join(options)})"
+                continue
+            validated[name] = {kind: {"name": value}}
+
+        elif kind == "multi_select":
+            if "multi_select" not in prop:
+                errors[name] = "multi_select 속성에 목록이 아닌 값"
+                continue
+            names = []
+            for option in prop["multi_select"] or []:
+                value = _option_name(option.get("name", ""))
+                if value and value not in names:
+                    names.append(value)
+            validated[name] = {"multi_select": [{"name": value} for value in names]}
+
+        elif kind == "number":
+            try:
+                number = float(prop.get("number"))
+            except (TypeError, ValueError):
+                errors[name] = "숫자가 아닌 값"
+                continue
+            if not math.isfinite(number):
+                errors[name] = "유한하지 않은 숫자"
+                continue
+            validated[name] = {"number": number}
+
+        elif kind == "date":
+            if not (prop.get("date") or {}).get("start"):
+                errors[name] = "date.start가 없음"
+                continue
+            validated[name] = prop
+
+        else:
+            key = next(iter(prop), None)
+            if key != kind:
+                errors[name] = f"{kind} 속성에 {key} 값"
+                continue
+            validated[name] = prop
+
+    if errors:
+        raise PropertyValidationError(errors)
+    return validated
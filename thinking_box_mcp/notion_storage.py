@@ -3,32 +3,124 @@ Notion Database 연동 모듈
 
 Thinking Box 에이전트 출력을 Notion Database에 저장
 """
+import hashlib
 import os
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from notion_client import Client
 
+try:
+    from .rate_limit import RateLimiter, _status_of, notion_rate_limiter
+    from .session_index import SessionIndex
+    from .notion_blocks import batch_blocks, diff_blocks, markdown_to_blocks
+    from .notion_schema import SchemaCache, validate_properties
+except ImportError:
+    # thinking_box_mcp/ 에서 직접 실행하는 경우 (http_server.py, mcp_server.py)
+    from rate_limit import RateLimiter, _status_of, notion_rate_limiter
+    from session_index import SessionIndex
+    from notion_blocks import batch_blocks, diff_blocks, markdown_to_blocks
+    from notion_schema import SchemaCache, validate_properties
+
+
+# upsert 시 비교/업데이트하지 않는 속성 (최초 생성 시각)
+IMMUTABLE_PROPERTIES = ("Created At",)
+
+# 세션 인덱스에 본문 해시를 기록하는 키 (Notion 속성 아님)
+CONTENT_KEY = "__content__"
+
+# 본문 해시를 페이지에도 남기는 속성 (선택, rich_text - 보기에서 숨겨두면 됨)
+# 인덱스가 없는 프로세스/호스트도 databases.query 응답만으로 본문 변경 여부를 판단
+CONTENT_HASH_PROPERTY = "Content Hash"
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """환경 변수 on/off 스위치 ("1"이면 켬, 미설정이면 default)"""
+    value = os.getenv(name)
+    return default if value is None else value == "1"
+
+
+def plain_property_value(prop: Dict[str, Any]) -> Any:
+    """
+    Notion 속성 값 → 비교용 plain value
+
+    _build_properties()가 만든 요청 포맷과 databases.query 응답 포맷 모두 처리
+    """
+    for kind in ("title", "rich_text"):
+        if kind in prop:
+            return "".join(
+                item.get("text", {}).get("content", item.get("plain_text", ""))
+                for item in prop[kind] or []
+            )
+    if "select" in prop:
+        return (prop["select"] or {}).get("name")
+    if "multi_select" in prop:
+        return [option["name"] for option in prop["multi_select"] or []]
+    if "number" in prop:
+        return prop["number"]
+    if "date" in prop:
+        return (prop["date"] or {}).get("start")
+    return None
+
 
 class NotionStorage:
     """
     Notion Database에 Thinking Box 결과를 저장하는 클라이언트
     """
     
-    def __init__(self, token: str = None, database_id: str = None):
+    def __init__(
+        self,
+        token: str = None,
+        database_id: str = None,
+        rate_limiter: RateLimiter = None,
+        upsert: Optional[bool] = None,
+        session_index: SessionIndex = None,
+        write_content: Optional[bool] = None,
+        validate: Optional[bool] = None,
+        base_url: Optional[str] = None
+    ):
         """
         Args:
             token: Notion Integration Token
             database_id: 저장할 Database ID
+            rate_limiter: API 호출 속도 제한 (기본: 프로세스 공유 limiter)
+            upsert: 같은 session_id면 새 페이지 대신 기존 페이지 업데이트
+                    (기본: NOTION_UPSERT 환경 변수, 미설정 시 끔 - http_server/Streamlit은 직접 켬)
+            session_index: session_id → 페이지 로컬 인덱스 (기본: NOTION_SESSION_INDEX_DB)
+            write_content: data["content"](마크다운 전체 분석)를 페이지 본문 블록으로 저장
+                           (기본: NOTION_PAGE_CONTENT 환경 변수, 미설정 시 끔)
+            validate: 저장 전 캐시된 DB 스키마로 속성 검사/변환
+                      (기본: NOTION_VALIDATE 환경 변수, 미설정 시 끔)
+            base_url: Notion API 주소 (기본: NOTION_BASE_URL, 미설정 시 https://api.notion.com)
+                      - 로컬 대역 서버(fake_notion.py)로 부하/통합 테스트할 때 사용
         """
         self.token = token or os.getenv("NOTION_TOKEN")
         self.database_id = database_id or os.getenv("NOTION_DATABASE_ID")
+        self.base_url = base_url or os.getenv("NOTION_BASE_URL")
         
         if not self.token:
             raise ValueError("NOTION_TOKEN이 필요합니다")
         if not self.database_id:
             raise ValueError("NOTION_DATABASE_ID가 필요합니다")
         
-        self.client = Client(auth=self.token)
+        self.client = self._make_client()
+        self.rate_limiter = rate_limiter or notion_rate_limiter
+        
+        if upsert is None:
+            upsert = env_flag("NOTION_UPSERT")
+        self.upsert = upsert
+        self._session_index = session_index
+        # 같은 session_id의 동시 저장(클라이언트 재시도)이 둘 다 페이지를 만들지 않도록 직렬화
+        self._session_locks = [threading.Lock() for _ in range(64)]
+        
+        if write_content is None:
+            write_content = env_flag("NOTION_PAGE_CONTENT")
+        self.write_content = write_content
+        
+        if validate is None:
+            validate = env_flag("NOTION_VALIDATE")
+        self.validate = validate
+        self._schema_cache = SchemaCache()
     
     def save_thinking_result(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -46,28 +138,403 @@ class NotionStorage:
                     {"owner": "FE", "task": "와이어프레임"},
                     {"owner": "BE", "task": "API 설계"}
                 ],
-                "confidence": 0.87
+                "confidence": 0.87,
+                "content": "# 구조화된 계획 ..."  # 선택: 페이지 본문 (마크다운)
             }
         
         Returns:
-            생성된 Notion 페이지 정보
+            생성된 Notion 페이지 정보 (upsert 모드면 upsert_thinking_result() 결과)
         """
-        # Notion API 포맷으로 변환
-        properties = self._build_properties(data)
+        if self.upsert and data.get("session_id"):
+            return self.upsert_thinking_result(data)
+        
+        # Notion API 포맷으로 변환 + 스키마 검사 (잘못된 값은 요청 전에 PropertyValidationError)
+        properties = self._checked_properties(data, self._schema_for_validation())
+        
+        # Notion Database에 페이지 생성 (본문이 있으면 첫 batch는 생성 요청에 포함)
+        response = self._run(self._create_page_steps(properties, self._content_batches(data)))
+        
+        return {
+            "success": True,
+            "page_id": response["id"],
+            "page_url": response["url"],
+            "created_time": response["created_time"]
+        }
+    
+    def upsert_thinking_result(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        session_id 기준 idempotent 저장
+        
+        - 로컬 인덱스에 없으면 databases.query로 같은 Session ID 페이지 검색
+        - 페이지가 없으면 생성, 있으면 바뀐 속성만 pages.update (바뀐 게 없으면 API 호출 없음)
+        - 본문(content)은 해시를 인덱스(+ Content Hash 속성)에 기록해 두고, 바뀌었을 때만
+          기존 블록과 비교해 바뀐 구간만 삭제/추가 (덧붙이기만 했으면 새 블록 append만)
+        
+        Returns:
+            save_thinking_result()와 같은 키 + action(created/updated/unchanged), changed_properties
+        """
+        session_id = str(data["session_id"])
+        schema = self._schema_for_validation()
+        properties, values, batches, content_hash = self._prepare_upsert(data, schema)
+        if content_hash is not None and schema is None:
+            # 검사를 꺼도 Content Hash 속성 유무는 캐시된 스키마로 확인
+            schema = self.database_schema()
+        hash_property = self._content_hash_property(content_hash, schema)
+        
+        with self._session_lock(session_id):
+            return self._run(
+                self._upsert_steps(session_id, properties, values, batches, content_hash, hash_property)
+            )
+    
+    def _upsert_steps(self, session_id, properties, values, batches, content_hash, hash_property):
+        """
+        upsert 결정 로직 (동기/비동기 저장소가 공유)
+        
+        Notion 요청은 직접 보내지 않고 _request()로 yield → 드라이버(_run)가 보내고 결과를 돌려줌.
+        요청이 실패하면 같은 yield 지점에서 예외가 다시 올라옴.
+        """
+        entry = self.session_index.get(self.database_id, session_id)
+        if entry is None:
+            entry = yield from self._find_session_page_steps(session_id)
+        
+        if entry is not None:
+            changed, content_changed = self._diff(entry, values, content_hash)
+            if not changed and not content_changed:
+                return self._upsert_result(entry, "unchanged", [])
+            try:
+                if content_changed:
+                    # 본문이 바뀌었거나 이전 저장이 본문 중간에 실패한 경우 → 바뀐 블록만 교체
+                    yield from self._replace_content_steps(entry["page_id"], batches)
+                # 해시 속성은 본문을 다 쓴 뒤에 갱신 (중간에 실패하면 다음 재시도가 다시 비교)
+                update = self._properties_update(properties, changed, hash_property if content_changed else None)
+                if update:
+                    response = yield self._request(
+                        self.client.pages.update, page_id=entry["page_id"], properties=update
+                    )
+                    entry["page_url"] = response.get("url", entry["page_url"])
+            except Exception as e:
+                # 페이지가 삭제/접근 불가 → 인덱스 정리 후 새로 생성
+                if not self._is_missing_page(e):
+                    raise
+                self.session_index.delete(self.database_id, session_id)
+            else:
+                self._record_update(session_id, entry, values, changed, content_hash if content_changed else None)
+                return self._upsert_result(entry, "updated", changed)
+        
+        response = yield from self._create_page_steps(
+            self._create_properties(properties, batches, hash_property),
+            batches,
+            on_created=lambda page: self._remember(session_id, self._entry_of(page), values)
+        )
+        if hash_property is not None and len(batches or []) > 1:
+            # 본문 batch를 모두 append한 뒤에 해시 기록
+            yield self._request(
+                self.client.pages.update,
+                page_id=response["id"],
+                properties={CONTENT_HASH_PROPERTY: hash_property}
+            )
+        if content_hash is not None:
+            values[CONTENT_KEY] = content_hash
+            self._remember(session_id, self._entry_of(response), values)
+        return self._created_result(response, values)
+    
+    @staticmethod
+    def _request(fn, **kwargs):
+        """_*_steps가 yield하는 Notion 요청 하나 (목록으로 yield하면 서로 독립인 요청 묶음)"""
+        return fn, kwargs
+    
+    def _run(self, steps):
+        """
+        _*_steps 제너레이터 실행 (동기 드라이버)
+        
+        yield된 요청을 _call로 보내 결과를 send, 실패하면 그 예외를 throw
+        → 제너레이터가 return한 값을 반환
+        """
+        result, error = None, None
+        while True:
+            try:
+                request = steps.send(result) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                result, error = self._execute(request), None
+            except Exception as e:
+                result, error = None, e
+    
+    def _execute(self, request):
+        if isinstance(request, list):
+            return [self._execute(item) for item in request]
+        fn, kwargs = request
+        return self._call(fn, **kwargs)
+    
+    @property
+    def session_index(self) -> SessionIndex:
+        if self._session_index is None:
+            self._session_index = SessionIndex()
+        return self._session_index
+    
+    def _find_session_page_steps(self, session_id: str):
+        """인덱스 miss → Notion에서 같은 Session ID의 가장 오래된 페이지 검색 후 인덱스 갱신"""
+        response = yield self._request(self.client.databases.query, **self._session_query(session_id))
+        if not response.get("results"):
+            return None
+        
+        page = response["results"][0]
+        self._remember(session_id, self._entry_of(page), self._page_values(page))
+        return self.session_index.get(self.database_id, session_id)
+    
+    def _session_query(self, session_id: str) -> Dict[str, Any]:
+        """같은 Session ID의 가장 오래된 페이지 검색 요청 인자"""
+        return {
+            "database_id": self.database_id,
+            "filter": {"property": "Session ID", "rich_text": {"equals": session_id}},
+            "sorts": [{"timestamp": "created_time", "direction": "ascending"}],
+            "page_size": 1
+        }
+    
+    def _prepare_upsert(self, data: Dict[str, Any], schema: Optional[Dict[str, Any]] = None):
+        """upsert 준비: (요청 속성, 비교용 값, 본문 batch, 본문 해시)"""
+        properties = self._checked_properties(data, schema)
+        batches = self._content_batches(data)
+        content_hash = (
+            hashlib.sha256(data["content"].encode("utf-8")).hexdigest()
+            if batches is not None else None
+        )
+        return properties, self._plain_values(properties), batches, content_hash
+    
+    @staticmethod
+    def _plain_values(properties: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            name: plain_property_value(prop)
+            for name, prop in properties.items()
+            if name not in IMMUTABLE_PROPERTIES
+        }
+    
+    @classmethod
+    def _page_values(cls, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        databases.query 응답 페이지 → 인덱스 값
+
+        Content Hash 속성이 있으면 본문 해시(CONTENT_KEY)로 옮김 - 없으면 본문 상태를 모르므로
+        본문이 있는 요청은 블록 비교로 확인 (바뀐 게 없으면 조회만)
+        """
+        values = cls._plain_values(page.get("properties", {}))
+        content_hash = values.pop(CONTENT_HASH_PROPERTY, None)
+        if content_hash:
+            values[CONTENT_KEY] = content_hash
+        return values
+    
+    @staticmethod
+    def _content_hash_property(content_hash: Optional[str], schema: Optional[Dict[str, Any]]):
+        """DB에 Content Hash(rich_text) 속성이 있을 때만 요청 속성 값, 아니면 None"""
+        if content_hash is None or schema is None:
+            return None
+        if (schema.get(CONTENT_HASH_PROPERTY) or {}).get("type") != "rich_text":
+            return None
+        return {"rich_text": [{"text": {"content": content_hash}}]}
+    
+    @staticmethod
+    def _properties_update(
+        properties: Dict[str, Any],
+        changed: List[str],
+        hash_property: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """pages.update로 보낼 속성 (바뀐 속성 + 본문이 바뀌었으면 해시)"""
+        update = {name: properties[name] for name in changed}
+        if hash_property is not None:
+            update[CONTENT_HASH_PROPERTY] = hash_property
+        return update
+    
+    @staticmethod
+    def _create_properties(
+        properties: Dict[str, Any],
+        batches: Optional[List[List[Dict[str, Any]]]],
+        hash_property: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """pages.create 속성 - 본문이 생성 요청 하나에 다 들어갈 때만 해시를 함께 기록"""
+        if hash_property is None or len(batches or []) > 1:
+            return properties
+        return {**properties, CONTENT_HASH_PROPERTY: hash_property}
+    
+    def _record_update(
+        self,
+        session_id: str,
+        entry: Dict[str, Any],
+        values: Dict[str, Any],
+        changed: List[str],
+        content_hash: Optional[str]
+    ):
+        """업데이트 성공 후 인덱스 갱신 (changed에 본문 변경 표시 추가)"""
+        entry["properties"].update({name: values[name] for name in changed})
+        if content_hash is not None:
+            entry["properties"][CONTENT_KEY] = content_hash
+            changed.append("content")
+        self._remember(session_id, entry, entry["properties"])
+    
+    @staticmethod
+    def _diff(entry: Dict[str, Any], values: Dict[str, Any], content_hash: Optional[str]):
+        """인덱스에 기록된 값과 비교: (바뀐 속성 이름 목록, 본문 변경 여부)"""
+        changed = [name for name, value in values.items() if entry["properties"].get(name) != value]
+        content_changed = content_hash is not None and entry["properties"].get(CONTENT_KEY) != content_hash
+        return changed, content_changed
+    
+    @staticmethod
+    def _is_missing_page(error: Exception) -> bool:
+        """페이지가 삭제되었거나 접근할 수 없음 (404)"""
+        return _status_of(error) == 404 or getattr(error, "code", None) == "object_not_found"
+    
+    def _remember(self, session_id: str, entry: Dict[str, Any], values: Dict[str, Any]):
+        self.session_index.put(
+            self.database_id, session_id, entry["page_id"], entry["page_url"], entry["created_time"], values
+        )
+    
+    @staticmethod
+    def _entry_of(page: Dict[str, Any]) -> Dict[str, Any]:
+        return {"page_id": page["id"], "page_url": page.get("url"), "created_time": page.get("created_time")}
+    
+    def _content_batches(self, data: Dict[str, Any]) -> Optional[List[List[Dict[str, Any]]]]:
+        """data["content"] 마크다운 → 요청 단위 블록 batch 목록 (본문 저장 안 하면 None)"""
+        if not self.write_content or not data.get("content"):
+            return None
+        return list(batch_blocks(markdown_to_blocks(data["content"])))
+    
+    def _create_page_steps(self, properties: Dict[str, Any], batches=None, on_created=None):
+        """
+        페이지 생성 + 본문 블록 저장
         
-        # Notion Database에 페이지 생성
-        response = self.client.pages.create(
+        첫 batch는 pages.create 요청에 children으로 함께 보내고, 나머지는 순서대로 append
+        → 요청 수 = 블록 batch 수 (본문이 없으면 1)
+        """
+        batches = batches or []
+        kwargs = {"children": batches[0]} if batches else {}
+        # 5xx/타임아웃 뒤 다시 보내면 중복 페이지가 생길 수 있어 429만 재시도 (나머지는 upsert/outbox가 판단)
+        response = yield self._request(
+            self.client.pages.create,
+            retry_transient=False,
             parent={"database_id": self.database_id},
-            properties=properties
+            properties=properties,
+            **kwargs
         )
+        if on_created is not None:
+            on_created(response)
+        yield from self._append_batches_steps(response["id"], batches[1:])
+        return response
+    
+    def _append_batches_steps(self, block_id: str, batches: List[List[Dict[str, Any]]], after: Optional[str] = None):
+        """
+        블록 batch를 순서대로 append
         
+        같은 부모에 대한 append는 순서가 보장되어야 하므로 직렬로 보내되,
+        공유 rate limiter의 burst 안에서 대기 없이 연달아 나감
+        
+        Args:
+            after: 이 블록 뒤에 끼워 넣기 (None이면 맨 끝)
+        """
+        for batch in batches:
+            kwargs = {"after": after} if after else {}
+            response = yield self._request(
+                self.client.blocks.children.append, block_id=block_id, children=batch, **kwargs
+            )
+            if after:
+                after = self._last_block_id(response, after)
+    
+    @staticmethod
+    def _last_block_id(response: Dict[str, Any], default: str) -> str:
+        """append 응답에서 마지막으로 넣은 블록 ID (다음 batch를 그 뒤에 넣기 위함)"""
+        results = response.get("results") or []
+        return results[-1]["id"] if results else default
+    
+    def _replace_content_steps(self, page_id: str, batches: List[List[Dict[str, Any]]]):
+        """
+        본문을 새 블록으로 갱신 (본문이 바뀐 upsert에서만 사용)
+        
+        기존 블록을 조회해 같은 앞부분/뒷부분은 두고, 바뀐 구간만 삭제 후 그 자리에 append
+        → 덧붙이기만 한 변경은 새 블록 batch 수만큼만 요청
+        """
+        existing = []
+        cursor = None
+        while True:
+            response = yield self._request(self.client.blocks.children.list, **self._children_query(page_id, cursor))
+            existing.extend(response.get("results", []))
+            if not response.get("has_more"):
+                break
+            cursor = response.get("next_cursor")
+        
+        delete_ids, insert, after = diff_blocks(existing, [block for batch in batches for block in batch])
+        if delete_ids:
+            # 서로 독립인 삭제는 한 묶음으로 (비동기 저장소는 동시에 보냄)
+            yield [self._request(self.client.blocks.delete, block_id=block_id) for block_id in delete_ids]
+        yield from self._append_batches_steps(page_id, list(batch_blocks(insert)), after=after)
+    
+    @staticmethod
+    def _children_query(page_id: str, cursor: Optional[str]) -> Dict[str, Any]:
+        kwargs = {"block_id": page_id, "page_size": 100}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        return kwargs
+    
+    @staticmethod
+    def _created_result(response: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": True,
             "page_id": response["id"],
             "page_url": response["url"],
-            "created_time": response["created_time"]
+            "created_time": response["created_time"],
+            "action": "created",
+            "changed_properties": [name for name in values if name != CONTENT_KEY]
+        }
+    
+    @staticmethod
+    def _upsert_result(entry: Dict[str, Any], action: str, changed: List[str]) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "page_id": entry["page_id"],
+            "page_url": entry["page_url"],
+            "created_time": entry["created_time"],
+            "action": action,
+            "changed_properties": changed
         }
     
+    def _session_lock(self, session_id: str) -> threading.Lock:
+        return self._session_locks[hash(session_id) % len(self._session_locks)]
+    
+    def database_schema(self, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        DB 스키마 {속성 이름: {"type", "options"}} (TTL 캐시, NOTION_SCHEMA_TTL)
+        """
+        if refresh:
+            self._schema_cache.invalidate()
+        return self._schema_cache.get(
+            lambda: self._call(self.client.databases.retrieve, database_id=self.database_id)
+        )
+    
+    def schema_age(self) -> Optional[float]:
+        """캐시된 스키마의 나이 (초, 아직 조회 전이면 None)"""
+        return self._schema_cache.age()
+    
+    def query_database(self, database_id: Optional[str] = None, **query) -> Dict[str, Any]:
+        """
+        databases.query 한 페이지 (속도 제한 + 429 재시도 적용)
+        
+        Args:
+            database_id: 조회할 Database ID (기본: 저장 대상 DB)
+            **query: filter, sorts, page_size, start_cursor 등 Notion 요청 인자
+        
+        Returns:
+            Notion 응답 (results, has_more, next_cursor)
+        """
+        return self._call(self.client.databases.query, database_id=database_id or self.database_id, **query)
+    
+    def _schema_for_validation(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        return self.database_schema() if self.validate else None
+    
+    def _checked_properties(self, data: Dict[str, Any], schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """_build_properties() + 스키마가 있으면 로컬 검사/변환"""
+        properties = self._build_properties(data)
+        if schema is not None:
+            properties = validate_properties(properties, schema)
+        return properties
+    
     def _build_properties(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         에이전트 데이터를 Notion Properties 포맷으로 변환
@@ -157,13 +624,46 @@ class NotionStorage:
         
         return properties
     
-    def test_connection(self) -> bool:
+    def test_connection(self, refresh: bool = False) -> bool:
         """
         Notion 연결 테스트
+        
+        스키마 캐시가 유효하면 네트워크 호출 없이 통과 (헬스 체크마다 조회하지 않음)
+        
+        Args:
+            refresh: 캐시를 무시하고 다시 조회
         """
         try:
-            self.client.databases.retrieve(database_id=self.database_id)
+            self.database_schema(refresh=refresh)
             return True
         except Exception as e:
             print(f"Notion 연결 실패: {e}")
             return False
+    
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        """
+        API 호출 카운터 (calls, throttled, rate_limited, retried, failed)
+        """
+        return self.rate_limiter.stats.snapshot()
+    
+    def _client_options(self) -> Dict[str, Any]:
+        options = {"auth": self.token}
+        if self.base_url:
+            options["base_url"] = self.base_url.rstrip("/")
+        return options
+    
+    def _make_client(self):
+        return Client(**self._client_options())
+    
+    def _call(self, fn, *args, **kwargs):
+        """모든 Notion API 호출은 속도 제한 + 429 재시도를 거침"""
+        try:
+            return self.rate_limiter.call(fn, *args, **kwargs)
+        except Exception as e:
+            self._on_error(e)
+            raise
+    
+    def _on_error(self, error: Exception):
+        # 로컬 검사를 통과했는데 400이면 DB 스키마가 바뀐 것 → 다음 저장 전에 다시 조회
+        if _status_of(error) == 400:
+            self._schema_cache.invalidate()
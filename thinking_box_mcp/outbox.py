@@ -0,0 +1,416 @@
+"""
+Durable write-behind outbox for Notion saves
+
+파이프라인은 변환된 Notion payload를 로컬 SQLite 대기열에 넣고 바로 반환하며,
+백그라운드 flusher가 속도 제한(rate_limit)과 재시도를 지키며 Notion에 저장합니다.
+Notion이 느리거나 다운되어도 사용자는 기다리지 않고, 분석 결과도 잃지 않습니다.
+
+사용법:
+    python outbox.py status      # 대기/실패 현황
+    python outbox.py flush       # 대기 중인 항목 즉시 저장
+    python outbox.py retry       # 실패 항목 다시 대기열로
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+try:
+    from .rate_limit import RateLimitExceeded
+    from .sqlite_util import connect
+except ImportError:
+    from rate_limit import RateLimitExceeded
+    from sqlite_util import connect
+
+
+DEFAULT_OUTBOX_PATH = os.getenv(
+    "NOTION_OUTBOX_DB",
+    str(Path.home() / ".thinking_box" / "notion_outbox.db")
+)
+
+PENDING = "pending"
+SENDING = "sending"
+DONE = "done"
+FAILED = "failed"
+
+# Notion 클라이언트를 만들 수 없을 때(설정 누락 등) 재시도 간격 (초)
+STORAGE_RETRY_DELAY = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    session_id TEXT,
+    payload TEXT NOT NULL,
+    meta TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    page_id TEXT,
+    page_url TEXT,
+    claimed_by TEXT,
+    claimed_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox(status, next_attempt_at);
+"""
+
+# 이전 버전 DB에 없는 컬럼 (시작 시 추가)
+LEASE_COLUMNS = {"claimed_by": "TEXT", "claimed_at": "REAL"}
+
+
+class NotionOutbox:
+    """
+    SQLite 기반 Notion 저장 대기열 + 백그라운드 flusher
+
+    - enqueue()는 로컬 INSERT 한 번이므로 즉시 반환
+    - flusher는 due 항목을 batch_size씩 꺼내 concurrency개 스레드로 저장
+      (실제 요청 속도는 NotionStorage의 공유 rate limiter가 제한)
+    - 실패는 지수 백오프로 재시도, max_attempts 초과 시 failed
+    - 꺼낸 항목은 claimed_by(호스트:pid)/claimed_at을 기록해 lease_seconds 동안 점유
+      (같은 DB를 쓰는 다른 프로세스가 전송 중인 항목은 건드리지 않고,
+      점유한 프로세스가 죽어 lease가 지난 항목만 다시 꺼냄)
+    """
+
+    def __init__(
+        self,
+        storage_factory: Callable[[], Any],
+        path: str = DEFAULT_OUTBOX_PATH,
+        batch_size: int = 10,
+        concurrency: int = 3,
+        poll_interval: float = 2.0,
+        max_attempts: int = 8,
+        lease_seconds: float = 600.0,
+        on_saved: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+    ):
+        """
+        Args:
+            storage_factory: NotionStorage를 만드는 함수 (첫 전송 시 1회 호출)
+            path: SQLite 파일 경로
+            batch_size: 한 번에 꺼낼 항목 수
+            concurrency: 동시 전송 수
+            poll_interval: 대기열 확인 주기 (초, enqueue 시에는 즉시 깨어남)
+            max_attempts: 최대 시도 횟수 (초과 시 failed)
+            lease_seconds: 꺼낸 항목의 점유 시간 (초) - 지나면 다른 프로세스가 다시 꺼낼 수 있음
+                           (429 재시도와 본문 블록 전송을 포함한 저장 1건보다 충분히 길게)
+            on_saved: 저장 성공 콜백 (entry, notion_result) - 예: 분석 기록에 페이지 연결
+        """
+        self.path = path
+        self.storage_factory = storage_factory
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.on_saved = on_saved
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._storage = None
+        self._storage_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._flush_lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(outbox)")}
+            for name, kind in LEASE_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE outbox ADD COLUMN {name} {kind}")
+            # 전송 중에 종료된 프로세스의 항목 복구 (lease가 지난 것만 - 다른 프로세스가 전송 중일 수 있음)
+            conn.execute(
+                f"UPDATE outbox SET status = ?, claimed_by = NULL, claimed_at = NULL, updated_at = ? "
+                f"WHERE {self._expired_lease_sql()}",
+                (PENDING, time.time(), SENDING, time.time() - self.lease_seconds)
+            )
+
+    def enqueue(self, payload: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Notion payload를 대기열에 추가하고 즉시 반환
+
+        Args:
+            payload: NotionStorage.save_thinking_result()에 넘길 데이터
+            meta: 콜백에서 쓸 부가 정보 (예: {"history_id": 12})
+
+        Returns:
+            outbox 항목 ID
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO outbox (created_at, updated_at, session_id, payload, meta, next_attempt_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    now, now,
+                    payload.get("session_id"),
+                    json.dumps(payload, ensure_ascii=False),
+                    json.dumps(meta, ensure_ascii=False) if meta else None,
+                    now,
+                )
+            )
+        self._wake.set()
+        return cursor.lastrowid
+
+    def start(self) -> "NotionOutbox":
+        """백그라운드 flusher 시작 (이미 실행 중이면 무시)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="notion-outbox", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        """
+        due 항목을 현재 스레드에서 저장 (CLI 종료 전, 테스트용)
+
+        Args:
+            timeout: 최대 소요 시간 (초, None이면 대기열이 빌 때까지)
+
+        Returns:
+            status() 요약
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            if not self._process_batch():
+                break
+        return self.status()
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM outbox WHERE id = ?", (entry_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def status(self) -> Dict[str, Any]:
+        """상태별 개수, 가장 오래된 대기 항목 나이, 최근 실패 목록"""
+        with self._connect() as conn:
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ).fetchall())
+            oldest = conn.execute(
+                "SELECT MIN(created_at) FROM outbox WHERE status IN (?, ?)",
+                (PENDING, SENDING)
+            ).fetchone()[0]
+            failures = conn.execute(
+                """
+                SELECT id, session_id, attempts, last_error, updated_at FROM outbox
+                WHERE status = ? ORDER BY updated_at DESC LIMIT 10
+                """,
+                (FAILED,)
+            ).fetchall()
+
+        return {
+            "pending": counts.get(PENDING, 0) + counts.get(SENDING, 0),
+            "done": counts.get(DONE, 0),
+            "failed": counts.get(FAILED, 0),
+            "oldest_pending_seconds": round(time.time() - oldest, 1) if oldest else None,
+            "recent_failures": [
+                {
+                    "id": row["id"],
+                    "session_id": row["session_id"],
+                    "attempts": row["attempts"],
+                    "error": row["last_error"],
+                    "failed_at": datetime.fromtimestamp(row["updated_at"]).isoformat(timespec="seconds"),
+                }
+                for row in failures
+            ],
+            "flusher_running": self._thread is not None and self._thread.is_alive(),
+        }
+
+    def retry_failed(self) -> int:
+        """실패 항목을 다시 대기열로 (시도 횟수 초기화)"""
+        with self._connect() as conn:
+            count = conn.execute(
+                """
+                UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ?, updated_at = ?
+                WHERE status = ?
+                """,
+                (PENDING, time.time(), time.time(), FAILED)
+            ).rowcount
+        self._wake.set()
+        return count
+
+    def purge_done(self, older_than: float = 7 * 24 * 3600) -> int:
+        """저장 완료 후 오래된 항목 삭제"""
+        with self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND updated_at < ?",
+                (DONE, time.time() - older_than)
+            ).rowcount
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                busy = self._process_batch()
+            except Exception as e:
+                print(f"Notion outbox flusher 오류: {e}")
+                busy = False
+            if not busy:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _process_batch(self) -> bool:
+        """due 항목을 한 batch 저장, 처리한 항목이 있으면 True"""
+        with self._flush_lock:
+            entries = self._claim()
+            if not entries:
+                return False
+
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                outcomes = list(executor.map(self._send, entries))
+
+        # 429/클라이언트 생성 실패로 멈췄으면 이번 batch의 나머지는 이미 재예약됨 - 바로 다음 batch로 가지 않음
+        # (락을 푼 뒤 대기해서 flush() 등 다른 호출자를 막지 않음)
+        if any(outcome in ("rate_limited", "unavailable") for outcome in outcomes):
+            self._stop.wait(self.poll_interval)
+        return True
+
+    def _claim(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # due인 pending 항목 + 점유한 프로세스가 lease 안에 끝내지 못한 sending 항목
+            rows = conn.execute(
+                f"""
+                SELECT * FROM outbox
+                WHERE (status = ? AND next_attempt_at <= ?) OR ({self._expired_lease_sql()})
+                ORDER BY id LIMIT ?
+                """,
+                (PENDING, now, SENDING, now - self.lease_seconds, self.batch_size)
+            ).fetchall()
+            if rows:
+                conn.execute(
+                    f"UPDATE outbox SET status = ?, claimed_by = ?, claimed_at = ?, updated_at = ? "
+                    f"WHERE id IN ({','.join('?' * len(rows))})",
+                    [SENDING, self.worker_id, now, now] + [row["id"] for row in rows]
+                )
+        return [self._to_dict(row) for row in rows]
+
+    @staticmethod
+    def _expired_lease_sql() -> str:
+        """lease가 지난 sending 항목 조건 (인자: SENDING, 기준 시각) - claimed_at이 없는 이전 버전 행은 updated_at 기준"""
+        return "status = ? AND COALESCE(claimed_at, updated_at) < ?"
+
+    def _send(self, entry: Dict[str, Any]) -> str:
+        try:
+            storage = self._get_storage()
+        except Exception as e:
+            # NOTION_TOKEN 누락 등 설정/클라이언트 문제 - payload 탓이 아니므로 시도 횟수를 쓰지 않고 재예약
+            self._reschedule(
+                entry, delay=STORAGE_RETRY_DELAY, error=f"Notion 클라이언트 생성 실패: {e}", count_attempt=False
+            )
+            return "unavailable"
+
+        try:
+            result = storage.save_thinking_result(entry["payload"])
+        except RateLimitExceeded as e:
+            # 시도 횟수를 소모하지 않고 Retry-After 이후로 재예약
+            self._reschedule(entry, delay=e.retry_after or 30, error=str(e), count_attempt=False)
+            return "rate_limited"
+        except ValueError as e:
+            # 스키마 검사 실패 등 payload 자체의 문제 - 재시도해도 같으므로 바로 failed
+            self._reschedule(entry, delay=0, error=str(e), permanent=True)
+            return "failed"
+        except Exception as e:
+            self._reschedule(entry, delay=min(2 ** entry["attempts"] * 5, 600), error=str(e))
+            return "failed"
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE outbox SET status = ?, attempts = attempts + 1, page_id = ?, page_url = ?,
+                                  last_error = NULL, claimed_by = NULL, claimed_at = NULL, updated_at = ?
+                WHERE id = ?
+                """,
+                (DONE, result["page_id"], result["page_url"], time.time(), entry["id"])
+            )
+        if self.on_saved is not None:
+            try:
+                self.on_saved(entry, result)
+            except Exception as e:
+                print(f"Notion outbox 콜백 오류 (#{entry['id']}): {e}")
+        return "done"
+
+    def _reschedule(
+        self,
+        entry: Dict[str, Any],
+        delay: float,
+        error: str,
+        count_attempt: bool = True,
+        permanent: bool = False
+    ):
+        attempts = entry["attempts"] + (1 if count_attempt else 0)
+        status = FAILED if permanent or attempts >= self.max_attempts else PENDING
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?,
+                                  last_error = ?, claimed_by = NULL, claimed_at = NULL, updated_at = ?
+                WHERE id = ?
+                """,
+                (status, attempts, time.time() + delay, error[:1000], time.time(), entry["id"])
+            )
+
+    def _get_storage(self):
+        with self._storage_lock:
+            if self._storage is None:
+                self._storage = self.storage_factory()
+            return self._storage
+
+    def _connect(self):
+        # autocommit - 대기열 점유는 BEGIN IMMEDIATE로 직접 트랜잭션을 엶
+        return connect(self.path, isolation_level=None)
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        data["payload"] = json.loads(data["payload"])
+        data["meta"] = json.loads(data["meta"]) if data.get("meta") else {}
+        return data
+
+
+def main():
+    import argparse
+    from dotenv import load_dotenv
+    from notion_storage import NotionStorage
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Notion 저장 대기열 관리")
+    parser.add_argument("command", choices=["status", "flush", "retry"], help="실행할 작업")
+    parser.add_argument("--db", default=DEFAULT_OUTBOX_PATH, help="SQLite 파일 경로")
+    parser.add_argument("--timeout", type=float, default=None, help="flush 최대 시간 (초)")
+    args = parser.parse_args()
+
+    # 재전송이 중복 페이지를 만들지 않도록 upsert로 저장
+    outbox = NotionOutbox(lambda: NotionStorage(upsert=True), path=args.db)
+
+    if args.command == "retry":
+        print(f"🔁 {outbox.retry_failed()}개 항목을 다시 대기열에 넣었습니다")
+    elif args.command == "flush":
+        outbox.flush(timeout=args.timeout)
+
+    print(json.dumps(outbox.status(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Notion API rate limiting
+
+Notion은 integration당 평균 약 3 req/s를 허용하고, 넘으면 429 + Retry-After를 돌려줍니다.
+- TokenBucket: 프로세스 전체에서 공유하는 요청 속도 제한 (요청 전에 대기)
+- RateLimiter.call: 429는 Retry-After만큼, 일시적 오류(5xx, 타임아웃)는 지수 백오프로 재시도
+  (pages.create처럼 idempotent하지 않은 요청은 retry_transient=False → 429만 재시도)
+- RateLimiter.acall: 같은 버킷/카운터를 쓰는 async 버전 (대기 중 이벤트 루프를 막지 않음)
+- 카운터: 대기(throttled), 429 수신, 재시도, 최종 실패 횟수
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import os
+import random
+import threading
+import time
+
+
+class RateLimitExceeded(Exception):
+    """재시도를 모두 소진해도 429가 계속될 때"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷
+
+    rate개/초로 토큰이 차고, 최대 burst개까지 모아둘 수 있음
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: 초당 허용 요청 수
+            burst: 순간 최대 요청 수 (기본: rate)
+        """
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        토큰을 얻을 때까지 대기
+
+        Returns:
+            대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """acquire()의 async 버전 - 대기 중에도 이벤트 루프는 다른 요청 처리"""
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if not delay:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        대기 없이 토큰 획득 시도
+
+        Returns:
+            토큰을 얻으면 0, 아니면 토큰이 찰 때까지 남은 시간 (초)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def penalize(self, seconds: float):
+        """429를 받으면 다른 스레드도 함께 쉬도록 다음 토큰이 seconds 후에 생기게 함"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens = min(self._tokens, 1.0 - seconds * self.rate)
+
+
+class RateLimitStats:
+    """호출/대기/재시도 카운터 (스레드 안전)"""
+
+    FIELDS = ("calls", "throttled", "rate_limited", "retried", "failed")
+
+    def __init__(self):
+        self._counts = {field: 0 for field in self.FIELDS}
+        self._throttled_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, field: str, count: int = 1, seconds: float = 0.0):
+        with self._lock:
+            self._counts[field] += count
+            self._throttled_seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counts, "throttled_seconds": round(self._throttled_seconds, 2)}
+
+
+def _status_of(error: Exception) -> Optional[int]:
+    """notion_client APIResponseError / httpx 예외에서 HTTP 상태 코드"""
+    status = getattr(error, "status", None)
+    if status is None and getattr(error, "response", None) is not None:
+        status = getattr(error.response, "status_code", None)
+    return status
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(error, "headers", None)
+    if headers is None and getattr(error, "response", None) is not None:
+        headers = getattr(error.response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_transient(error: Exception) -> bool:
+    """재시도하면 성공할 수 있는 오류 (5xx, 타임아웃, 연결 끊김)"""
+    status = _status_of(error)
+    if status is not None:
+        return status >= 500
+    code = getattr(error, "code", None)
+    if code in ("notionhq_client_request_timeout", "service_unavailable", "internal_server_error"):
+        return True
+    # httpx 전송 계층 오류 (타임아웃/연결 실패)
+    return type(error).__module__.startswith("httpx") or isinstance(error, (TimeoutError, ConnectionError))
+
+
+class RateLimiter:
+    """
+    토큰 버킷 + 429 인지 재시도
+
+    NotionStorage의 모든 API 호출이 프로세스 공유 인스턴스(notion_rate_limiter)를 거칩니다.
+    """
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0
+    ):
+        """
+        Args:
+            rate: 초당 요청 수
+            burst: 순간 최대 요청 수
+            max_retries: 최대 재시도 횟수
+            base_delay: 지수 백오프 시작 대기 시간 (초)
+            max_delay: 1회 최대 대기 시간 (초)
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = RateLimitStats()
+
+    def call(self, fn: Callable[..., Any], *args, retry_transient: bool = True, **kwargs) -> Any:
+        """
+        속도 제한을 지키며 fn 호출, 429/일시적 오류는 재시도
+
+        Args:
+            fn: Notion API 호출 (args/kwargs를 그대로 전달)
+            retry_transient: 5xx/타임아웃도 재시도 - False면 429만 재시도
+                             (429는 Notion이 처리 전에 거절한 것이라 다시 보내도 안전하지만,
+                              타임아웃/5xx는 이미 처리됐을 수 있어 pages.create를 다시 보내면 중복 페이지)
+
+        Raises:
+            RateLimitExceeded: 재시도 후에도 429
+            Exception: 재시도 대상이 아닌 오류 또는 재시도 소진
+        """
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire()
+            if waited:
+                self.stats.add("throttled", seconds=waited)
+            self.stats.add("calls")
+
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                rate_limited = _status_of(e) == 429
+                if rate_limited:
+                    self.stats.add("rate_limited")
+                elif not retry_transient or not _is_transient(e):
+                    raise
+
+                retry_after = _retry_after(e) if rate_limited else None
+                if attempt >= self.max_retries:
+                    self.stats.add("failed")
+                    if rate_limited:
+                        raise RateLimitExceeded(
+                            f"Notion rate limit exceeded after {attempt} retries",
+                            retry_after=retry_after
+                        ) from e
+                    raise
+
+                delay = self._backoff(attempt, retry_after)
+                attempt += 1
+                self.stats.add("retried")
+                if rate_limited:
+                    # 버킷을 멈춰 이 스레드와 다른 스레드 모두 다음 acquire()에서 대기
+                    self.bucket.penalize(delay)
+                else:
+                    time.sleep(delay)
+
+    async def acall(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        *args,
+        retry_transient: bool = True,
+        **kwargs
+    ) -> Any:
+        """
+        call()의 async 버전 (fn은 코루틴 함수, 예: AsyncClient.pages.create)
+
+        Raises:
+            RateLimitExceeded: 재시도 후에도 429
+            Exception: 재시도 대상이 아닌 오류 또는 재시도 소진
+        """
+        attempt = 0
+        while True:
+            waited = await self.bucket.acquire_async()
+            if waited:
+                self.stats.add("throttled", seconds=waited)
+            self.stats.add("calls")
+
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                rate_limited = _status_of(e) == 429
+                if rate_limited:
+                    self.stats.add("rate_limited")
+                elif not retry_transient or not _is_transient(e):
+                    raise
+
+                retry_after = _retry_after(e) if rate_limited else None
+                if attempt >= self.max_retries:
+                    self.stats.add("failed")
+                    if rate_limited:
+                        raise RateLimitExceeded(
+                            f"Notion rate limit exceeded after {attempt} retries",
+                            retry_after=retry_after
+                        ) from e
+                    raise
+
+                delay = self._backoff(attempt, retry_after)
+                attempt += 1
+                self.stats.add("retried")
+                if rate_limited:
+                    self.bucket.penalize(delay)
+                else:
+                    await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # full jitter: 여러 워커가 동시에 재시도하지 않도록 분산
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+# 프로세스 공유 인스턴스 (NOTION_RATE_LIMIT: 초당 요청 수)
+notion_rate_limiter = RateLimiter(rate=float(os.getenv("NOTION_RATE_LIMIT", "3")))
@@ -0,0 +1,110 @@
+"""
+Local session_id → Notion page index
+
+upsert 저장 시 같은 session_id의 페이지를 Notion 검색 없이 찾고,
+마지막으로 보낸 속성 값과 비교해 바뀐 속성만 업데이트하기 위한 로컬 SQLite 인덱스입니다.
+인덱스에 없으면 NotionStorage가 databases.query로 찾아 채웁니다.
+"""
+from pathlib import Path
+from typing import Any, Dict, Optional
+import json
+import os
+import time
+
+try:
+    from .sqlite_util import connect
+except ImportError:
+    from sqlite_util import connect
+
+
+DEFAULT_INDEX_PATH = os.getenv(
+    "NOTION_SESSION_INDEX_DB",
+    str(Path.home() / ".thinking_box" / "notion_sessions.db")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    database_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    page_url TEXT,
+    created_time TEXT,
+    properties TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (database_id, session_id)
+);
+CREATE INDEX IF NOT EXISTS sessions_page_id ON sessions(page_id);
+"""
+
+
+class SessionIndex:
+    """
+    (database_id, session_id) → 페이지 ID + 마지막으로 알려진 속성 값(plain value)
+
+    연결은 호출마다 열고 닫으므로 여러 스레드에서 공유해도 됩니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def get(self, database_id: str, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM sessions WHERE database_id = ? AND session_id = ?",
+                (database_id, session_id)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["properties"] = json.loads(entry["properties"])
+        return entry
+
+    def put(
+        self,
+        database_id: str,
+        session_id: str,
+        page_id: str,
+        page_url: Optional[str],
+        created_time: Optional[str],
+        properties: Dict[str, Any]
+    ):
+        """
+        Args:
+            properties: 속성 이름 → plain value (notion_storage.plain_property_value)
+        """
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO sessions (database_id, session_id, page_id, page_url,
+                                      created_time, properties, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (database_id, session_id) DO UPDATE SET
+                    page_id = excluded.page_id,
+                    page_url = excluded.page_url,
+                    created_time = excluded.created_time,
+                    properties = excluded.properties,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    database_id, session_id, page_id, page_url, created_time,
+                    json.dumps(properties, ensure_ascii=False), time.time(),
+                )
+            )
+
+    def delete(self, database_id: str, session_id: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM sessions WHERE database_id = ? AND session_id = ?",
+                (database_id, session_id)
+            ).rowcount > 0
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def _connect(self):
+        return connect(self.path)
@@ -0,0 +1,52 @@
+"""
+SQLite connection helper
+
+세션 인덱스, Notion 미러, 저장 대기열이 함께 쓰는 연결 래퍼입니다.
+(thinking_box/core/sqlite_util.py에 분석 기록용으로 같은 내용이 있습니다.)
+`with connect(path) as conn:` 블록이 끝나면 열린 트랜잭션을 commit/rollback 하고
+연결까지 닫습니다.
+"""
+import sqlite3
+
+
+class ClosingConnection:
+    """with 블록 종료 시 열린 트랜잭션을 commit/rollback 후 연결까지 닫는 래퍼
+
+    기본 연결(암묵적 트랜잭션)과 autocommit 연결(BEGIN을 직접 여는 경우) 모두에서 동작합니다.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self._conn.in_transaction:
+                if exc_type is None:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self._conn.close()
+
+
+def connect(path: str, timeout: float = 10, **kwargs) -> ClosingConnection:
+    """
+    Row 팩토리가 설정된 SQLite 연결 열기
+
+    Args:
+        path: SQLite 파일 경로
+        timeout: 잠금 대기 시간 (초)
+        **kwargs: sqlite3.connect 추가 인자 (예: isolation_level=None)
+
+    Returns:
+        with 블록에서 쓰는 ClosingConnection
+    """
+    conn = sqlite3.connect(path, timeout=timeout, **kwargs)
+    conn.row_factory = sqlite3.Row
+    return ClosingConnection(conn)
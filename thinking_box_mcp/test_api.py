@@ -96,6 +96,42 @@ def test_invalid_data():
     print()
 
 
+def test_ingest_batch():
+    """배치 저장 테스트 (NDJSON 요청 → NDJSON 스트리밍 응답, 일부 실패 포함)"""
+    print("=" * 60)
+    print("📦 배치 저장 테스트")
+    print("=" * 60)
+    
+    items = [
+        {**test_data, "session_id": f"{test_data['session_id']}-batch-{i}", "title": f"배치 아이디어 {i}"}
+        for i in range(3)
+    ]
+    items.append({**test_data, "session_id": "batch-invalid", "idea_stage": "잘못된_단계"})
+    body = "\n".join(json.dumps(item, ensure_ascii=False) for item in items)
+    
+    response = requests.post(
+        "http://localhost:8000/ingest/batch",
+        data=body.encode("utf-8"),
+        headers={"Content-Type": "application/x-ndjson"},
+        stream=True
+    )
+    
+    print(f"상태 코드: {response.status_code}")
+    for line in response.iter_lines():
+        if not line:
+            continue
+        result = json.loads(line)
+        if "summary" in result:
+            summary = result["summary"]
+            print(f"요약: 성공 {summary['succeeded']} / 실패 {summary['failed']} (실패 항목: {summary['failed_indexes']})")
+            print(f"예상대로 마지막 항목만 실패: {summary['failed_indexes'] == [len(items) - 1]}")
+        elif result["success"]:
+            print(f"✅ [{result['index']}] {result['action']}: {result['page_url']}")
+        else:
+            print(f"❌ [{result['index']}] {result['status']}: {result['error'].splitlines()[0]}")
+    print()
+
+
 def main():
     """전체 테스트 실행"""
     print("\n🧪 Thinking Box MCP 서버 테스트 시작\n")
@@ -110,6 +146,9 @@ def main():
         # 3. 잘못된 데이터
         test_invalid_data()
         
+        # 4. 배치 저장
+        test_ingest_batch()
+        
         print("=" * 60)
         print("✅ 모든 테스트 완료!")
         print("=" * 60)